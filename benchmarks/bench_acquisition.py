@@ -0,0 +1,160 @@
+"""
+Benchmark: the acquisition paths end to end against the local replay server.
+
+Starts `replay_server.ReplayServer` (synthetic clones of the sample game, or a
+directory of cached games), points the shared client and the schedule at it,
+and downloads every season into a fresh cache directory with:
+
+- `download_season_data` one game at a time,
+- `download_season_data` with a thread pool of `--workers`,
+- the method-2 loop (`download_with_method_2`, one game at a time, streamed to the cache).
+
+Each run reports games/s, MB/s, the time to first byte and the status counts.
+The injected latency, errors and 429s are drawn from `--seed`, so two runs with
+the same options can be compared before and after a change (`--json` keeps the
+results for later).
+
+Usage:
+    python benchmarks/bench_acquisition.py --regular-games 300 --workers 8 --latency 0.02 --throttle-rate 0.02
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from replay_server import add_server_arguments, server_from_arguments  # noqa: E402
+
+from ift6758.data.acquisition import download_season_data  # noqa: E402
+from ift6758.data.cache_manifest import CacheManifest  # noqa: E402
+from ift6758.data.metrics import DownloadMetrics  # noqa: E402
+from ift6758.data.nhl_client import DEFAULT_POOL_SIZE, configure_client  # noqa: E402
+from ift6758.data.rate_limiter import AdaptiveRateLimiter  # noqa: E402
+
+METHOD_2_PATH = os.path.join(os.path.dirname(__file__), "..", "ift6758", "data", "2_data_acquisition_method_2.py")
+
+
+def load_method_2():
+    """Import `2_data_acquisition_method_2.py` (not importable by name because of the leading digit)."""
+    spec = importlib.util.spec_from_file_location("data_acquisition_method_2", METHOD_2_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_season_data(seasons, game_types, cache_dir, workers):
+    with CacheManifest(cache_dir) as manifest:
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for season in seasons:
+                    for game_type in game_types:
+                        download_season_data(season, game_type, executor=executor, cache_dir=cache_dir,
+                                             manifest=manifest)
+        else:
+            for season in seasons:
+                for game_type in game_types:
+                    download_season_data(season, game_type, cache_dir=cache_dir, manifest=manifest)
+
+
+def run(name, server, args, workers, download):
+    """
+    Run one download into a fresh cache directory and collect its figures.
+
+    Args:
+        name (str): Label of the run.
+        server (ReplayServer): Running replay server (reset before the run).
+        args (argparse.Namespace): Benchmark options.
+        workers (int): Number of concurrent requests.
+        download (callable): Called with the cache directory.
+
+    Returns:
+        dict: Throughput, time to first byte and status counts of the run.
+    """
+    metrics = DownloadMetrics()
+    configure_client(
+        base_url=f"{server.url}/v1",
+        stats_base_url=f"{server.url}/stats/rest",
+        pool_size=max(workers, DEFAULT_POOL_SIZE),
+        backoff_factor=0.05,
+        rate_limiter=AdaptiveRateLimiter(rate=args.rate, max_rate=args.rate * 4, concurrency=workers,
+                                         max_concurrency=workers),
+        metrics=metrics,
+    )
+    server.reset()
+    cache_dir = tempfile.mkdtemp(prefix="bench_acquisition_")
+    output = io.StringIO()
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output if not args.verbose else sys.stdout):
+            download(cache_dir)
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    snapshot = metrics.snapshot()
+    n_games = server.counts["200"]
+    first_byte = snapshot["spans"].get("first_byte", {})
+    result = {
+        "name": name,
+        "workers": workers,
+        "games": n_games,
+        "seconds": elapsed,
+        "games_per_second": n_games / elapsed,
+        "mb_per_second": server.bytes_sent / elapsed / 1e6,
+        "first_byte_p50_ms": (first_byte.get("p50") or 0.0) * 1e3,
+        "first_byte_p95_ms": (first_byte.get("p95") or 0.0) * 1e3,
+        "status_counts": dict(server.counts),
+    }
+    print(f"{name:<28} {result['games_per_second']:8.1f} games/s {result['mb_per_second']:7.2f} MB/s  "
+          f"ttfb p50={result['first_byte_p50_ms']:.1f} ms p95={result['first_byte_p95_ms']:.1f} ms  "
+          f"429s={server.counts['429']} 503s={server.counts['503']}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_server_arguments(parser)
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent requests of the parallel run.")
+    parser.add_argument("--rate", type=float, default=200.0, help="Initial rate of the adaptive rate limiter.")
+    parser.add_argument("--skip-method-2", action="store_true", help="Do not run the method-2 loop.")
+    parser.add_argument("--json", default=None, help="Write the results to this JSON file.")
+    parser.add_argument("--verbose", action="store_true", help="Show the output of the downloads.")
+    args = parser.parse_args()
+
+    game_types = ["02"] + (["03"] if args.playoff_games else [])
+    with tempfile.TemporaryDirectory() as games_dir:
+        server = server_from_arguments(args, games_dir)
+        server.start()
+        print(f"Replaying {len(server.games)} games (latency={args.latency}s, jitter={args.jitter}s, "
+              f"error_rate={args.error_rate}, throttle_rate={args.throttle_rate}, seed={args.seed})")
+
+        results = [
+            run("download_season_data x1", server, args, 1,
+                lambda cache_dir: run_season_data(args.seasons, game_types, cache_dir, 1)),
+            run(f"download_season_data x{args.workers}", server, args, args.workers,
+                lambda cache_dir: run_season_data(args.seasons, game_types, cache_dir, args.workers)),
+        ]
+        if not args.skip_method_2:
+            method_2 = load_method_2()
+            results.append(run("method 2 loop", server, args, 1,
+                               lambda cache_dir: method_2.download_with_method_2(args.seasons, game_types,
+                                                                                 cache_dir)))
+        server.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"options": vars(args), "results": results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
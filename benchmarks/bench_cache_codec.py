@@ -0,0 +1,67 @@
+"""
+Benchmark: bytes on disk and read time of the raw game cache per codec.
+
+Writes `--games` copies of the sample play-by-play document with the original
+`json.dump(..., indent=4)` format and with every available cache codec, then
+reports the size of each cache and the time to read and decode every game.
+
+Usage:
+    python benchmarks/bench_cache_codec.py --games 200
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ift6758.data.cache_codec import CODECS, list_game_files, read_game, write_game, zstandard  # noqa: E402
+
+SAMPLE_GAME_PATH = os.path.join(os.path.dirname(__file__), "..", "ift6758", "data", "Sample Json Downloaded.json")
+
+
+def directory_size(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def time_reads(directory):
+    start = time.perf_counter()
+    for path in list_game_files(directory):
+        read_game(path)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=200)
+    args = parser.parse_args()
+
+    with open(SAMPLE_GAME_PATH) as f:
+        game = json.load(f)
+
+    with tempfile.TemporaryDirectory() as root:
+        indented = os.path.join(root, "indent4")
+        os.makedirs(indented)
+        for n in range(args.games):
+            with open(os.path.join(indented, f"{n}.json"), "w") as f:
+                json.dump(game, f, indent=4)
+        baseline = directory_size(indented)
+        print(f"{'indent=4 json':<14} {baseline / 1e6:8.2f} MB  read={time_reads(indented):.3f} s")
+
+        for name in CODECS:
+            if name == "zstd" and zstandard is None:
+                print(f"{name:<14} skipped (zstandard not installed)")
+                continue
+            directory = os.path.join(root, name)
+            os.makedirs(directory)
+            for n in range(args.games):
+                write_game(game, os.path.join(directory, f"{n}.json"), name)
+            size = directory_size(directory)
+            print(f"{name:<14} {size / 1e6:8.2f} MB  read={time_reads(directory):.3f} s  "
+                  f"({baseline / size:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: list-of-dicts accumulation vs typed column buffers for every event of a season.
+
+Writes `--games` copies of the sample play-by-play document (a full regular
+season by default), builds the slim tier once, then builds the DataFrame of
+every event in a fresh process per method and reports the wall time and the
+peak RSS growth of the scan:
+
+- dicts: one dict per event, then `pd.DataFrame(list_of_dicts)` (the original loaders)
+- columns: `ColumnBuilder` with the string columns decoded back to strings
+- categorical: `ColumnBuilder` with the string columns as `pd.Categorical`
+
+Usage:
+    python benchmarks/bench_column_builder.py --games 1230
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ift6758.data.cache_codec import write_game  # noqa: E402
+from ift6758.data.slim_cache import SlimCache, iter_slim_games  # noqa: E402
+from ift6758.features.game_columns import EVENT_COLUMNS, extract_all_events, extract_columns  # noqa: E402
+
+SAMPLE_GAME_PATH = os.path.join(os.path.dirname(__file__), "..", "ift6758", "data", "Sample Json Downloaded.json")
+
+METHODS = ("dicts", "columns", "categorical")
+
+
+def load_with_dicts(directory):
+    processed_events = []
+    for data in iter_slim_games(directory):
+        game_id = data['id']
+        for event in data.get('plays', []):
+            details = event.get('details', {})
+            processed_events.append({
+                'game_id': game_id,
+                'period': event['periodDescriptor']['number'],
+                'time_in_period': event['timeInPeriod'],
+                'event_type': event.get('typeDescKey'),
+                'team_id': details.get('eventOwnerTeamId'),
+                'x_coord': details.get('xCoord'),
+                'y_coord': details.get('yCoord'),
+                'sort_order': event.get('sortOrder'),
+            })
+    return pd.DataFrame(processed_events)
+
+
+def run_child(method, directory):
+    """Build the DataFrame with one method and print `seconds peak_rss_growth_kb frame_bytes rows` as JSON."""
+    # Warm the slim tier and the imports, so that only the accumulation differs between methods
+    for _ in iter_slim_games(directory):
+        break
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if method == "dicts":
+        df = load_with_dicts(directory)
+    else:
+        df = extract_columns(directory, extract_all_events, EVENT_COLUMNS, categorical=method == "categorical",
+                             use_slim=True)
+    seconds = time.perf_counter() - start
+    rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    print(json.dumps({"seconds": seconds, "rss_kb": rss_growth, "frame_bytes": int(df.memory_usage(deep=True).sum()),
+                      "rows": len(df)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=1230)
+    parser.add_argument("--child", nargs=2, metavar=("METHOD", "DIRECTORY"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run_child(*args.child)
+
+    with open(SAMPLE_GAME_PATH) as f:
+        game = json.load(f)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for n in range(1, args.games + 1):
+            game["id"] = int(f"201602{n:04d}")
+            write_game(game, os.path.join(directory, f"{game['id']}.json"))
+        SlimCache(directory).update()
+
+        baseline = None
+        for method in METHODS:
+            output = subprocess.run([sys.executable, __file__, "--child", method, directory],
+                                    check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            baseline = baseline or result
+            print(f"{method:<12} {result['seconds']:7.3f} s  peak RSS +{result['rss_kb'] / 1024:7.1f} MB  "
+                  f"frame {result['frame_bytes'] / 1e6:7.1f} MB  ({result['rows']} rows)  "
+                  f"{baseline['seconds'] / result['seconds']:.2f}x faster, "
+                  f"{baseline['rss_kb'] / max(result['rss_kb'], 1):.1f}x less peak memory")
+
+
+if __name__ == "__main__":
+    main()
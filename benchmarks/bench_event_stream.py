@@ -0,0 +1,94 @@
+"""
+Benchmark: shots and goals of a raw cache via full-document decoding vs `iter_events`.
+
+Writes `--games` copies of the sample play-by-play document, then collects the
+shots on goal and goals of every game, once by decoding each whole game
+(`iter_games`) and once per installed `iter_events` backend. Reports the time
+and the peak traced memory (including the output columns) of each method, for
+the full corpus and for a tenth of it: apart from the output, memory does not
+grow with the number of games.
+
+Usage:
+    python benchmarks/bench_event_stream.py --games 1000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ift6758.data.cache_codec import write_game  # noqa: E402
+from ift6758.data.event_stream import SHOT_EVENT_TYPES, ijson, iter_events  # noqa: E402
+from ift6758.data.game_archive import iter_games  # noqa: E402
+from ift6758.features.game_columns import (  # noqa: E402
+    SHOT_COLUMNS,
+    extract_shot_events,
+    extract_shots_and_goals,
+    new_columns,
+)
+
+SAMPLE_GAME_PATH = os.path.join(os.path.dirname(__file__), "..", "ift6758", "data", "Sample Json Downloaded.json")
+
+
+def full_decode(directory):
+    columns = new_columns(SHOT_COLUMNS)
+    for game in iter_games(directory):
+        extract_shots_and_goals(game, columns)
+    return columns
+
+
+def streamed(backend):
+    def run(directory):
+        columns = new_columns(SHOT_COLUMNS)
+        extract_shot_events(iter_events(directory, SHOT_EVENT_TYPES, backend), columns)
+        return columns
+    return run
+
+
+def measure(method, directory):
+    """Time a method, then run it again under tracemalloc (which slows it down) for its peak memory."""
+    start = time.perf_counter()
+    n_rows = len(method(directory))
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    method(directory)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak, n_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=1000)
+    args = parser.parse_args()
+
+    with open(SAMPLE_GAME_PATH) as f:
+        game = json.load(f)
+
+    methods = {"full decode": full_decode, "iter_events slice": streamed("slice")}
+    if ijson is not None:
+        methods["iter_events ijson"] = streamed("ijson")
+
+    with tempfile.TemporaryDirectory() as small, tempfile.TemporaryDirectory() as large:
+        for n in range(1, args.games + 1):
+            game["id"] = int(f"201602{n:04d}")
+            write_game(game, os.path.join(large, f"{game['id']}.json"))
+            if n <= args.games // 10:
+                write_game(game, os.path.join(small, f"{game['id']}.json"))
+
+        baseline = None
+        for name, method in methods.items():
+            small_seconds, small_peak, _ = measure(method, small)
+            seconds, peak, n_rows = measure(method, large)
+            baseline = baseline or seconds
+            print(f"{name:<18} {seconds:7.3f} s  {args.games / seconds:7.1f} games/s  speedup={baseline / seconds:.2f}x  "
+                  f"peak {small_peak / 1e6:6.2f} MB ({args.games // 10} games) / {peak / 1e6:6.2f} MB "
+                  f"({args.games} games, {n_rows} shots)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark: the tidy feature functions one after another vs `FeaturePipeline`.
+
+Builds `--events` synthetic events (games of ~350 events over 3 periods, with
+the event type mix of a real game and coordinates on the rink), then adds the
+six tidy features (rebound, shot_off_rush, danger_zone, shot_distance,
+time_between_shots, odd_man_rush) once feature by feature, each step sorting
+and copying the frame like the `add_*` functions, and once with a single
+`FeaturePipeline`. On the first `--check-events` events, the pipeline output
+is checked against the original loops of the tidy data script, writing by
+position (i.e. the original logic without its label/position mix-up) on
+events sorted by game, period and clock with the play order breaking ties,
+as the pipeline sorts them. The loop labels events without coordinates 'Low'
+where the pipeline leaves their danger zone missing.
+
+Usage:
+    python benchmarks/bench_feature_pipeline.py --events 1000000 --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ift6758.features.event_features import FEATURES, FeaturePipeline, add_clock_columns  # noqa: E402
+
+EVENT_TYPES = ['faceoff', 'hit', 'shot-on-goal', 'missed-shot', 'blocked-shot', 'giveaway', 'takeaway', 'goal',
+               'stoppage', 'penalty']
+EVENT_WEIGHTS = [0.16, 0.17, 0.17, 0.08, 0.10, 0.05, 0.04, 0.02, 0.18, 0.03]
+
+
+def synthetic_events(n_events, seed=0):
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 1200, n_events)
+    x = rng.integers(-99, 100, n_events).astype(float)
+    y = rng.integers(-42, 43, n_events).astype(float)
+    missing = rng.random(n_events) < 0.05
+    x[missing], y[missing] = np.nan, np.nan
+    df = pd.DataFrame({
+        'game_id': 2016020001 + np.arange(n_events) // 350,
+        'period': rng.integers(1, 4, n_events),
+        'time_in_period': [f"{s // 60:02d}:{s % 60:02d}" for s in seconds],
+        'event_type': rng.choice(EVENT_TYPES, n_events, p=EVENT_WEIGHTS),
+        'team_id': rng.choice([1.0, 2.0, np.nan], n_events, p=[0.48, 0.48, 0.04]),
+        'x_coord': x,
+        'y_coord': y,
+        'sort_order': rng.permutation(n_events),
+    })
+    # The loaders parse the clock once, when the events are read
+    return add_clock_columns(df, seconds)
+
+
+def clock(time_in_period):
+    return int(time_in_period.split(":")[0]) * 60 + int(time_in_period.split(":")[1])
+
+
+def follows(current_event, previous_event, event_types, same_team=True):
+    """Condition of the original loops: same game and period (and team), shot on goal after one of `event_types`."""
+    return (current_event['game_id'] == previous_event['game_id'] and
+            current_event['period'] == previous_event['period'] and
+            (not same_team or current_event['team_id'] == previous_event['team_id']) and
+            current_event['event_type'] == 'shot-on-goal' and
+            (event_types is None or previous_event['event_type'] in event_types))
+
+
+def loop_features(df):
+    """The six features of the tidy data script before `FeaturePipeline`, with the loops writing by position."""
+    df = df.sort_values(by=['game_id', 'period', 'time_in_period', 'sort_order'])
+    features = {'rebound': [False] * len(df), 'shot_off_rush': [False] * len(df), 'danger_zone': ['Low'] * len(df),
+                'time_between_shots': [0] * len(df), 'odd_man_rush': [False] * len(df)}
+
+    for idx in range(1, len(df)):
+        current_event = df.iloc[idx]
+        previous_event = df.iloc[idx - 1]
+        time_difference = clock(current_event['time_in_period']) - clock(previous_event['time_in_period'])
+
+        if follows(current_event, previous_event, ['shot-on-goal', 'goal']) and 0 < time_difference <= 10:
+            features['rebound'][idx] = True
+        if follows(current_event, previous_event, ['takeaway']) and 0 < time_difference <= 10:
+            features['shot_off_rush'][idx] = True
+            features['odd_man_rush'][idx] = True
+        if follows(current_event, previous_event, None, same_team=False):
+            features['time_between_shots'][idx] = time_difference
+
+    for idx in range(len(df)):
+        x_coord = df['x_coord'].iat[idx]
+        y_coord = df['y_coord'].iat[idx]
+        if -20 <= x_coord <= 20 and -10 <= y_coord <= 10:
+            features['danger_zone'][idx] = 'High'
+        elif -30 <= x_coord <= 30 and -20 <= y_coord <= 20:
+            features['danger_zone'][idx] = 'Medium'
+
+    features['shot_distance'] = np.sqrt(df['x_coord']**2 + df['y_coord']**2).to_numpy()
+    return df, features
+
+
+def check_against_loops(pipeline, df):
+    expected_df, expected = loop_features(df)
+    result = pipeline.transform(df)
+    if not (result['sort_order'].to_numpy() == expected_df['sort_order'].to_numpy()).all():
+        raise AssertionError("pipeline rows are not in the order of the loops")
+    result_zones = np.asarray(result['danger_zone'], dtype=object)
+    result_zones[result['danger_zone'].isna().to_numpy()] = 'Low'
+    checks = {
+        'rebound': (result['rebound'].to_numpy() == np.array(expected['rebound'])).all(),
+        'shot_off_rush': (result['shot_off_rush'].to_numpy() == np.array(expected['shot_off_rush'])).all(),
+        'danger_zone': (result_zones == np.array(expected['danger_zone'], dtype=object)).all(),
+        'shot_distance': np.array_equal(result['shot_distance'].to_numpy(), expected['shot_distance'], equal_nan=True),
+        'time_between_shots': (result['time_between_shots'].to_numpy()
+                               == np.array(expected['time_between_shots'])).all(),
+        'odd_man_rush': (result['odd_man_rush'].to_numpy() == np.array(expected['odd_man_rush'])).all(),
+    }
+    failed = [name for name, ok in checks.items() if not ok]
+    if failed:
+        raise AssertionError(f"pipeline differs from the loops: {', '.join(failed)}")
+
+
+def feature_by_feature(df):
+    for name in FEATURES:
+        df = FeaturePipeline([name]).transform(df)
+    return df
+
+
+def best_time(method, df, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        method(df)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--check-events", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = synthetic_events(args.events)
+    pipeline = FeaturePipeline()
+
+    check_against_loops(pipeline, df.iloc[:args.check_events])
+    pd.testing.assert_frame_equal(pipeline.transform(df), feature_by_feature(df))
+
+    chained_seconds = best_time(feature_by_feature, df, args.repeat)
+    pipeline_seconds = best_time(pipeline.transform, df, args.repeat)
+    print(f"{len(df)} events, {len(FEATURES)} features (output checked against the original loops "
+          f"on {min(args.check_events, len(df))} events)")
+    print(f"feature by feature {chained_seconds:7.3f} s")
+    print(f"FeaturePipeline    {pipeline_seconds:7.3f} s  speedup={chained_seconds / pipeline_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
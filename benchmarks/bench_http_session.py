@@ -0,0 +1,90 @@
+"""
+Benchmark: bare `requests.get` vs the pooled `NHLClient` session.
+
+Serves the sample play-by-play document from a local keep-alive HTTP server and
+times the same number of sequential requests with both approaches. Against the
+real API the saving is larger, since every bare request also pays a TLS handshake.
+
+Usage:
+    python benchmarks/bench_http_session.py --requests 500
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ift6758.data.nhl_client import NHLClient  # noqa: E402
+
+SAMPLE_GAME_PATH = os.path.join(os.path.dirname(__file__), "..", "ift6758", "data", "Sample Json Downloaded.json")
+
+
+def make_handler(body):
+    class PlayByPlayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep connections alive between requests
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return PlayByPlayHandler
+
+
+def time_requests(get, url, n_requests):
+    """Return per-request latencies in milliseconds."""
+    latencies = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        response = get(url)
+        response.content
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(f"{name:<16} mean={statistics.mean(latencies):7.3f} ms  "
+          f"p50={statistics.median(latencies):7.3f} ms  p95={p95:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300, help="Requests per approach")
+    args = parser.parse_args()
+
+    with open(SAMPLE_GAME_PATH, "rb") as f:
+        body = f.read()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(body))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    client = NHLClient(base_url=base_url)
+    url = client.play_by_play_url("2016020001")
+
+    # Warm up both paths once so imports and the first connection are not timed
+    requests.get(url).content
+    client.get(url).content
+
+    report("requests.get", time_requests(requests.get, url, args.requests))
+    report("NHLClient.get", time_requests(client.get, url, args.requests))
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: decode time of the sample play-by-play document with each installed JSON backend.
+
+Decodes the raw bytes of the sample game `--repeat` times with every backend
+returned by `available_backends()`, checks that they all return the same
+document and reports the speedup over the standard library.
+
+Usage:
+    python benchmarks/bench_json_decoder.py --repeat 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ift6758.data.json_decoder import DEFAULT_JSON_BACKEND, available_backends, decode_json  # noqa: E402
+
+SAMPLE_GAME_PATH = os.path.join(os.path.dirname(__file__), "..", "ift6758", "data", "Sample Json Downloaded.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with open(SAMPLE_GAME_PATH, "rb") as f:
+        raw = f.read()
+    reference = decode_json(raw, "json")
+    print(f"{len(raw) / 1e3:.1f} kB document, default backend: {DEFAULT_JSON_BACKEND}")
+
+    baseline = None
+    for backend in ["json"] + [name for name in available_backends() if name != "json"]:
+        if decode_json(raw, backend) != reference:
+            raise AssertionError(f"{backend} decoded a different document")
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            decode_json(raw, backend)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{backend:<10} {elapsed / args.repeat * 1e3:8.3f} ms/game  "
+              f"{len(raw) * args.repeat / elapsed / 1e6:8.1f} MB/s  speedup={baseline / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: serial vs process-pool extraction of the shots and goals of a cache.
+
+Writes `--games` copies of the sample play-by-play document spread over
+`--seasons` seasons, builds the slim tier once, then times `extract_columns`
+with 1, 2, 4, ... worker processes (up to `--max-workers`) and reports the
+speedup over the serial scan. Every run is checked to return the same DataFrame.
+
+Usage:
+    python benchmarks/bench_parallel_parsing.py --games 2000 --seasons 4 --max-workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ift6758.data.cache_codec import write_game  # noqa: E402
+from ift6758.data.slim_cache import SlimCache  # noqa: E402
+from ift6758.features.game_columns import SHOT_COLUMNS, extract_columns, extract_shots_and_goals  # noqa: E402
+
+SAMPLE_GAME_PATH = os.path.join(os.path.dirname(__file__), "..", "ift6758", "data", "Sample Json Downloaded.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--seasons", type=int, default=4)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    with open(SAMPLE_GAME_PATH) as f:
+        game = json.load(f)
+
+    with tempfile.TemporaryDirectory() as directory:
+        per_season = -(-args.games // args.seasons)
+        for n in range(args.games):
+            season, number = 2016 + n // per_season, n % per_season + 1
+            game["id"] = int(f"{season}02{number:04d}")
+            write_game(game, os.path.join(directory, f"{game['id']}.json"))
+        SlimCache(directory).update()
+        print(f"{args.games} games over {args.seasons} seasons, {os.cpu_count()} cores")
+
+        baseline = None
+        workers = 1
+        while workers <= args.max_workers:
+            start = time.perf_counter()
+            df = extract_columns(directory, extract_shots_and_goals, SHOT_COLUMNS, workers, args.chunk_size,
+                                 use_slim=True)
+            elapsed = time.perf_counter() - start
+            if baseline is None:
+                baseline, reference = elapsed, df
+            elif not df.equals(reference):
+                raise AssertionError(f"{workers} workers returned a different DataFrame")
+            print(f"workers={workers:<3} {elapsed:7.3f} s  {args.games / elapsed:8.1f} games/s  "
+                  f"speedup={baseline / elapsed:.2f}x  ({len(df)} rows)")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
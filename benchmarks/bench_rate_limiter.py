@@ -0,0 +1,111 @@
+"""
+Benchmark: parallel downloads against a local stub that throttles with 429s.
+
+The stub server accepts `--server-rate` requests per second and answers anything
+above that with `429 Too Many Requests` and a `Retry-After` header. The same set
+of games is then fetched by a thread pool, once with retries only and once with the
+shared AdaptiveRateLimiter, and the sustained throughput and 429 counts are compared.
+
+Usage:
+    python benchmarks/bench_rate_limiter.py --games 1000 --workers 16 --server-rate 100
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ift6758.data.nhl_client import NHLClient  # noqa: E402
+from ift6758.data.rate_limiter import AdaptiveRateLimiter  # noqa: E402
+
+
+class ThrottlingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, rate, retry_after):
+        super().__init__(("127.0.0.1", 0), ThrottlingHandler)
+        self.rate = rate
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.tokens = rate
+        self.last_refill = time.monotonic()
+        self.served = 0
+        self.throttled = 0
+
+    def admit(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.served += 1
+                return True
+            self.throttled += 1
+            return False
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.server.admit():
+            body = b'{"id": 1, "plays": []}'
+            self.send_response(200)
+        else:
+            body = b'{"error": "Too Many Requests"}'
+            self.send_response(429)
+            self.send_header("Retry-After", str(self.server.retry_after))
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(name, client, server, n_games, n_workers):
+    server.served = server.throttled = 0
+    game_ids = [f"2016{str(n).zfill(6)}" for n in range(1, n_games + 1)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        results = list(executor.map(client.fetch_play_by_play, game_ids))
+    elapsed = time.perf_counter() - start
+    missing = sum(result is None for result in results)
+    print(f"{name:<22} {n_games / elapsed:8.1f} games/s  "
+          f"429s={server.throttled:<5} failed={missing}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--server-rate", type=float, default=100.0, help="Requests/s the stub accepts")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After sent with each 429")
+    args = parser.parse_args()
+
+    server = ThrottlingServer(args.server_rate, args.retry_after)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    retrying = NHLClient(base_url=base_url, pool_size=args.workers, backoff_factor=0.1)
+    run("retries only", retrying, server, args.games, args.workers)
+
+    time.sleep(args.retry_after)
+    limiter = AdaptiveRateLimiter(rate=args.server_rate / 2, max_rate=args.server_rate * 4,
+                                  rate_increase=args.server_rate / 10,
+                                  concurrency=args.workers, max_concurrency=args.workers)
+    adaptive = NHLClient(base_url=base_url, pool_size=args.workers, backoff_factor=0.1, rate_limiter=limiter)
+    run("adaptive rate limiter", adaptive, server, args.games, args.workers)
+    print(f"limiter settled at {limiter.rate:.1f} req/s, {int(limiter.concurrency)} in flight")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: vectorized `add_rebound_indicator` vs the original `iloc` loop.
+
+Builds `--events` synthetic events (games of ~350 events over 3 periods, with
+the event type mix of a real game), times the vectorized feature on all of
+them, and times the original row loop on the first `--loop-events` events to
+extrapolate its cost. The vectorized result is checked against a loop that
+writes by position, i.e. the original logic without its label/position mix-up.
+
+Usage:
+    python benchmarks/bench_rebound_indicator.py --events 1000000 --loop-events 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ift6758.features.event_features import add_rebound_indicator  # noqa: E402
+
+EVENT_TYPES = ['faceoff', 'hit', 'shot-on-goal', 'missed-shot', 'blocked-shot', 'giveaway', 'takeaway', 'goal',
+               'stoppage', 'penalty']
+EVENT_WEIGHTS = [0.16, 0.17, 0.17, 0.08, 0.10, 0.05, 0.04, 0.02, 0.18, 0.03]
+
+
+def synthetic_events(n_events, seed=0):
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 1200, n_events)
+    return pd.DataFrame({
+        'game_id': 2016020001 + np.arange(n_events) // 350,
+        'period': rng.integers(1, 4, n_events),
+        'time_in_period': [f"{s // 60:02d}:{s % 60:02d}" for s in seconds],
+        'event_type': rng.choice(EVENT_TYPES, n_events, p=EVENT_WEIGHTS),
+        'team_id': rng.choice([1.0, 2.0, np.nan], n_events, p=[0.48, 0.48, 0.04]),
+    })
+
+
+def loop_rebound_indicator(df, positional):
+    """The original loop; with `positional`, the flag is written to the current row instead of label `idx`."""
+    df = df.sort_values(by=['game_id', 'period', 'time_in_period'])
+    df['rebound'] = False
+    df['time_in_period_sec'] = df['time_in_period'].apply(lambda x: int(x.split(":")[0]) * 60 + int(x.split(":")[1]))
+    column = df.columns.get_loc('rebound')
+
+    for idx in range(1, len(df)):
+        current_event = df.iloc[idx]
+        previous_event = df.iloc[idx - 1]
+
+        if (current_event['game_id'] == previous_event['game_id'] and
+                current_event['period'] == previous_event['period'] and
+                current_event['team_id'] == previous_event['team_id'] and
+                current_event['event_type'] == 'shot-on-goal' and previous_event['event_type'] in ['shot-on-goal', 'goal']):
+
+            time_difference = current_event['time_in_period_sec'] - previous_event['time_in_period_sec']
+
+            if 0 < time_difference <= 10:
+                if positional:
+                    df.iat[idx, column] = True
+                else:
+                    df.at[idx, 'rebound'] = True
+
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--loop-events", type=int, default=5000)
+    args = parser.parse_args()
+
+    df = synthetic_events(args.events)
+    small = df.iloc[:args.loop_events]
+
+    expected = loop_rebound_indicator(small, positional=True)
+    # Same rows in the same order and the same flags (the clock columns replace 'time_in_period_sec')
+    if not add_rebound_indicator(small)['rebound'].equals(expected['rebound']):
+        raise AssertionError("vectorized rebounds differ from the loop")
+    misaligned = (loop_rebound_indicator(small, positional=False)['rebound'] != expected['rebound']).sum()
+
+    start = time.perf_counter()
+    loop_rebound_indicator(small, positional=False)
+    loop_seconds = (time.perf_counter() - start) / len(small) * len(df)
+
+    start = time.perf_counter()
+    result = add_rebound_indicator(df)
+    vectorized_seconds = time.perf_counter() - start
+
+    print(f"{len(df)} events, {result['rebound'].sum()} rebounds")
+    print(f"iloc loop    ~{loop_seconds:9.1f} s (extrapolated from {len(small)} events; "
+          f"{misaligned} of them flagged on the wrong row)")
+    print(f"vectorized    {vectorized_seconds:9.3f} s  speedup ~{loop_seconds / vectorized_seconds:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark: cost of resuming an interrupted bulk download.
+
+Simulates a cache of `--seasons` segments of `--games` games each, with the
+download interrupted after various amounts of work. For each scenario it
+reports the size of the compacted journal, the time to reopen the journal
+and manifest and compute the list of games left to fetch, and the time of
+the previous approach (one `find_game_file` probe per planned game).
+
+It first checks, against a local replay server, that a planned game that
+returns 404 is skipped by reruns while its 404 is cached, is requested again
+once the entry expires, and that its season only completes once it is
+downloaded; and that playoffs with nothing scheduled send no request and are
+planned again on the next run.
+
+Usage:
+    python benchmarks/bench_resume.py --seasons 8 --games 1312
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ift6758.data.acquisition import download_season_data  # noqa: E402
+from ift6758.data.cache_codec import find_game_file  # noqa: E402
+from ift6758.data.cache_manifest import CacheManifest  # noqa: E402
+from ift6758.data.download_journal import DownloadJournal, segment_name  # noqa: E402
+from ift6758.data.nhl_client import configure_client  # noqa: E402
+from replay_server import ReplayServer, build_replay_games  # noqa: E402
+
+
+def build_cache(directory, plans, n_done):
+    """Write `n_done` games (in plan order) to the cache, manifest and journal, then stop."""
+    with CacheManifest(directory) as manifest, DownloadJournal(directory) as journal:
+        for segment, game_ids in plans.items():
+            if n_done <= 0:
+                break
+            journal.plan(segment, game_ids)
+            done = game_ids[:n_done]
+            for game_id in done:
+                path = os.path.join(directory, f"{game_id}.json")
+                with open(path, "wb") as f:
+                    f.write(b"{}")
+                manifest.record(game_id, path, b"{}")
+            journal.complete(done)
+            if len(done) == len(game_ids):
+                journal.complete_segment(segment)
+            n_done -= len(done)
+
+
+def resume(directory, plans):
+    """Return the games left to fetch, as `download_all_seasons` computes them on restart."""
+    with CacheManifest(directory) as manifest, DownloadJournal(directory) as journal:
+        work = []
+        for segment, game_ids in plans.items():
+            if journal.is_complete(segment):
+                continue
+            journal.plan(segment, game_ids)
+            work.extend(manifest.remaining(journal.pending(segment)))
+        return work
+
+
+def probe(directory, plans):
+    """Return the games left to fetch with one file probe per planned game."""
+    return [game_id for game_ids in plans.values() for game_id in game_ids
+            if not find_game_file(os.path.join(directory, f"{game_id}.json"))]
+
+
+def check_missing_game_retried():
+    """
+    Download a plan whose last game is not on the server yet: reruns skip it while its 404 is
+    cached, request it again once the entry expires, and only then complete the season.
+    """
+    with tempfile.TemporaryDirectory() as games_dir, tempfile.TemporaryDirectory() as cache_dir:
+        build_replay_games(games_dir, [2016], regular_games=6, playoff_games=0)
+        server = ReplayServer(games_dir)
+        late_game = server.games.pop("2016020006")  # 404 until it is added back
+        configure_client(base_url=f"{server.start()}/v1", max_retries=0)
+        segment = segment_name(2016, "02")
+        try:
+            plan = [f"201602{g:04d}" for g in range(1, 7)]
+            # (missing TTL, game on the server, expected responses, season complete after the run)
+            runs = [(3600, False, {"200": 5, "404": 1}, False),
+                    (3600, False, {}, False),
+                    (0, True, {"200": 1}, True),
+                    (0, True, {}, True)]
+            for missing_ttl, published, expected, complete in runs:
+                if published:
+                    server.games["2016020006"] = late_game
+                server.reset()
+                with CacheManifest(cache_dir, missing_ttl=missing_ttl) as manifest, \
+                        DownloadJournal(cache_dir) as journal:
+                    download_season_data(2016, "02", game_ids=plan, cache_dir=cache_dir, manifest=manifest,
+                                         journal=journal)
+                    assert journal.is_complete(segment) == complete, (missing_ttl, published)
+                assert {code: n for code, n in server.counts.items() if n} == expected, server.counts
+        finally:
+            server.stop()
+            configure_client()
+    print("A game that returned 404 keeps its season open and is requested again once its entry expires.\n")
+
+
+def check_unscheduled_playoffs():
+    """Plan playoffs that are not scheduled yet: no request is sent and they are planned again later."""
+    with tempfile.TemporaryDirectory() as games_dir, tempfile.TemporaryDirectory() as cache_dir:
+        build_replay_games(games_dir, [2016], regular_games=1, playoff_games=2)
+        server = ReplayServer(games_dir)
+        playoff_games = {game_id: server.games.pop(game_id) for game_id in list(server.games) if game_id[4:6] == "03"}
+        configure_client(base_url=f"{server.start()}/v1", max_retries=0,
+                         stats_base_url=f"{server.url}/stats/rest")
+        segment = segment_name(2016, "03")
+        try:
+            # (playoffs on the schedule, expected game responses, playoffs complete after the run)
+            for scheduled, expected, complete in [(False, {}, False), (True, {"200": 2}, True)]:
+                if scheduled:
+                    server.games.update(playoff_games)
+                server.reset()
+                with CacheManifest(cache_dir) as manifest, DownloadJournal(cache_dir) as journal:
+                    download_season_data(2016, "03", cache_dir=cache_dir, manifest=manifest, journal=journal)
+                    assert journal.is_complete(segment) == complete, scheduled
+                assert {code: n for code, n in server.counts.items() if n} == expected, server.counts
+        finally:
+            server.stop()
+            configure_client()
+    print("Playoffs with nothing scheduled send no game request and are planned again on the next run.\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seasons", type=int, default=8)
+    parser.add_argument("--games", type=int, default=1312)
+    args = parser.parse_args()
+
+    plans = {segment_name(2016 + n, "02"): [f"{2016 + n}02{g:04d}" for g in range(1, args.games + 1)]
+             for n in range(args.seasons)}
+    total = args.seasons * args.games
+
+    check_missing_game_retried()
+    check_unscheduled_playoffs()
+
+    print(f"{'remaining':>10} {'journal lines':>14} {'resume (ms)':>12} {'probe (ms)':>11}")
+    for remaining in (total, total // 2, args.games, args.games // 2, 10, 0):
+        with tempfile.TemporaryDirectory() as directory:
+            build_cache(directory, plans, total - remaining)
+            with open(os.path.join(directory, "download_journal.log")) as f:
+                n_lines = sum(1 for _ in f)
+
+            start = time.perf_counter()
+            work = resume(directory, plans)
+            resume_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            probed = probe(directory, plans)
+            probe_time = time.perf_counter() - start
+
+            assert sorted(work) == sorted(probed) and len(work) == remaining
+            print(f"{remaining:>10} {n_lines:>14} {resume_time * 1e3:>12.1f} {probe_time * 1e3:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: full-corpus scan of the raw game cache vs the slim tier.
+
+Writes `--games` copies of the sample play-by-play document (as one regular
+season) with the default codec, then compares reading every raw game with
+reading the slim tier: bytes on disk, time of the first scan (which builds the
+slim files) and of a warm scan.
+
+Usage:
+    python benchmarks/bench_slim_cache.py --games 1000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ift6758.data.cache_codec import list_game_files, write_game  # noqa: E402
+from ift6758.data.game_archive import iter_games  # noqa: E402
+from ift6758.data.slim_cache import SlimCache  # noqa: E402
+
+SAMPLE_GAME_PATH = os.path.join(os.path.dirname(__file__), "..", "ift6758", "data", "Sample Json Downloaded.json")
+
+
+def timed_scan(games):
+    start = time.perf_counter()
+    n_plays = sum(len(game["plays"]) for game in games)
+    return time.perf_counter() - start, n_plays
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=1000)
+    args = parser.parse_args()
+
+    with open(SAMPLE_GAME_PATH) as f:
+        game = json.load(f)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for n in range(1, args.games + 1):
+            game["id"] = int(f"201602{n:04d}")
+            write_game(game, os.path.join(directory, f"{game['id']}.json"))
+        raw_size = sum(os.path.getsize(path) for path in list_game_files(directory))
+
+        raw_seconds, n_plays = timed_scan(iter_games(directory))
+        print(f"{'raw':<16} {raw_size / 1e6:8.2f} MB  scan={raw_seconds:.3f} s  ({n_plays} plays)")
+
+        slim = SlimCache(directory)
+        build_seconds, _ = timed_scan(slim)
+        slim_size = sum(os.path.getsize(os.path.join(slim.slim_dir, name)) for name in os.listdir(slim.slim_dir))
+        print(f"{'slim (build)':<16} {slim_size / 1e6:8.2f} MB  scan={build_seconds:.3f} s")
+
+        warm_seconds, n_slim_plays = timed_scan(SlimCache(directory))
+        print(f"{'slim (warm)':<16} {slim_size / 1e6:8.2f} MB  scan={warm_seconds:.3f} s  ({n_slim_plays} plays)  "
+              f"{raw_size / slim_size:.1f}x fewer bytes, {raw_seconds / warm_seconds:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: vectorized `classify_zones` vs the original `add_danger_zone` loop.
+
+Builds `--shots` synthetic shots (integer rink coordinates, a few without
+coordinates), times the original `df.at` loop on the first `--loop-shots` of
+them to extrapolate its cost, and times `classify_zones` on all of them with
+the danger zones (rectangles) and with the slot and point zones (polygon and
+rectangle, both ends of the rink). The vectorized danger zones are checked
+against the loop, the shots without coordinates being labelled 'Low' as the
+loop does.
+
+Usage:
+    python benchmarks/bench_zone_classifier.py --shots 5000000 --loop-shots 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ift6758.features.rink_zones import DANGER_ZONES, SHOT_ZONES, classify_zones  # noqa: E402
+
+
+def synthetic_shots(n_shots, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.integers(-99, 100, n_shots).astype(float)
+    y = rng.integers(-42, 43, n_shots).astype(float)
+    missing = rng.random(n_shots) < 0.01
+    x[missing], y[missing] = np.nan, np.nan
+    return pd.DataFrame({'x_coord': x, 'y_coord': y})
+
+
+def loop_danger_zone(df):
+    """`add_danger_zone` of the tidy data script before the zone classifier."""
+    df['danger_zone'] = 'Low'
+
+    for idx in range(len(df)):
+        x_coord = df.at[idx, 'x_coord']
+        y_coord = df.at[idx, 'y_coord']
+
+        if x_coord is not None and y_coord is not None:
+            if -20 <= x_coord <= 20 and -10 <= y_coord <= 10:
+                df.at[idx, 'danger_zone'] = 'High'
+            elif -30 <= x_coord <= 30 and -20 <= y_coord <= 20:
+                df.at[idx, 'danger_zone'] = 'Medium'
+
+    return df
+
+
+def timed(method):
+    start = time.perf_counter()
+    result = method()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shots", type=int, default=5_000_000)
+    parser.add_argument("--loop-shots", type=int, default=20_000)
+    args = parser.parse_args()
+
+    df = synthetic_shots(args.shots)
+    x, y = df['x_coord'].to_numpy(), df['y_coord'].to_numpy()
+    small = df.iloc[:args.loop_shots].copy()
+
+    expected, loop_seconds = timed(lambda: loop_danger_zone(small)['danger_zone'])
+    loop_seconds *= len(df) / len(small)
+    zones = classify_zones(x[:len(small)], y[:len(small)], missing='Low')
+    if not (np.asarray(zones, dtype=object) == expected.to_numpy(dtype=object)).all():
+        raise AssertionError("vectorized danger zones differ from the loop")
+
+    danger, danger_seconds = timed(lambda: classify_zones(x, y, DANGER_ZONES))
+    shot, shot_seconds = timed(lambda: classify_zones(x, y, SHOT_ZONES, default='other', mirror_x=True))
+
+    print(f"{len(df)} shots ({int(np.isnan(x).sum())} without coordinates)")
+    print(f"df.at loop            ~{loop_seconds:8.1f} s (extrapolated from {len(small)} shots)")
+    print(f"danger zones          {danger_seconds * 1000:8.1f} ms  speedup ~{loop_seconds / danger_seconds:,.0f}x  "
+          f"{pd.Series(danger).value_counts(dropna=False).to_dict()}")
+    print(f"slot and point zones  {shot_seconds * 1000:8.1f} ms  "
+          f"{pd.Series(shot).value_counts(dropna=False).to_dict()}")
+
+
+if __name__ == "__main__":
+    main()
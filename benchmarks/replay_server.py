@@ -0,0 +1,255 @@
+"""
+Local stand-in for the NHL APIs, serving cached games for benchmarks.
+
+Serves `/v1/gamecenter/{game_id}/play-by-play` from a directory of cached games
+(any cache codec) and `/stats/rest/en/game` (the schedule used to plan the
+downloads) from the same games. Without a directory, synthetic clones of
+`ift6758/data/Sample Json Downloaded.json` are generated. Latency, server
+errors and 429 throttling can be injected, with a fixed seed so that runs
+are reproducible.
+
+Usage:
+    python benchmarks/replay_server.py --seasons 2016 --regular-games 300 --latency 0.02 --throttle-rate 0.05
+
+Then point the acquisition code at it:
+    NHL_API_BASE_URL=http://127.0.0.1:8765/v1 NHL_STATS_BASE_URL=http://127.0.0.1:8765/stats/rest \\
+        ift6758-fetch --seasons 2016 --workers 8 --cache-dir /tmp/nhl_replay_cache
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ift6758.data.cache_codec import list_game_files, read_game_bytes  # noqa: E402
+from ift6758.data.game_ids import format_game_id, game_id_from_file_name, playoff_game_ids  # noqa: E402
+
+SAMPLE_GAME_PATH = os.path.join(os.path.dirname(__file__), "..", "ift6758", "data", "Sample Json Downloaded.json")
+
+PLAY_BY_PLAY_PATH = re.compile(r"^/v1/gamecenter/(\d{10})/play-by-play/?$")
+SCHEDULE_PATH = "/stats/rest/en/game"
+
+
+def build_replay_games(directory, seasons, regular_games, playoff_games, sample_path=SAMPLE_GAME_PATH):
+    """
+    Write synthetic clones of the sample game, one per game ID, as `{game_id}.json`.
+
+    Args:
+        directory (str): Destination directory.
+        seasons (iterable): Starting years of the seasons.
+        regular_games (int): Number of regular season games per season.
+        playoff_games (int): Number of playoff games per season (at most 105).
+        sample_path (str): Game used as the template.
+
+    Returns:
+        int: Number of games written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(sample_path) as f:
+        sample = json.load(f)
+
+    n_written = 0
+    for season in seasons:
+        game_ids = [format_game_id(season, "02", number) for number in range(1, regular_games + 1)]
+        game_ids += playoff_game_ids(season)[:playoff_games]
+        for game_id in game_ids:
+            sample["id"] = int(game_id)
+            sample["season"] = int(f"{season}{season + 1}")
+            sample["gameType"] = int(game_id[4:6])
+            with open(os.path.join(directory, f"{game_id}.json"), "w") as f:
+                json.dump(sample, f, separators=(",", ":"))
+            n_written += 1
+    return n_written
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """HTTP server replaying cached games with injected latency, errors and throttling."""
+
+    daemon_threads = True
+
+    def __init__(self, games_dir, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0, retry_after=1,
+                 seed=0, host="127.0.0.1", port=0):
+        """
+        Args:
+            games_dir (str): Directory of cached games to serve.
+            latency (float): Delay in seconds added before every response.
+            jitter (float): Random extra delay in seconds, uniform in [0, jitter].
+            error_rate (float): Probability of answering 503 instead of the game.
+            throttle_rate (float): Probability of answering 429 with `Retry-After`.
+            retry_after (int): Seconds sent in the `Retry-After` header of each 429.
+            seed (int): Seed of the random generator used for injections.
+            host (str): Interface to listen on.
+            port (int): Port to listen on (0 picks a free port).
+        """
+        super().__init__((host, port), ReplayHandler)
+        self.games = {}
+        for path in list_game_files(games_dir):
+            game_id = game_id_from_file_name(path)
+            if game_id is not None:
+                self.games[game_id] = path
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"200": 0, "404": 0, "429": 0, "503": 0}
+        self.bytes_sent = 0
+        self._bodies = {}
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self):
+        """Serve in a background thread and return the base URL of the server."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def reset(self):
+        """Zero the counters and reseed the injections, so that every run sees the same draws."""
+        with self.lock:
+            self.random = random.Random(self.seed)
+            self.counts = {code: 0 for code in self.counts}
+            self.bytes_sent = 0
+
+    def draw(self):
+        """Return (delay, injected status code or None) for the next response."""
+        with self.lock:
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+            roll = self.random.random()
+        if roll < self.throttle_rate:
+            return delay, 429
+        if roll < self.throttle_rate + self.error_rate:
+            return delay, 503
+        return delay, None
+
+    def body_of(self, game_id):
+        """Uncompressed JSON bytes of a game (read once, then kept in memory)."""
+        body = self._bodies.get(game_id)
+        if body is None:
+            body = self._bodies[game_id] = read_game_bytes(self.games[game_id])
+        return body
+
+    def schedule(self, query):
+        """Answer the stats API schedule for a `cayenneExp` such as 'season=20162017 and gameType=2'."""
+        expression = query.get("cayenneExp", "")
+        season = re.search(r"season=(\d{8})", expression)
+        game_type = re.search(r"gameType=(\d+)", expression)
+        data = []
+        for game_id in sorted(self.games):
+            if season and game_id[:4] != season.group(1)[:4]:
+                continue
+            if game_type and int(game_id[4:6]) != int(game_type.group(1)):
+                continue
+            data.append({"id": int(game_id), "season": int(f"{game_id[:4]}{int(game_id[:4]) + 1}"),
+                         "gameType": int(game_id[4:6])})
+        return json.dumps({"data": data, "total": len(data)}).encode("utf-8")
+
+    def count(self, status_code, n_bytes):
+        with self.lock:
+            self.counts[str(status_code)] = self.counts.get(str(status_code), 0) + 1
+            self.bytes_sent += n_bytes
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        path, _, query_string = self.path.partition("?")
+        query = dict(part.split("=", 1) for part in query_string.split("&") if "=" in part)
+        query = {key: value.replace("%20", " ").replace("+", " ").replace("%3D", "=") for key, value in query.items()}
+
+        if path == SCHEDULE_PATH:
+            self.respond(200, self.server.schedule(query), count=False)
+            return
+
+        delay, injected = self.server.draw()
+        if delay:
+            time.sleep(delay)
+        if injected is not None:
+            headers = {"Retry-After": str(self.server.retry_after)} if injected == 429 else {}
+            self.respond(injected, b'{"error": "injected"}', headers)
+            return
+
+        match = PLAY_BY_PLAY_PATH.match(path)
+        if match is None or match.group(1) not in self.server.games:
+            self.respond(404, b'{"error": "Not Found"}')
+            return
+        self.respond(200, self.server.body_of(match.group(1)))
+
+    def respond(self, status_code, body, headers=None, count=True):
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        if count:  # Only the game requests are counted, not the schedule
+            self.server.count(status_code, len(body))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def add_server_arguments(parser):
+    """Add the replay server options to an argument parser (shared with the benchmark suite)."""
+    parser.add_argument("--games-dir", default=None,
+                        help="Directory of cached games to serve (synthetic clones if omitted).")
+    parser.add_argument("--seasons", type=int, nargs="+", default=[2016],
+                        help="Seasons of the synthetic games.")
+    parser.add_argument("--regular-games", type=int, default=200, help="Synthetic regular season games per season.")
+    parser.add_argument("--playoff-games", type=int, default=0, help="Synthetic playoff games per season.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay in seconds before each response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra delay in seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 503 response.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Probability of a 429 response.")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After sent with each 429.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the injected latency and errors.")
+
+
+def server_from_arguments(args, games_dir, port=0):
+    """Build a `ReplayServer` from the options added by `add_server_arguments`."""
+    if args.games_dir is None:
+        build_replay_games(games_dir, args.seasons, args.regular_games, args.playoff_games)
+    else:
+        games_dir = args.games_dir
+    return ReplayServer(games_dir, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                        throttle_rate=args.throttle_rate, retry_after=args.retry_after, seed=args.seed, port=port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_server_arguments(parser)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as games_dir:
+        server = server_from_arguments(args, games_dir, args.port)
+        print(f"Serving {len(server.games)} games on {server.url}/v1 (schedule: {server.url}/stats/rest)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
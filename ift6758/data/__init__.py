@@ -0,0 +1,14 @@
+"""
+NHL play-by-play data acquisition.
+
+Importing the package has no side effects (no Drive mount, no download).
+"""
+from ift6758.data.acquisition import (
+    download_all_seasons,
+    download_season_data,
+    download_seasons,
+    fetch_and_cache_nhl_data,
+    fetch_nhl_play_by_play_data,
+)
+from ift6758.data.game_store import GameStore
+from ift6758.data.nhl_client import NHLClient, configure_client, get_client
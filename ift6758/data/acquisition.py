@@ -0,0 +1,369 @@
+"""
+Download and cache NHL play-by-play data.
+
+Importing this module has no side effects: nothing is mounted or downloaded
+until a function is called. The `ift6758-fetch` command (see `ift6758.data.cli`)
+runs `download_seasons` from the command line.
+"""
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from tqdm import tqdm
+
+from ift6758.data.cache_codec import find_game_file, read_game, write_game, write_game_raw, write_game_stream
+from ift6758.data.cache_manifest import checksum
+from ift6758.data.download_journal import DownloadJournal, segment_name
+from ift6758.data.game_ids import plan_game_ids
+from ift6758.data.game_store import GameStore, canonical_game_path
+from ift6758.data.json_decoder import decode_json
+from ift6758.data.live_refresh import refresh_game
+from ift6758.data.metrics import DownloadMetrics, TimedIterator
+from ift6758.data.nhl_client import DEFAULT_POOL_SIZE, configure_client, get_client
+from ift6758.data.rate_limiter import AdaptiveRateLimiter
+
+# Local cache directory (the Colab notebooks pass their Google Drive folder instead)
+DEFAULT_CACHE_DIR = os.getenv("NHL_DATA_FOLDER", "./nhl_data")
+
+# Game types downloaded by default: regular season and playoffs
+DEFAULT_GAME_TYPES = ("02", "03")
+GAME_TYPE_NAMES = {"01": "preseason", "02": "regular season", "03": "playoff", "04": "all-star"}
+
+# Size of the chunks written to disk when a game is streamed to the cache
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Metrics snapshot written at the end of each run, in the cache directory (not a
+# ".json" name, so that cache scans never mistake it for a game)
+METRICS_FILE_NAME = "download_metrics.prom"
+
+
+def fetch_nhl_play_by_play_data(season, game_type, game_number, manifest=None):
+    """
+    Fetch NHL play-by-play data for a given game in a season, without caching it.
+
+    Args:
+        season (int): The starting year of the NHL season (e.g., 2016 for the 2016-17 season).
+        game_type (str): The type of game (e.g., "01" for preseason, "02" for regular, "03" for playoffs).
+        game_number (str): The specific game number, padded appropriately.
+        manifest (CacheManifest): Optional manifest in which 404s are recorded, so that
+            the game is not requested again before the negative cache TTL expires.
+
+    Returns:
+        dict: JSON data of the play-by-play for the specified game, or None if not found.
+    """
+    game_id = f"{season}{game_type}{game_number}"
+    url = get_client().play_by_play_url(game_id)
+
+    try:
+        response = get_client().get(url)
+        response.raise_for_status()  # Raise an error for bad responses (e.g., 404)
+        return decode_json(response.content)
+    except requests.exceptions.HTTPError as errh:
+        if response.status_code == 404:
+            print(f"Game ID {game_id} not found (404). Skipping.")
+            if manifest is not None:
+                manifest.record_missing(game_id, response.status_code)
+        else:
+            print("HTTP Error:", errh)
+    except requests.exceptions.RequestException as err:
+        print("Request Error:", err)
+    except ValueError as err:
+        print(f"Invalid JSON for Game ID {game_id}: {err}")
+    return None
+
+
+def fetch_and_cache_nhl_data(season, game_type, game_number, cache_dir=DEFAULT_CACHE_DIR, manifest=None,
+                             return_data=True, validate=False, refresh=False, verbose=True):
+    """
+    Fetch and cache NHL play-by-play data for a given game.
+
+    The response body is written to the cache as received, without being
+    decoded and serialized again. With `return_data=False` it is streamed to a
+    temporary file and renamed into place, and is never parsed unless
+    `validate` is set, which is the cheapest mode for bulk downloads.
+
+    If the shared client has metrics (see `download_seasons`), the time spent
+    reading the body and writing it to the cache and the size of the game are
+    recorded in them, next to the connect and first byte spans of the client.
+
+    Args:
+        season (int): Starting year of the NHL season (e.g., 2016 for 2016-17 season).
+        game_type (str): '02' for regular season, '03' for playoffs.
+        game_number (str): Game number padded to 4 digits (e.g., '0001').
+        cache_dir (str): Directory to store cached data.
+        manifest (CacheManifest): Manifest of `cache_dir`; when given, cache hits are
+            looked up in it instead of on disk (an entry whose file is gone is
+            dropped and the game downloaded again), new games are recorded in it,
+            and games that recently returned 404 are skipped without a request.
+        return_data (bool): Parse and return the game; otherwise only return the
+            path of the cached file.
+        validate (bool): With `return_data=False`, check that the streamed file is
+            valid JSON (it is deleted if not).
+        refresh (bool): Re-check a cached game that was not final when it was cached,
+            with a conditional request, and merge its new plays into the cache
+            (see `ift6758.data.live_refresh.refresh_game`).
+        verbose (bool): Print a line per game; errors other than 404 are printed anyway.
+
+    Returns:
+        dict: JSON data of the play-by-play (or str: path of the cached file if
+        `return_data` is False), or None if not found.
+    """
+    game_id = f"{season}{game_type}{game_number}"
+    cache_file = canonical_game_path(cache_dir, game_id)
+
+    if manifest is not None:
+        cached_file = manifest.path_of(game_id)
+        if cached_file and not os.path.exists(cached_file):
+            print(f"Cached file {cached_file} of Game ID {game_id} is gone, downloading it again.")
+            manifest.forget(game_id)
+            cached_file = None
+    else:
+        os.makedirs(cache_dir, exist_ok=True)
+        cached_file = find_game_file(cache_file)
+    if cached_file and refresh:
+        try:
+            data, _ = refresh_game(game_id, cached_file, manifest)
+        except requests.exceptions.RequestException as err:
+            print(f"Refresh Error for Game ID {game_id}: {err}. Using cached data.")
+            data = read_game(cached_file)
+        return data if return_data else find_game_file(cached_file)
+    if cached_file:
+        if not return_data:
+            return cached_file
+        if verbose:
+            print(f"Loading cached data for Game ID {game_id}.")
+        return read_game(cached_file)
+    if manifest is not None and manifest.is_known_missing(game_id):
+        if verbose:
+            print(f"Game ID {game_id} is known to be missing (404). Skipping.")
+        return None
+
+    client = get_client()
+    metrics = client.metrics
+    url = client.play_by_play_url(game_id)
+    response = None
+    try:
+        if verbose:
+            print(f"Fetching data for Game ID {game_id}...")
+        response = client.get(url, stream=True)
+        response.raise_for_status()
+
+        start = time.perf_counter()
+        if return_data:
+            # Parse the body once, then write the same bytes
+            raw = response.content
+            body_seconds, n_bytes = time.perf_counter() - start, len(raw)
+            data = decode_json(raw)
+            cache_file = write_game_raw(raw, cache_file)
+            sha256 = checksum(raw)
+        else:
+            hasher = hashlib.sha256()
+            chunks = TimedIterator(response.iter_content(STREAM_CHUNK_SIZE))
+            cache_file = write_game_stream(chunks, cache_file, hasher=hasher)
+            body_seconds, n_bytes = chunks.seconds, chunks.n_bytes
+            sha256 = hasher.hexdigest()
+            if validate:
+                try:
+                    read_game(cache_file)
+                except ValueError:
+                    os.remove(cache_file)
+                    raise
+            data = cache_file
+        if metrics is not None:
+            metrics.observe("body", body_seconds)
+            metrics.observe("write", time.perf_counter() - start - body_seconds)
+            metrics.record_game(n_bytes)
+        if verbose:
+            print(f"Data saved to {cache_file}")
+
+        if manifest is not None:
+            manifest.record(game_id, cache_file, sha256=sha256, etag=response.headers.get("ETag"),
+                            last_modified=response.headers.get("Last-Modified"))
+        return data
+    except requests.exceptions.HTTPError as err:
+        if response.status_code == 404:
+            if verbose:
+                print(f"Game ID {game_id} not found (404). Skipping.")
+            if manifest is not None:
+                manifest.record_missing(game_id, response.status_code)
+        else:
+            print(f"HTTP Error: {err}")
+    except requests.exceptions.RequestException as err:
+        print(f"Request Error: {err}")
+    except ValueError as err:
+        print(f"Invalid JSON for Game ID {game_id}: {err}")
+    finally:
+        if response is not None:
+            response.close()
+    return None
+
+
+def save_data_to_file(data, file_path):
+    """
+    Save JSON data to a compressed cache file.
+
+    Args:
+        data (dict): JSON data to be saved.
+        file_path (str): Path to save the data (the extension is set by the cache codec).
+
+    Returns:
+        str: Path of the written file.
+    """
+    file_path = write_game(data, file_path)
+    print(f"Data saved to {file_path}")
+    return file_path
+
+
+def download_season_data(season, game_type="02", executor=None, game_ids=None, cache_dir=DEFAULT_CACHE_DIR,
+                         manifest=None, journal=None):
+    """
+    Download all play-by-play data for a season.
+
+    The list of games is planned up front from the schedule (see
+    `ift6758.data.game_ids.plan_game_ids`), so a missing or failed game is
+    skipped instead of ending the season early. With a manifest, games that
+    are already cached are skipped without touching the disk, and games that
+    recently returned 404 are skipped without a request. With a journal, a
+    finished season is skipped entirely and an interrupted one resumes from
+    its recorded plan with only the games that are not done. A season is only
+    finished once every planned game is downloaded: games that returned 404
+    are requested again on a later run once their manifest entry expires.
+    Progress is shown
+    with a progress bar (with the rolling throughput when the shared client has
+    metrics) instead of a line per game.
+
+    Args:
+        season (int): The starting year of the season (e.g., 2016 for 2016-17).
+        game_type (str): '02' for regular season, '03' for playoffs.
+        executor (concurrent.futures.Executor): Optional pool used to fetch games concurrently.
+        game_ids (list): Optional precomputed plan of game IDs to download.
+        cache_dir (str): Directory to store cached data.
+        manifest (CacheManifest): Manifest of `cache_dir` loaded once for the run.
+        journal (DownloadJournal): Journal of `cache_dir` used to resume interrupted runs.
+    """
+    segment = segment_name(season, game_type)
+    if journal is not None:
+        if journal.is_complete(segment):
+            print(f"{season}-{season + 1} ({game_type}) already complete.")
+            return
+        if game_ids is None:
+            # An empty plan (nothing scheduled yet) is planned again from the schedule
+            game_ids = journal.plan_of(segment) or None
+    if game_ids is None:
+        game_ids = plan_game_ids(season, game_type)
+    planned = bool(game_ids)
+    if journal is not None:
+        journal.plan(segment, game_ids)
+        game_ids = journal.pending(segment)
+
+    if manifest is not None:
+        remaining = manifest.remaining(game_ids)
+        print(f"{len(game_ids) - len(remaining)}/{len(game_ids)} games already cached or known to be missing.")
+        if journal is not None:
+            # Games cached before the journal existed count as done, and games skipped
+            # as known to be missing are recorded like the ones that return 404 below
+            journal.complete([game_id for game_id in game_ids if game_id in manifest])
+            journal.missing([game_id for game_id in game_ids if manifest.is_known_missing(game_id)])
+        game_ids = remaining
+    game_numbers = [game_id[-4:] for game_id in game_ids]
+
+    def fetch(game_number_str):
+        game_id = f"{season}{game_type}{game_number_str}"
+        if journal is not None:
+            journal.start(game_id)
+        # Bulk download: stream each game to disk without parsing it
+        result = fetch_and_cache_nhl_data(season, game_type, game_number_str, cache_dir, manifest,
+                                          return_data=False, verbose=False)
+        if journal is not None:
+            if result:
+                journal.complete(game_id)
+            elif manifest is not None and manifest.is_known_missing(game_id):
+                journal.missing(game_id)  # 404: retried once the manifest entry expires
+            else:
+                journal.fail(game_id)
+        return result
+
+    metrics = get_client().metrics
+    results = []
+    fetched = map(fetch, game_numbers) if executor is None else executor.map(fetch, game_numbers)
+    with tqdm(total=len(game_numbers), desc=f"{season}-{season + 1} ({game_type})", unit="game",
+              disable=not game_numbers) as progress:
+        for result in fetched:
+            results.append(result)
+            progress.update()
+            if metrics is not None:
+                games_per_sec, mb_per_sec = metrics.rates()
+                progress.set_postfix(games_s=f"{games_per_sec:.1f}", mb_s=f"{mb_per_sec:.2f}", refresh=False)
+
+    n_missing = sum(1 for data in results if not data)
+    print(f"{len(results) - n_missing}/{len(results)} games downloaded for {season}-{season + 1} ({game_type}).")
+
+    if journal is not None and planned and not journal.pending(segment):
+        journal.complete_segment(segment)
+
+
+def download_seasons(seasons, game_types=DEFAULT_GAME_TYPES, max_workers=1, cache_dir=DEFAULT_CACHE_DIR,
+                     metrics_path=None):
+    """
+    Download play-by-play data for the given seasons and game types.
+
+    Timing spans (connect, first byte, body, write), status codes and throughput
+    are recorded for the whole run; a snapshot is written at the end and a
+    one-line summary is printed.
+
+    Args:
+        seasons (iterable): Starting years of the seasons to download (e.g., range(2016, 2025)).
+        game_types (iterable): Game types to download for each season (e.g., ("02", "03")).
+        max_workers (int): Number of concurrent requests (1 downloads one game at a time).
+        cache_dir (str): Directory to store cached data.
+        metrics_path (str): Where to write the metrics snapshot, in the Prometheus text
+            format if it ends with '.prom' and as JSON otherwise (defaults to
+            `download_metrics.prom` in `cache_dir`).
+
+    Returns:
+        DownloadMetrics: Metrics of the run.
+    """
+    metrics = DownloadMetrics()
+
+    # One kept-alive connection per worker so the pool never discards sockets, and a
+    # limiter shared by all workers so parallel downloads back off together on 429s
+    configure_client(
+        pool_size=max(max_workers, DEFAULT_POOL_SIZE),
+        rate_limiter=AdaptiveRateLimiter(concurrency=max_workers, max_concurrency=max_workers),
+        metrics=metrics,
+    )
+
+    # The store migrates games cached under other names once, its manifest is loaded
+    # once and saved atomically as games are added, and the journal lets a restarted
+    # run resume where the previous one stopped
+    with GameStore(cache_dir) as store, DownloadJournal(cache_dir) as journal, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for year in seasons:
+            for game_type in game_types:
+                print(f"\nDownloading {GAME_TYPE_NAMES.get(game_type, game_type)} data for {year}-{year + 1}...")
+                download_season_data(year, game_type, executor=executor, cache_dir=cache_dir,
+                                     manifest=store.manifest, journal=journal)
+
+    metrics_path = metrics_path or os.path.join(cache_dir, METRICS_FILE_NAME)
+    metrics.save(metrics_path)
+    print(f"\n{metrics.summary()}")
+    print(f"Metrics written to {metrics_path}")
+    return metrics
+
+
+def download_all_seasons(start_year=2016, end_year=2023, max_workers=1, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Download regular season and playoff play-by-play data for all seasons from start_year to end_year.
+
+    Args:
+        start_year (int): The first season to download (e.g., 2016).
+        end_year (int): The last season to download (e.g., 2023).
+        max_workers (int): Number of concurrent requests (1 downloads one game at a time).
+        cache_dir (str): Directory to store cached data.
+
+    Returns:
+        DownloadMetrics: Metrics of the run.
+    """
+    return download_seasons(range(start_year, end_year + 1), DEFAULT_GAME_TYPES, max_workers, cache_dir)
@@ -0,0 +1,324 @@
+import contextlib
+import glob
+import gzip
+import json
+import os
+import uuid
+import zlib
+
+from ift6758.data.json_decoder import decode_json
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is always available
+    zstandard = None
+
+
+class JsonCodec:
+    """Uncompressed JSON, as written by the original acquisition code."""
+
+    name = "json"
+    extension = ".json"
+
+    def compress(self, raw):
+        return raw
+
+    def decompress(self, payload):
+        return payload
+
+    def stream_writer(self, fileobj):
+        return contextlib.nullcontext(fileobj)
+
+    def stream_reader(self, fileobj):
+        return contextlib.nullcontext(fileobj)
+
+
+class GzipCodec:
+    """JSON compressed with gzip (standard library)."""
+
+    name = "gzip"
+    extension = ".json.gz"
+
+    def __init__(self, level=6):
+        self.level = level
+
+    def compress(self, raw):
+        return gzip.compress(raw, compresslevel=self.level, mtime=0)
+
+    def decompress(self, payload):
+        return gzip.decompress(payload)
+
+    def stream_writer(self, fileobj):
+        # Empty filename and mtime=0 so the header does not depend on the temp file
+        return gzip.GzipFile(filename="", mode="wb", compresslevel=self.level, fileobj=fileobj, mtime=0)
+
+    def stream_reader(self, fileobj):
+        return gzip.GzipFile(mode="rb", fileobj=fileobj)
+
+
+class ZstdCodec:
+    """JSON compressed with Zstandard (requires the `zstandard` package)."""
+
+    name = "zstd"
+    extension = ".json.zst"
+
+    def __init__(self, level=3):
+        if zstandard is None:
+            raise ImportError("The 'zstandard' package is required for the zstd cache codec.")
+        self.level = level
+
+    def compress(self, raw):
+        return zstandard.ZstdCompressor(level=self.level).compress(raw)
+
+    def decompress(self, payload):
+        return zstandard.ZstdDecompressor().decompress(payload)
+
+    def stream_writer(self, fileobj):
+        return zstandard.ZstdCompressor(level=self.level).stream_writer(fileobj, closefd=False)
+
+    def stream_reader(self, fileobj):
+        return zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=False)
+
+
+CODECS = {"json": JsonCodec, "gzip": GzipCodec, "zstd": ZstdCodec}
+
+# Raised by the codecs on truncated or corrupt payloads (gzip.BadGzipFile is an OSError)
+_DECOMPRESSION_ERRORS = (OSError, EOFError, zlib.error) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+# Compressed extensions first so that ".json.gz" is not mistaken for ".json"
+_CODEC_BY_EXTENSION = [(".json.zst", "zstd"), (".json.gz", "gzip"), (".json", "json")]
+
+# zstd when it is installed, gzip otherwise
+DEFAULT_CODEC = os.getenv("NHL_CACHE_CODEC", "zstd" if zstandard is not None else "gzip")
+
+
+# O_BINARY keeps Windows from translating newlines in the compressed bytes
+_TEMP_FILE_FLAGS = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+
+
+def _create_temp_file(path):
+    """
+    Create a new temporary file next to `path` and return its descriptor and path.
+
+    Unlike `tempfile.mkstemp` (mode 0600), the file is created with mode 0666 and
+    the kernel applies the umask, so the renamed game has the same permissions
+    as a file written with `open()`.
+    """
+    directory = os.path.dirname(path) or "."
+    while True:
+        temp_path = os.path.join(directory, f"tmp{uuid.uuid4().hex}.tmp")
+        try:
+            return os.open(temp_path, _TEMP_FILE_FLAGS, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+
+def get_codec(name=None):
+    """
+    Return a codec instance by name.
+
+    Args:
+        name (str): 'json', 'gzip' or 'zstd' (defaults to `DEFAULT_CODEC`).
+
+    Returns:
+        A codec with `extension`, `compress`, `decompress` and `stream_writer`.
+    """
+    name = name or DEFAULT_CODEC
+    if name not in CODECS:
+        raise ValueError(f"Unknown cache codec: {name}")
+    return CODECS[name]()
+
+
+def split_game_extension(path):
+    """
+    Split a cached game path into its base path and codec name.
+
+    Args:
+        path (str): Path to a cached game file.
+
+    Returns:
+        tuple: (path without the codec extension, codec name), or (path, None)
+        if the extension is not a cache extension.
+    """
+    for extension, name in _CODEC_BY_EXTENSION:
+        if path.endswith(extension):
+            return path[:-len(extension)], name
+    return path, None
+
+
+def is_game_file(path):
+    """Return True if the path has one of the cache extensions."""
+    return split_game_extension(path)[1] is not None
+
+
+def find_game_file(path):
+    """
+    Find the cached file of a game whatever codec it was written with.
+
+    Args:
+        path (str): Path of the game, with or without a cache extension.
+
+    Returns:
+        str: Path of the existing file, or None if the game is not cached.
+    """
+    base_path, _ = split_game_extension(path)
+    for extension, _ in _CODEC_BY_EXTENSION:
+        if os.path.exists(base_path + extension):
+            return base_path + extension
+    return None
+
+
+def list_game_files(directory):
+    """
+    List every cached game file in a directory, whatever its codec.
+
+    When the same game exists with several codecs only one file is returned,
+    preferring compressed files.
+
+    Args:
+        directory (str): Cache directory.
+
+    Returns:
+        list: Sorted paths of the cached games.
+    """
+    files = {}
+    for extension, _ in _CODEC_BY_EXTENSION:
+        for path in glob.glob(os.path.join(directory, f"*{extension}")):
+            base_path, _ = split_game_extension(path)
+            files.setdefault(base_path, path)
+    return sorted(files.values())
+
+
+def encode_game(data):
+    """Serialize a game to compact UTF-8 JSON bytes."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def write_game_stream(chunks, path, codec=None, hasher=None):
+    """
+    Stream the JSON bytes of a game to the cache without holding the whole document.
+
+    The chunks are compressed into a temporary file in the destination
+    directory, which is then renamed over the final path, so a reader never
+    sees a partially written game.
+
+    Args:
+        chunks (iterable): Byte chunks of the uncompressed JSON document
+            (e.g., `response.iter_content(chunk_size)`).
+        path (str): Path of the game; any cache extension is replaced by the codec's.
+        codec (str): Codec name (defaults to `DEFAULT_CODEC`).
+        hasher (hashlib hash): Optional hash object updated with every chunk.
+
+    Returns:
+        str: Path of the written file.
+    """
+    codec = get_codec(codec)
+    base_path, _ = split_game_extension(path)
+    file_path = base_path + codec.extension
+    fd, temp_path = _create_temp_file(file_path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            with codec.stream_writer(f) as writer:
+                for chunk in chunks:
+                    if chunk:
+                        writer.write(chunk)
+                        if hasher is not None:
+                            hasher.update(chunk)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return file_path
+
+
+def write_game_raw(raw, path, codec=None):
+    """
+    Write the JSON bytes of a game to the cache with the given codec.
+
+    Args:
+        raw (bytes): Uncompressed JSON document of the game.
+        path (str): Path of the game; any cache extension is replaced by the codec's.
+        codec (str): Codec name (defaults to `DEFAULT_CODEC`).
+
+    Returns:
+        str: Path of the written file.
+    """
+    return write_game_stream([raw], path, codec)
+
+
+def write_game(data, path, codec=None):
+    """
+    Write a game to the cache with the given codec.
+
+    Args:
+        data (dict): JSON data of the game.
+        path (str): Path of the game; any cache extension is replaced by the codec's.
+        codec (str): Codec name (defaults to `DEFAULT_CODEC`).
+
+    Returns:
+        str: Path of the written file.
+    """
+    return write_game_raw(encode_game(data), path, codec)
+
+
+def read_game_bytes(path):
+    """
+    Read the raw JSON bytes of a cached game, decompressing as needed.
+
+    Args:
+        path (str): Path to the cached game file.
+
+    Returns:
+        bytes: Uncompressed JSON document.
+
+    Raises:
+        ValueError: If the file is not valid for its codec (e.g., a truncated `.json.gz`).
+    """
+    _, name = split_game_extension(path)
+    with open(path, "rb") as f:
+        payload = f.read()
+    try:
+        return get_codec(name or "json").decompress(payload)
+    except _DECOMPRESSION_ERRORS as err:
+        raise ValueError(f"Corrupt cache file {path}: {err}") from err
+
+
+def read_game(path):
+    """
+    Read and decode a cached game, whatever codec it was written with.
+
+    Args:
+        path (str): Path to the cached game file.
+
+    Returns:
+        dict: JSON data of the game.
+
+    Raises:
+        ValueError: If the file is corrupt or not valid JSON (`json.JSONDecodeError`
+            for the latter).
+    """
+    return decode_json(read_game_bytes(path))
+
+
+def recompress_directory(directory, codec=None, remove_original=True):
+    """
+    Rewrite every cached game of a directory with the given codec.
+
+    Args:
+        directory (str): Cache directory.
+        codec (str): Target codec name (defaults to `DEFAULT_CODEC`).
+        remove_original (bool): Delete the original file once it has been rewritten.
+
+    Returns:
+        int: Number of games rewritten.
+    """
+    target = get_codec(codec)
+    n_rewritten = 0
+    for path in list_game_files(directory):
+        if path.endswith(target.extension):
+            continue
+        new_path = write_game(read_game(path), path, target.name)
+        if remove_original and new_path != path:
+            os.remove(path)
+        n_rewritten += 1
+    return n_rewritten
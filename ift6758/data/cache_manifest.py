@@ -0,0 +1,245 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from ift6758.data.cache_codec import list_game_files, read_game_bytes
+from ift6758.data.game_ids import game_id_from_file_name
+
+# Not a ".json" name on purpose, so that cache scans never mistake it for a game
+MANIFEST_FILE_NAME = "cache_manifest.idx"
+
+# How long a game that returned 404 is skipped before being checked again (seconds)
+DEFAULT_MISSING_TTL = float(os.getenv("NHL_MISSING_TTL", 24 * 3600))
+
+
+def checksum(raw):
+    """Return the SHA-256 hex digest of the uncompressed JSON bytes of a game."""
+    return hashlib.sha256(raw).hexdigest()
+
+
+class CacheManifest:
+    """
+    Index of every game in a cache directory, loaded once per run.
+
+    Each entry records the cached file, its size on disk, the fetch timestamp
+    and a checksum of the game's JSON, keyed by game ID. Deciding what is left
+    to download is then an in-memory set difference instead of one
+    `os.path.exists` call per game. The manifest is rewritten atomically
+    (temporary file + rename) so an interrupted run never leaves it truncated.
+
+    Games that returned 404 are kept as negative entries (status and check
+    time). They are skipped without a request until `missing_ttl` expires, so
+    unfinished or future games are still checked again later. `info` holds
+    metadata about the cache itself (e.g., its layout version, see `GameStore`).
+    """
+
+    def __init__(self, cache_dir, autosave_every=100, missing_ttl=DEFAULT_MISSING_TTL):
+        """
+        Args:
+            cache_dir (str): Cache directory the manifest describes.
+            autosave_every (int): Save the manifest after this many new entries.
+            missing_ttl (float): Seconds during which a game that returned 404 is
+                not requested again.
+        """
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, MANIFEST_FILE_NAME)
+        self.autosave_every = autosave_every
+        self.missing_ttl = missing_ttl
+        self.entries = {}
+        self.missing = {}
+        self.info = {}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        content = self._load()
+        if content is None:
+            self.rebuild()
+        elif "games" in content:
+            self.entries = content["games"]
+            self.missing = content.get("missing", {})
+            self.info = content.get("info", {})
+        else:
+            # First manifest layout: a flat {game_id: entry} dict, without 404s or info
+            self.entries = content
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, game_id):
+        return str(game_id) in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _load(self):
+        """Read the saved manifest, or return None if there is none or it is unreadable (e.g., truncated)."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path) as f:
+                content = json.load(f)
+        except ValueError as err:
+            print(f"Cache manifest {self.path} is unreadable ({err}), rebuilding it.")
+            return None
+        return content if isinstance(content, dict) else None
+
+    def rebuild(self):
+        """
+        Index the files already in the cache directory (one-time scan for caches
+        created before the manifest existed).
+
+        Unreadable (e.g., truncated) game files are left out with a message, so
+        their games are downloaded again.
+
+        Returns:
+            int: Number of games indexed.
+        """
+        print(f"Building cache manifest for {self.cache_dir}...")
+        for path in list_game_files(self.cache_dir):
+            game_id = game_id_from_file_name(path)
+            if game_id is None:
+                continue
+            try:
+                raw = read_game_bytes(path)
+            except ValueError as err:
+                # Left out of the manifest, so the game is downloaded again
+                print(f"Skipping game {game_id}: {err}")
+                continue
+            self.record(game_id, path, raw, fetched_at=os.path.getmtime(path))
+        self.save()
+        return len(self.entries)
+
+    def record(self, game_id, file_path, raw=None, fetched_at=None, sha256=None, etag=None, last_modified=None):
+        """
+        Add or replace the entry of a cached game.
+
+        Args:
+            game_id (str): Full 10-digit game ID.
+            file_path (str): Path of the cached file.
+            raw (bytes): Uncompressed JSON bytes of the game, used for the checksum
+                (read back from `file_path` if neither `raw` nor `sha256` is given).
+            fetched_at (float): Fetch time as a Unix timestamp (defaults to now).
+            sha256 (str): Checksum already computed while the game was written.
+            etag (str): `ETag` header of the response, kept for conditional refreshes.
+            last_modified (str): `Last-Modified` header of the response.
+        """
+        if sha256 is None:
+            sha256 = checksum(raw if raw is not None else read_game_bytes(file_path))
+        entry = {
+            "file": os.path.relpath(file_path, self.cache_dir),
+            "size": os.path.getsize(file_path),
+            "fetched_at": fetched_at if fetched_at is not None else time.time(),
+            "sha256": sha256,
+        }
+        if etag:
+            entry["etag"] = etag
+        if last_modified:
+            entry["last_modified"] = last_modified
+        with self._lock:
+            self.entries[str(game_id)] = entry
+            self.missing.pop(str(game_id), None)
+            self._unsaved += 1
+            should_save = self._unsaved >= self.autosave_every
+        if should_save:
+            self.save()
+
+    def record_missing(self, game_id, status_code=404, checked_at=None):
+        """
+        Remember that a game was not available, so that it is not requested again
+        before `missing_ttl` expires.
+
+        Args:
+            game_id (str): Full 10-digit game ID.
+            status_code (int): HTTP status returned for the game.
+            checked_at (float): Check time as a Unix timestamp (defaults to now).
+        """
+        entry = {
+            "status": status_code,
+            "checked_at": checked_at if checked_at is not None else time.time(),
+        }
+        with self._lock:
+            self.missing[str(game_id)] = entry
+            self._unsaved += 1
+            should_save = self._unsaved >= self.autosave_every
+        if should_save:
+            self.save()
+
+    def forget(self, game_id):
+        """
+        Drop the entry of a cached game, e.g. when its file was deleted outside the manifest.
+
+        Args:
+            game_id (str): Full 10-digit game ID.
+        """
+        with self._lock:
+            if self.entries.pop(str(game_id), None) is None:
+                return
+            self._unsaved += 1
+            should_save = self._unsaved >= self.autosave_every
+        if should_save:
+            self.save()
+
+    def is_known_missing(self, game_id, now=None):
+        """
+        Return True if the game returned 404 less than `missing_ttl` seconds ago.
+
+        Args:
+            game_id (str): Full 10-digit game ID.
+            now (float): Current Unix timestamp (defaults to now).
+        """
+        entry = self.missing.get(str(game_id))
+        if entry is None:
+            return False
+        now = now if now is not None else time.time()
+        return now - entry["checked_at"] < self.missing_ttl
+
+    def path_of(self, game_id):
+        """
+        Return the path of a cached game.
+
+        Args:
+            game_id (str): Full 10-digit game ID.
+
+        Returns:
+            str: Path of the cached file, or None if the game is not in the manifest.
+        """
+        entry = self.entries.get(str(game_id))
+        return None if entry is None else os.path.join(self.cache_dir, entry["file"])
+
+    def remaining(self, game_ids):
+        """
+        Return the planned games that are not cached yet, in plan order.
+
+        Games recently found missing (404 within `missing_ttl`) are left out too.
+
+        Args:
+            game_ids (list): Planned game IDs.
+
+        Returns:
+            list: Game IDs that still need a request.
+        """
+        now = time.time()
+        return [game_id for game_id in game_ids
+                if str(game_id) not in self.entries and not self.is_known_missing(game_id, now)]
+
+    def close(self):
+        """Save the manifest if anything changed since the last save."""
+        if self._unsaved:
+            self.save()
+
+    def save(self):
+        """Write the manifest atomically (temporary file + rename)."""
+        with self._lock:
+            temp_path = f"{self.path}.tmp"
+            content = json.dumps({"games": self.entries, "missing": self.missing, "info": self.info},
+                                 separators=(",", ":"))
+            with open(temp_path, "w") as f:
+                f.write(content)
+            os.replace(temp_path, self.path)
+            self._unsaved = 0
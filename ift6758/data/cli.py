@@ -0,0 +1,85 @@
+"""
+Command line entry point of the data acquisition (`ift6758-fetch`).
+
+Example:
+    ift6758-fetch --seasons 2016-2024 --types 02,03 --workers 8 --cache-dir ./nhl_data --metrics run.prom
+"""
+import argparse
+
+from ift6758.data.acquisition import DEFAULT_CACHE_DIR, DEFAULT_GAME_TYPES, download_seasons
+
+
+def parse_seasons(value):
+    """
+    Parse a list of seasons such as '2016-2024', '2016,2018' or '2016-2018,2021'.
+
+    Args:
+        value (str): Comma-separated starting years or inclusive year ranges.
+
+    Returns:
+        list: Sorted starting years of the seasons.
+    """
+    seasons = set()
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                first, last = (int(year) for year in part.split("-", 1))
+                seasons.update(range(first, last + 1))
+            else:
+                seasons.add(int(part))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid season range: {part}")
+    if not seasons:
+        raise argparse.ArgumentTypeError("No season given.")
+    return sorted(seasons)
+
+
+def parse_game_types(value):
+    """
+    Parse a comma-separated list of game types such as '02,03' (or '2,3').
+
+    Args:
+        value (str): Game types.
+
+    Returns:
+        list: Game types padded to 2 digits.
+    """
+    game_types = [part.strip().zfill(2) for part in value.split(",") if part.strip()]
+    if not game_types or not all(game_type.isdigit() for game_type in game_types):
+        raise argparse.ArgumentTypeError(f"Invalid game types: {value}")
+    return game_types
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="ift6758-fetch",
+        description="Download and cache NHL play-by-play data.",
+    )
+    parser.add_argument("--seasons", type=parse_seasons, required=True,
+                        help="Starting years of the seasons, e.g. 2016-2024 or 2016,2018.")
+    parser.add_argument("--types", type=parse_game_types, default=list(DEFAULT_GAME_TYPES),
+                        help="Game types, e.g. 02,03 (02: regular season, 03: playoffs).")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of concurrent requests.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="Cache directory (defaults to $NHL_DATA_FOLDER or ./nhl_data).")
+    parser.add_argument("--metrics", default=None,
+                        help="Metrics snapshot file, Prometheus text format if it ends with .prom "
+                             "(defaults to download_metrics.prom in the cache directory).")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.workers < 1:
+        build_parser().error("--workers must be at least 1")
+    download_seasons(args.seasons, args.types, max_workers=args.workers, cache_dir=args.cache_dir,
+                     metrics_path=args.metrics)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,246 @@
+import glob
+import json
+import os
+import threading
+import time
+
+JOURNAL_FILE_NAME = "download_journal.log"
+
+# Game states recorded in the journal
+PLANNED = "planned"
+STARTED = "started"
+DONE = "done"
+FAILED = "failed"
+MISSING = "missing"
+
+
+def segment_name(season, game_type):
+    """
+    Name of the journal segment holding the games of a season and game type.
+
+    Args:
+        season (int): Starting year of the season (e.g., 2016).
+        game_type (str): '02' for regular season, '03' for playoffs.
+
+    Returns:
+        str: Segment name (e.g., '2016-02').
+    """
+    return f"{season}-{game_type}"
+
+
+def remove_temp_files(directory):
+    """
+    Delete the temporary files left in a cache directory by interrupted writes.
+
+    Args:
+        directory (str): Cache directory.
+
+    Returns:
+        int: Number of files deleted.
+    """
+    paths = glob.glob(os.path.join(directory, "*.tmp"))
+    for path in paths:
+        os.remove(path)
+    return len(paths)
+
+
+class DownloadJournal:
+    """
+    Append-only journal of a bulk download, used to resume after a crash.
+
+    Every season and game type is a segment: its planned game IDs are written
+    once, then each game is marked as started, done, missing (404 or known to
+    be missing) or failed as the download goes. A restart replays the journal
+    and resumes with the games of each segment that are not done, without
+    planning or checking the finished ones again. Missing games stay pending:
+    the negative cache of the manifest decides when they are requested again,
+    so a segment only completes once every planned game is downloaded. A torn
+    last line (process killed mid-write) is ignored.
+
+    When a segment completes, the journal is compacted (temporary file +
+    rename): the per-game lines of finished segments are replaced by one
+    line per segment, so replaying it costs O(remaining work), not O(games
+    downloaded so far).
+    """
+
+    def __init__(self, cache_dir, durable=False):
+        """
+        Args:
+            cache_dir (str): Cache directory the journal belongs to.
+            durable (bool): `fsync` after every record (slower, survives a machine
+                crash and not only a killed process).
+        """
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, JOURNAL_FILE_NAME)
+        self.durable = durable
+        self.plans = {}
+        self.states = {}
+        self.errors = {}
+        self.completed = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        if os.path.exists(self.path):
+            self._replay()
+        # Games still in flight mean the last run was killed mid-write
+        if STARTED in self.states.values():
+            n_removed = remove_temp_files(cache_dir)
+            print(f"Resuming an interrupted run ({n_removed} partial files removed).")
+        self._file = open(self.path, "a")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _replay(self):
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # Torn write at the end of the journal
+                self._apply(record)
+
+    def _apply(self, record):
+        op = record["op"]
+        if op == "plan":
+            self.plans[record["segment"]] = record["games"]
+            for game_id in record["games"]:
+                self.states.setdefault(game_id, PLANNED)
+        elif op == "state":
+            for game_id in record["games"]:
+                self.states[game_id] = record["state"]
+            if record["state"] == FAILED:
+                for game_id in record["games"]:
+                    self.errors[game_id] = record.get("error")
+        elif op == "segment_done":
+            segment = record["segment"]
+            self.completed.add(segment)
+            for game_id in self.plans.pop(segment, []):
+                self.states.pop(game_id, None)
+                self.errors.pop(game_id, None)
+
+    def _append(self, record):
+        with self._lock:
+            self._apply(record)
+            self._dirty = True
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._file.flush()
+            if self.durable:
+                os.fsync(self._file.fileno())
+
+    def is_complete(self, segment):
+        """Return True if every game of the segment was downloaded."""
+        return segment in self.completed
+
+    def plan_of(self, segment):
+        """Return the planned game IDs of a segment, or None if it was never planned."""
+        return self.plans.get(segment)
+
+    def plan(self, segment, game_ids):
+        """
+        Record the planned game IDs of a segment (no-op if the same plan is already recorded).
+
+        Args:
+            segment (str): Segment name (see `segment_name`).
+            game_ids (list): Planned game IDs.
+        """
+        game_ids = [str(game_id) for game_id in game_ids]
+        if self.plans.get(segment) != game_ids:
+            self._append({"op": "plan", "segment": segment, "games": game_ids, "t": time.time()})
+
+    def start(self, game_id):
+        """Mark a game as in flight."""
+        self._append({"op": "state", "state": STARTED, "games": [str(game_id)], "t": time.time()})
+
+    def complete(self, game_ids):
+        """
+        Mark games as downloaded.
+
+        Args:
+            game_ids (str or list): One game ID or a list recorded as a single line.
+        """
+        if isinstance(game_ids, str):
+            game_ids = [game_ids]
+        if game_ids:
+            self._append({"op": "state", "state": DONE, "games": [str(g) for g in game_ids], "t": time.time()})
+
+    def missing(self, game_ids):
+        """
+        Mark games as not available (404); they stay pending (see `pending`).
+
+        Args:
+            game_ids (str or list): One game ID or a list recorded as a single line.
+        """
+        if isinstance(game_ids, str):
+            game_ids = [game_ids]
+        if game_ids:
+            self._append({"op": "state", "state": MISSING, "games": [str(g) for g in game_ids], "t": time.time()})
+
+    def fail(self, game_id, error=None):
+        """Mark a game as failed; it is retried on the next run."""
+        self._append({"op": "state", "state": FAILED, "games": [str(game_id)], "error": error, "t": time.time()})
+
+    def pending(self, segment):
+        """
+        Return the planned games of a segment that are not downloaded yet, in plan order.
+
+        Games that were in flight, failed or missing (404) when the last run stopped
+        are included; the manifest skips the missing ones until their negative cache
+        entry expires. The segment is complete once this is empty.
+
+        Args:
+            segment (str): Segment name.
+
+        Returns:
+            list: Game IDs left to download.
+        """
+        if segment in self.completed:
+            return []
+        return [game_id for game_id in self.plans.get(segment, []) if self.states.get(game_id) != DONE]
+
+    def complete_segment(self, segment):
+        """Mark a segment as finished and compact the journal."""
+        self._append({"op": "segment_done", "segment": segment, "t": time.time()})
+        self.checkpoint()
+
+    def checkpoint(self):
+        """
+        Rewrite the journal with only what a restart needs (temporary file + rename).
+
+        Returns:
+            int: Number of lines written.
+        """
+        with self._lock:
+            lines = [{"op": "segment_done", "segment": segment} for segment in sorted(self.completed)]
+            for segment, game_ids in self.plans.items():
+                lines.append({"op": "plan", "segment": segment, "games": game_ids})
+                for state in (STARTED, DONE, MISSING):
+                    games = [game_id for game_id in game_ids if self.states.get(game_id) == state]
+                    if games:
+                        lines.append({"op": "state", "state": state, "games": games})
+                for game_id in game_ids:
+                    if self.states.get(game_id) == FAILED:
+                        lines.append({"op": "state", "state": FAILED, "games": [game_id],
+                                      "error": self.errors.get(game_id)})
+
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                for line in lines:
+                    f.write(json.dumps(line, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(temp_path, self.path)
+            self._file = open(self.path, "a")
+            self._dirty = False
+            return len(lines)
+
+    def close(self):
+        """Compact the journal (if anything was recorded) and close it."""
+        if self._dirty:
+            self.checkpoint()
+        self._file.close()
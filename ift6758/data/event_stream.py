@@ -0,0 +1,156 @@
+import json
+import os
+import re
+from io import BytesIO
+
+from ift6758.data.cache_codec import get_codec, list_game_files, read_game_bytes, split_game_extension
+from ift6758.data.game_archive import GameArchive, is_archive, list_archives
+from ift6758.data.game_ids import game_id_from_file_name
+from ift6758.data.game_store import GameStore
+from ift6758.data.json_decoder import decode_json
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:  # ijson is optional, the slice reader only needs the standard library
+    ijson = None
+
+SHOT_EVENT_TYPES = frozenset({'shot-on-goal', 'goal'})
+
+# ijson parses each game incrementally; the slice reader decodes only the plays of each game
+DEFAULT_STREAM_BACKEND = os.getenv("NHL_STREAM_BACKEND", "ijson" if ijson is not None else "slice")
+
+# `"id"` is the first key of a play-by-play document and `"plays"` a top-level key, followed by `"rosterSpots"`
+_GAME_ID = re.compile(rb'\s*\{\s*"id"\s*:\s*(\d+)')
+_PLAYS = re.compile(rb'"plays"\s*:\s*\[')
+_PLAYS_END = re.compile(rb'\]\s*,\s*"rosterSpots"\s*:')
+_SEPARATORS = re.compile(r'[\s,]*')
+
+_DECODER = json.JSONDecoder()
+
+
+def _slice_plays(raw):
+    """
+    Yield (game ID, play) from the raw bytes of a game, without decoding the other sections.
+
+    The `plays` array is sliced out of the document and decoded on its own with
+    the JSON backend (see `ift6758.data.json_decoder`), so the roster, summary and
+    broadcasts are never turned into Python objects. If the end of the array
+    cannot be located, the plays are decoded one at a time instead, and documents
+    not laid out as expected (no leading `id`, no `plays` array) are decoded in full.
+    """
+    id_match, plays_match = _GAME_ID.match(raw), _PLAYS.search(raw)
+    if id_match is None or plays_match is None:
+        game = decode_json(raw)
+        for play in game.get('plays', []):
+            yield game.get('id'), play
+        return
+
+    game_id = int(id_match.group(1))
+    end_match = _PLAYS_END.search(raw, plays_match.end())
+    if end_match is not None:
+        for play in decode_json(raw[plays_match.end() - 1:end_match.start() + 1]):
+            yield game_id, play
+        return
+
+    text = raw.decode("utf-8")
+    index = _SEPARATORS.match(text, len(raw[:plays_match.end()].decode("utf-8"))).end()
+    while not text.startswith(']', index):
+        play, index = _DECODER.raw_decode(text, index)
+        yield game_id, play
+        index = _SEPARATORS.match(text, index).end()
+
+
+def _ijson_plays(fileobj):
+    """Yield (game ID, play) from a file object with ijson, building only one play at a time."""
+    game_id, builder = None, None
+    for prefix, event, value in ijson.parse(fileobj, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == 'plays.item' and event == 'end_map':
+                yield game_id, builder.value
+                builder = None
+        elif prefix == 'plays.item' and event == 'start_map':
+            builder = ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == 'id' and event == 'number':
+            game_id = value
+        elif prefix == 'plays' and event == 'end_array':
+            return
+
+
+def _file_plays(path, backend):
+    """Yield (game ID, play) from a cached game file."""
+    if backend == "slice":
+        yield from _slice_plays(read_game_bytes(path))
+        return
+    _, name = split_game_extension(path)
+    with open(path, "rb") as f, get_codec(name or "json").stream_reader(f) as stream:
+        yield from _ijson_plays(stream)
+
+
+def _raw_plays(raw, backend):
+    """Yield (game ID, play) from the uncompressed bytes of a game (e.g., from an archive)."""
+    if backend == "slice":
+        return _slice_plays(raw)
+    return _ijson_plays(BytesIO(raw))
+
+
+def _source_plays(source, backend):
+    """Yield (game ID, play) from every game of a source, in the order of `iter_games`."""
+    if isinstance(source, GameStore):
+        for game_id in source.game_ids():
+            yield from _file_plays(source.path_of(game_id), backend)
+        return
+    if os.path.isfile(source) and not is_archive(source):
+        yield from _file_plays(source, backend)
+        return
+
+    if is_archive(source):
+        archives, files = [source], []
+    else:
+        archives, files = list_archives(source), list_game_files(source)
+    seen = set()
+    for path in archives:
+        with GameArchive(path, readonly=True) as archive:
+            for game_id, raw in archive.iter_raw():
+                seen.add(game_id)
+                yield from _raw_plays(raw, backend)
+    for path in files:
+        game_id = game_id_from_file_name(path)
+        if game_id is None or game_id not in seen:
+            seen.add(game_id)
+            yield from _file_plays(path, backend)
+
+
+def iter_events(source, types=SHOT_EVENT_TYPES, backend=None):
+    """
+    Stream the plays of one or many games without decoding whole game documents.
+
+    Only the `id` and the `plays` of each game are turned into Python objects;
+    with ijson the document is parsed incrementally, otherwise the plays are
+    decoded one at a time from the raw bytes of each game. Memory therefore
+    stays flat whatever the number of games.
+
+    Args:
+        source (str or GameStore): A cached game file, a season archive, a cache
+            directory (archives first, then loose game files, like `iter_games`)
+            or a `GameStore`.
+        types (set): Event types (`typeDescKey`) to keep, or None for every play.
+        backend (str): 'ijson' or 'slice' (defaults to `DEFAULT_STREAM_BACKEND`).
+
+    Yields:
+        tuple: (game ID as an int, play dict), in game then play order.
+
+    Raises:
+        ValueError: If a game is not valid JSON, or the backend is unknown.
+    """
+    backend = backend or DEFAULT_STREAM_BACKEND
+    if backend not in ("ijson", "slice"):
+        raise ValueError(f"Unknown stream backend: {backend}")
+    if backend == "ijson" and ijson is None:
+        raise ImportError("The 'ijson' package is required for the ijson stream backend.")
+
+    for game_id, play in _source_plays(source, backend):
+        if types is None or play.get('typeDescKey') in types:
+            yield game_id, play
@@ -0,0 +1,230 @@
+import glob
+import os
+import sqlite3
+
+from ift6758.data.cache_codec import encode_game, get_codec, list_game_files, read_game
+from ift6758.data.game_ids import game_id_from_file_name
+from ift6758.data.json_decoder import decode_json
+
+ARCHIVE_EXTENSION = ".sqlite"
+
+
+class GameArchive:
+    """
+    Single-file archive of the games of a season, stored as compressed blobs in SQLite.
+
+    Games are keyed by their 10-digit game ID, so one game can be read without
+    touching the others, and a full scan reads a single file sequentially
+    instead of opening thousands of small files.
+    """
+
+    def __init__(self, path, codec=None, readonly=False):
+        """
+        Args:
+            path (str): Path of the archive file (created if missing, unless readonly).
+            codec (str): Codec used for new games ('json', 'gzip' or 'zstd').
+            readonly (bool): Open an existing archive for reading only.
+        """
+        self.path = path
+        self.codec = get_codec(codec)
+        if readonly:
+            self.connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS games (game_id TEXT PRIMARY KEY, codec TEXT NOT NULL, data BLOB NOT NULL)"
+            )
+            self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, game_id):
+        row = self.connection.execute("SELECT 1 FROM games WHERE game_id = ?", (str(game_id),)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def put_raw(self, game_id, raw, commit=True):
+        """
+        Store the uncompressed JSON bytes of a game.
+
+        Args:
+            game_id (str): Full 10-digit game ID.
+            raw (bytes): JSON document of the game.
+            commit (bool): Commit immediately (disable to batch many inserts).
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO games (game_id, codec, data) VALUES (?, ?, ?)",
+            (str(game_id), self.codec.name, self.codec.compress(raw)),
+        )
+        if commit:
+            self.connection.commit()
+
+    def put(self, game_id, data, commit=True):
+        """
+        Store a game.
+
+        Args:
+            game_id (str): Full 10-digit game ID.
+            data (dict): JSON data of the game.
+            commit (bool): Commit immediately (disable to batch many inserts).
+        """
+        self.put_raw(game_id, encode_game(data), commit)
+
+    def get_raw(self, game_id):
+        """
+        Read the uncompressed JSON bytes of a game.
+
+        Args:
+            game_id (str): Full 10-digit game ID.
+
+        Returns:
+            bytes: JSON document, or None if the game is not in the archive.
+        """
+        row = self.connection.execute("SELECT codec, data FROM games WHERE game_id = ?", (str(game_id),)).fetchone()
+        if row is None:
+            return None
+        return get_codec(row[0]).decompress(row[1])
+
+    def get(self, game_id):
+        """
+        Read a game.
+
+        Args:
+            game_id (str): Full 10-digit game ID.
+
+        Returns:
+            dict: JSON data of the game, or None if the game is not in the archive.
+        """
+        raw = self.get_raw(game_id)
+        return None if raw is None else decode_json(raw)
+
+    def game_ids(self):
+        """Return the sorted IDs of every game in the archive."""
+        return [row[0] for row in self.connection.execute("SELECT game_id FROM games ORDER BY game_id")]
+
+    def iter_raw(self):
+        """Yield (game_id, uncompressed JSON bytes) for every game, in game ID order."""
+        cursor = self.connection.execute("SELECT game_id, codec, data FROM games ORDER BY game_id")
+        for game_id, codec, payload in cursor:
+            yield game_id, get_codec(codec).decompress(payload)
+
+    def __iter__(self):
+        """Yield the JSON data of every game, in game ID order."""
+        for _, raw in self.iter_raw():
+            yield decode_json(raw)
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+
+def season_archive_path(directory, season):
+    """
+    Path of the archive holding a season.
+
+    Args:
+        directory (str): Directory containing the archives.
+        season (int or str): Starting year of the season (e.g., 2016).
+
+    Returns:
+        str: Path of the season archive.
+    """
+    return os.path.join(directory, f"season_{season}{ARCHIVE_EXTENSION}")
+
+
+def is_archive(path):
+    """Return True if the path is a game archive file."""
+    return path.endswith(ARCHIVE_EXTENSION) and os.path.isfile(path)
+
+
+def list_archives(directory):
+    """List the season archives of a directory, sorted by season."""
+    return sorted(glob.glob(os.path.join(directory, f"*{ARCHIVE_EXTENSION}")))
+
+
+def pack_directory(directory, archive_directory=None, codec=None, remove_original=False):
+    """
+    Pack every cached game file of a directory into one archive per season.
+
+    Args:
+        directory (str): Directory of per-game cache files.
+        archive_directory (str): Where to write the archives (defaults to `directory`).
+        codec (str): Codec used inside the archives.
+        remove_original (bool): Delete each game file once it has been packed.
+
+    Returns:
+        int: Number of games packed.
+    """
+    archive_directory = archive_directory or directory
+    os.makedirs(archive_directory, exist_ok=True)
+    archives = {}
+    packed_files = []
+    try:
+        for path in list_game_files(directory):
+            data = read_game(path)
+            game_id = str(data["id"])
+            season = game_id[:4]
+            if season not in archives:
+                archives[season] = GameArchive(season_archive_path(archive_directory, season), codec)
+            archives[season].put(game_id, data, commit=False)
+            packed_files.append(path)
+    finally:
+        for archive in archives.values():
+            archive.close()
+
+    # Only delete the originals once every archive has been committed
+    if remove_original:
+        for path in packed_files:
+            os.remove(path)
+    return len(packed_files)
+
+
+def iter_games(source, skip_invalid=False):
+    """
+    Yield the JSON data of every game in a cache, whatever its layout.
+
+    Args:
+        source (str): A season archive file, or a directory containing season
+            archives and/or per-game cache files.
+        skip_invalid (bool): Skip game files that are not valid JSON instead of raising.
+
+    Yields:
+        dict: JSON data of each game. Archives are read first, then any loose
+        game files that are not already in an archive. A game cached under both
+        file naming schemes is only read once.
+    """
+    if is_archive(source):
+        archives, files = [source], []
+    else:
+        archives, files = list_archives(source), list_game_files(source)
+
+    seen = set()
+    for path in archives:
+        with GameArchive(path, readonly=True) as archive:
+            for data in archive:
+                seen.add(str(data.get("id")))
+                yield data
+    for path in files:
+        # Skip loose files that were already packed or read under another name, before parsing them
+        game_id = game_id_from_file_name(path)
+        if game_id is not None and game_id in seen:
+            continue
+        try:
+            data = read_game(path)
+        except ValueError as err:
+            if not skip_invalid:
+                raise
+            print(f"Error decoding JSON from {path}: {err}")
+            continue
+        if str(data.get("id")) not in seen:
+            seen.add(str(data.get("id")))
+            yield data
@@ -0,0 +1,164 @@
+import os
+
+import requests
+
+from ift6758.data.json_decoder import decode_json
+from ift6758.data.nhl_client import get_client
+
+# Number of regular season games per season (keyed by starting year)
+REGULAR_SEASON_GAMES = {
+    2012: 720,   # Lockout-shortened season
+    2013: 1230,
+    2014: 1230,
+    2015: 1230,
+    2016: 1230,
+    2017: 1271,  # Vegas joins the league
+    2018: 1271,
+    2019: 1082,  # Season paused in March 2020, remaining games never played
+    2020: 868,   # 56-game divisional season
+    2021: 1312,  # Seattle joins the league
+    2022: 1312,
+    2023: 1312,
+    2024: 1312,
+}
+DEFAULT_REGULAR_SEASON_GAMES = 1312
+
+# Playoff rounds: number of series per round, each series is best of 7
+PLAYOFF_SERIES_PER_ROUND = {1: 8, 2: 4, 3: 2, 4: 1}
+MAX_GAMES_PER_SERIES = 7
+
+
+def format_game_id(season, game_type, game_number):
+    """
+    Build a full 10-digit game ID.
+
+    Args:
+        season (int): Starting year of the season (e.g., 2016 for 2016-17).
+        game_type (str): '02' for regular season, '03' for playoffs.
+        game_number (int or str): Game number (for playoffs, the '0RSG' round/series/game code).
+
+    Returns:
+        str: The game ID (e.g., '2016020001').
+    """
+    return f"{season}{game_type}{str(game_number).zfill(4)}"
+
+
+def regular_season_game_ids(season):
+    """
+    List every regular season game ID of a season from the known season lengths.
+
+    Args:
+        season (int): Starting year of the season.
+
+    Returns:
+        list: Game IDs in game order.
+    """
+    n_games = REGULAR_SEASON_GAMES.get(season, DEFAULT_REGULAR_SEASON_GAMES)
+    return [format_game_id(season, "02", game_number) for game_number in range(1, n_games + 1)]
+
+
+def playoff_game_ids(season):
+    """
+    List every possible playoff game ID of a season from the bracket structure.
+
+    Playoff game numbers encode '0RSG': round (1-4), series within the round and
+    game within the series (1-7). Without the schedule the number of games each
+    series actually went to is unknown, so this is the full best-of-7 bracket.
+
+    Args:
+        season (int): Starting year of the season.
+
+    Returns:
+        list: Game IDs ordered by round, series and game.
+    """
+    game_ids = []
+    for playoff_round, n_series in PLAYOFF_SERIES_PER_ROUND.items():
+        for series in range(1, n_series + 1):
+            for game in range(1, MAX_GAMES_PER_SERIES + 1):
+                game_ids.append(format_game_id(season, "03", f"0{playoff_round}{series}{game}"))
+    return game_ids
+
+
+def fetch_scheduled_game_ids(season, game_type, client=None):
+    """
+    Fetch the exact list of game IDs of a season from the NHL stats API schedule
+    (the list of every scheduled game, filtered with a Cayenne expression).
+
+    Args:
+        season (int): Starting year of the season.
+        game_type (str): '02' for regular season, '03' for playoffs.
+        client (NHLClient): Client used for the request (defaults to the shared client).
+
+    Returns:
+        list: Sorted game IDs, or None if the schedule could not be fetched.
+    """
+    client = client or get_client()
+    season_code = f"{season}{season + 1}"
+    params = {"cayenneExp": f"season={season_code} and gameType={int(game_type)}"}
+    try:
+        response = client.get(client.schedule_url(), params=params)
+        response.raise_for_status()
+        games = decode_json(response.content).get("data", [])
+    except (requests.exceptions.RequestException, ValueError) as err:
+        print(f"Schedule Error for {season}-{season + 1} ({game_type}): {err}")
+        return None
+
+    return sorted(str(game["id"]) for game in games
+                  if str(game.get("season")) == season_code and game.get("gameType") == int(game_type))
+
+
+def plan_game_ids(season, game_type, client=None, use_schedule=True):
+    """
+    Build the list of game IDs to download for a season and game type.
+
+    The schedule is used when available so that no request is wasted on a game
+    that does not exist (a season or playoffs with nothing scheduled yet plan
+    no games); only when the schedule cannot be fetched does the plan fall
+    back to the known season length (regular season) or the full bracket
+    (playoffs).
+
+    Args:
+        season (int): Starting year of the season.
+        game_type (str): '02' for regular season, '03' for playoffs.
+        client (NHLClient): Client used to fetch the schedule (defaults to the shared client).
+        use_schedule (bool): Whether to query the schedule before falling back.
+
+    Returns:
+        list: Game IDs in game order.
+    """
+    if use_schedule:
+        game_ids = fetch_scheduled_game_ids(season, game_type, client)
+        if game_ids is not None:
+            return game_ids
+
+    if game_type == "02":
+        return regular_season_game_ids(season)
+    if game_type == "03":
+        return playoff_game_ids(season)
+    raise ValueError(f"Unsupported game type: {game_type}")
+
+
+def game_id_from_file_name(file_name):
+    """
+    Recover the game ID from the name of a cached game file.
+
+    Two naming schemes exist: `{game_id}.json` (data acquisition) and
+    `game_{year + 1}_{game_type}_{game_number}.json` (method 2, where the year is
+    one more than the season in the game ID, and where the game number may carry
+    extra zero padding).
+
+    Args:
+        file_name (str): File name or path of a cached game.
+
+    Returns:
+        str: The 10-digit game ID, or None if the name matches neither scheme.
+    """
+    stem = os.path.basename(file_name).split(".")[0]
+    if len(stem) == 10 and stem.isdigit():
+        return stem
+    parts = stem.split("_")
+    if len(parts) == 4 and parts[0] == "game" and all(part.isdigit() for part in parts[1:]):
+        game_type, game_number = parts[2].zfill(2), parts[3].lstrip("0").zfill(4)
+        if len(game_type) == 2 and len(game_number) == 4:
+            return format_game_id(int(parts[1]) - 1, game_type, game_number)
+    return None
@@ -0,0 +1,256 @@
+import os
+import time
+
+from ift6758.data.cache_codec import (
+    encode_game,
+    list_game_files,
+    read_game,
+    read_game_bytes,
+    split_game_extension,
+    write_game_raw,
+)
+from ift6758.data.cache_manifest import CacheManifest, checksum
+from ift6758.data.game_ids import game_id_from_file_name
+
+# Version of the cache layout, recorded in the manifest once a directory is migrated
+STORE_LAYOUT = "canonical-v1"
+
+
+def canonical_game_path(cache_dir, game_id):
+    """
+    Path of a game in a cache directory: `{game_id}.json`, before the codec extension.
+
+    Args:
+        cache_dir (str): Cache directory.
+        game_id (str): Full 10-digit game ID.
+
+    Returns:
+        str: Canonical path of the game (the codec may replace the `.json` extension).
+    """
+    return os.path.join(cache_dir, f"{game_id}.json")
+
+
+def is_canonical_file(path, game_id):
+    """Return True if a cached file is named after its game ID (whatever its codec)."""
+    base_path, _ = split_game_extension(path)
+    return os.path.basename(base_path) == str(game_id)
+
+
+class GameStore:
+    """
+    Cache of play-by-play games keyed by canonical game ID.
+
+    Every game lives in one file named `{game_id}` plus its codec extension,
+    indexed by the cache manifest. The first time a directory is opened, files
+    written under other naming schemes (`game_{year + 1}_{type}_{number}.json`
+    from method 2) are migrated: copies with the same content hash are
+    removed, and the remaining file of each game is renamed to its canonical
+    name. A game is then fetched, stored and read under a single name,
+    whichever acquisition path downloaded it.
+    """
+
+    def __init__(self, cache_dir, legacy_dirs=(), codec=None, manifest=None):
+        """
+        Args:
+            cache_dir (str): Cache directory of the store.
+            legacy_dirs (iterable): Other cache directories whose games are imported
+                (copied, never deleted) by the migration, e.g. the Drive folder of
+                `1_data_acquisition.py` and the `NHL_DATA_FOLDER` of method 2.
+            codec (str): Codec of the games written by the store (defaults to `DEFAULT_CODEC`).
+            manifest (CacheManifest): Manifest of `cache_dir` if already loaded.
+        """
+        self.cache_dir = cache_dir
+        self.codec = codec
+        self.manifest = manifest if manifest is not None else CacheManifest(cache_dir)
+        # Each legacy directory is imported once
+        imported = self.manifest.info.get("imported_dirs", [])
+        legacy_dirs = [os.path.abspath(path) for path in legacy_dirs
+                       if os.path.isdir(path) and os.path.abspath(path) not in imported
+                       and os.path.abspath(path) != os.path.abspath(cache_dir)]
+        if self.manifest.info.get("layout") != STORE_LAYOUT or legacy_dirs:
+            self.migrate(legacy_dirs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, game_id):
+        return game_id in self.manifest
+
+    def __len__(self):
+        return len(self.manifest)
+
+    def __iter__(self):
+        """Yield the JSON data of every game, in game ID order."""
+        for game_id in self.game_ids():
+            yield self.get(game_id)
+
+    def game_ids(self):
+        """Return the sorted IDs of every stored game."""
+        return sorted(self.manifest.entries)
+
+    def path_of(self, game_id):
+        """Return the path of a stored game, or None if it is not in the store."""
+        return self.manifest.path_of(game_id)
+
+    def remaining(self, game_ids):
+        """Return the planned games that are neither stored nor known to be missing (see `CacheManifest`)."""
+        return self.manifest.remaining(game_ids)
+
+    def get_raw(self, game_id):
+        """
+        Read the uncompressed JSON bytes of a game.
+
+        Args:
+            game_id (str): Full 10-digit game ID.
+
+        Returns:
+            bytes: JSON document, or None if the game is not in the store.
+        """
+        path = self.path_of(game_id)
+        return None if path is None else read_game_bytes(path)
+
+    def get(self, game_id):
+        """
+        Read a game.
+
+        Args:
+            game_id (str): Full 10-digit game ID.
+
+        Returns:
+            dict: JSON data of the game, or None if the game is not in the store.
+        """
+        path = self.path_of(game_id)
+        return None if path is None else read_game(path)
+
+    def put_raw(self, game_id, raw, **validators):
+        """
+        Store the uncompressed JSON bytes of a game under its canonical name.
+
+        Args:
+            game_id (str): Full 10-digit game ID.
+            raw (bytes): JSON document of the game.
+            **validators: `etag` and `last_modified` of the response, kept in the manifest.
+
+        Returns:
+            str: Path of the written file.
+        """
+        path = write_game_raw(raw, canonical_game_path(self.cache_dir, game_id), self.codec)
+        self.manifest.record(game_id, path, raw, **validators)
+        return path
+
+    def put(self, game_id, data, **validators):
+        """
+        Store a game under its canonical name.
+
+        Args:
+            game_id (str): Full 10-digit game ID.
+            data (dict): JSON data of the game.
+            **validators: `etag` and `last_modified` of the response, kept in the manifest.
+
+        Returns:
+            str: Path of the written file.
+        """
+        return self.put_raw(game_id, encode_game(data), **validators)
+
+    def _scan(self, directory):
+        """Yield (game_id, path, sha256) for every game file of a directory."""
+        for path in list_game_files(directory):
+            game_id = game_id_from_file_name(path)
+            if game_id is None:
+                continue
+            # Files already indexed under their canonical name are not read again
+            entry = self.manifest.entries.get(game_id)
+            if (entry is not None and directory == self.cache_dir and entry["file"] == os.path.basename(path)
+                    and entry["size"] == os.path.getsize(path)):
+                yield game_id, path, entry["sha256"]
+            else:
+                try:
+                    raw = read_game_bytes(path)
+                except ValueError as err:
+                    # Not kept in the manifest, so the game is downloaded again
+                    print(f"Skipping game {game_id}: {err}")
+                    continue
+                yield game_id, path, checksum(raw)
+
+    def migrate(self, legacy_dirs=()):
+        """
+        Bring the cache directory (and optionally other directories) to the canonical layout.
+
+        Files with the same content hash are one game: a single copy is kept. When
+        a game has several different versions (e.g., downloaded once while live),
+        the most recently written one is kept. The kept file is renamed to
+        `{game_id}` plus its extension (copied if it comes from a legacy
+        directory), and the manifest is rebuilt from the result.
+
+        Args:
+            legacy_dirs (iterable): Other cache directories to import games from.
+
+        Returns:
+            dict: Number of games `kept`, `renamed`, `imported` and of duplicate files `removed`.
+        """
+        print(f"Migrating {self.cache_dir} to the canonical game store layout...")
+        counts = {"kept": 0, "renamed": 0, "imported": 0, "removed": 0}
+        seen_hashes = set()
+        versions = {}
+        for directory in [self.cache_dir, *legacy_dirs]:
+            for game_id, path, sha256 in self._scan(directory):
+                if sha256 in seen_hashes:
+                    # Same bytes as a file already seen: a duplicate download
+                    if directory == self.cache_dir:
+                        os.remove(path)
+                        counts["removed"] += 1
+                    continue
+                seen_hashes.add(sha256)
+                versions.setdefault(game_id, []).append((os.path.getmtime(path), directory == self.cache_dir,
+                                                         path, sha256))
+
+        entries = {}
+        for game_id, candidates in versions.items():
+            # Newest version first; a file already in the cache directory wins a tie
+            candidates.sort(key=lambda version: (version[0], version[1]), reverse=True)
+            fetched_at, local, path, sha256 = candidates[0]
+            for _, other_local, other_path, _ in candidates[1:]:
+                if other_local:
+                    os.remove(other_path)
+                    counts["removed"] += 1
+
+            target = canonical_game_path(self.cache_dir, game_id)
+            if not local:
+                path = write_game_raw(read_game_bytes(path), target, self.codec)
+                counts["imported"] += 1
+            elif not is_canonical_file(path, game_id):
+                # Same codec, new name: the file is renamed, not rewritten
+                extension = path[len(split_game_extension(path)[0]):]
+                new_path = split_game_extension(target)[0] + extension
+                os.replace(path, new_path)
+                path = new_path
+                counts["renamed"] += 1
+            else:
+                counts["kept"] += 1
+            previous = self.manifest.entries.get(game_id, {})
+            entries[game_id] = {
+                "file": os.path.relpath(path, self.cache_dir),
+                "size": os.path.getsize(path),
+                "fetched_at": previous.get("fetched_at", fetched_at),
+                "sha256": sha256,
+                **{key: previous[key] for key in ("etag", "last_modified")
+                   if key in previous and previous.get("sha256") == sha256},
+            }
+
+        self.manifest.entries = entries
+        self.manifest.info.update(
+            layout=STORE_LAYOUT,
+            migrated_at=time.time(),
+            imported_dirs=sorted(set(self.manifest.info.get("imported_dirs", [])) | set(legacy_dirs)),
+        )
+        self.manifest.save()
+        print(f"{len(entries)} games in the store ({counts['renamed']} renamed, {counts['imported']} imported, "
+              f"{counts['removed']} duplicate files removed).")
+        return counts
+
+    def close(self):
+        """Save the manifest if games were added."""
+        self.manifest.close()
@@ -0,0 +1,78 @@
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard library is always available
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # pysimdjson is optional too
+    simdjson = None
+
+
+def _stdlib_loads(raw):
+    return json.loads(raw)
+
+
+def _orjson_loads(raw):
+    return orjson.loads(raw)
+
+
+def _simdjson_loads(raw):
+    return simdjson.loads(raw)
+
+
+DECODERS = {"orjson": _orjson_loads, "simdjson": _simdjson_loads, "json": _stdlib_loads}
+
+_INSTALLED = {"orjson": orjson is not None, "simdjson": simdjson is not None, "json": True}
+
+# Fastest installed backend: orjson, then simdjson, then the standard library
+DEFAULT_JSON_BACKEND = os.getenv(
+    "NHL_JSON_BACKEND", next(name for name in ("orjson", "simdjson", "json") if _INSTALLED[name])
+)
+
+
+def available_backends():
+    """Return the names of the installed JSON backends, fastest first."""
+    return [name for name in DECODERS if _INSTALLED[name]]
+
+
+def get_decoder(name=None):
+    """
+    Return the decode function of a JSON backend.
+
+    Args:
+        name (str): 'orjson', 'simdjson' or 'json' (defaults to `DEFAULT_JSON_BACKEND`).
+
+    Returns:
+        callable: Function decoding UTF-8 JSON bytes (or str) into Python objects.
+    """
+    name = name or DEFAULT_JSON_BACKEND
+    if name not in DECODERS:
+        raise ValueError(f"Unknown JSON backend: {name}")
+    if not _INSTALLED[name]:
+        raise ImportError(f"The '{name}' package is required for the {name} JSON backend.")
+    return DECODERS[name]
+
+
+def decode_json(raw, backend=None):
+    """
+    Decode a JSON document with the fastest installed backend.
+
+    Every loader goes through this function, so installing `orjson` (or
+    `pysimdjson`) speeds up all of them; the standard library is the fallback.
+    The backends decode bytes directly, without decoding them to text first.
+
+    Args:
+        raw (bytes or str): JSON document.
+        backend (str): Backend name (defaults to `DEFAULT_JSON_BACKEND`).
+
+    Returns:
+        The decoded document (dict for a game).
+
+    Raises:
+        ValueError: If the document is not valid JSON (every backend raises a subclass).
+    """
+    return get_decoder(backend)(raw)
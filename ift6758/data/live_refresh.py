@@ -0,0 +1,123 @@
+import os
+from email.utils import formatdate
+
+from ift6758.data.cache_codec import encode_game, read_game, write_game_raw
+from ift6758.data.json_decoder import decode_json
+from ift6758.data.nhl_client import get_client
+
+# Game states after which the play-by-play no longer changes
+FINAL_GAME_STATES = ("OFF", "FINAL")
+
+
+def is_final(game):
+    """Return True if the game is over and its cached play-by-play is complete."""
+    return game.get("gameState") in FINAL_GAME_STATES
+
+
+def _play_order(play):
+    return play.get("sortOrder", 0), play.get("eventId", 0)
+
+
+def merge_plays(cached_plays, new_plays):
+    """
+    Merge a fresh list of plays into the cached one.
+
+    Plays are matched by `eventId`; a play present in both lists is replaced by
+    its fresh version (the league corrects events after the fact).
+
+    Args:
+        cached_plays (list): Plays of the cached game.
+        new_plays (list): Plays of the freshly downloaded game.
+
+    Returns:
+        tuple: (every play sorted by `sortOrder`, plays whose `eventId` was not cached).
+    """
+    merged = {play["eventId"]: play for play in cached_plays}
+    added = [play for play in new_plays if play["eventId"] not in merged]
+    merged.update((play["eventId"], play) for play in new_plays)
+    return sorted(merged.values(), key=_play_order), sorted(added, key=_play_order)
+
+
+def merge_game(cached, fresh):
+    """
+    Merge a fresh download of a game into its cached version.
+
+    Args:
+        cached (dict): JSON data of the cached game.
+        fresh (dict): JSON data of the game just downloaded.
+
+    Returns:
+        tuple: (merged game, list of new plays).
+    """
+    plays, added = merge_plays(cached.get("plays", []), fresh.get("plays", []))
+    merged = dict(fresh)
+    merged["plays"] = plays
+    return merged, added
+
+
+def conditional_headers(cache_file, entry=None):
+    """
+    Build the conditional request headers for a cached game.
+
+    Args:
+        cache_file (str): Path of the cached game.
+        entry (dict): Manifest entry of the game, with the `etag` and
+            `last_modified` validators returned by the server if any.
+
+    Returns:
+        dict: `If-None-Match` and/or `If-Modified-Since` headers. Without a
+        stored validator, the modification time of the cached file is used.
+    """
+    entry = entry or {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    elif not headers:
+        headers["If-Modified-Since"] = formatdate(os.path.getmtime(cache_file), usegmt=True)
+    return headers
+
+
+def refresh_game(game_id, cache_file, manifest=None, client=None):
+    """
+    Bring a cached game up to date with a conditional request.
+
+    Final games are returned from the cache without a request. Otherwise the
+    server answers 304 if nothing changed; if the game changed, its plays are
+    merged into the cached ones and the cache is rewritten.
+
+    Args:
+        game_id (str): Full 10-digit game ID.
+        cache_file (str): Path of the cached game.
+        manifest (CacheManifest): Manifest holding the validators of the game
+            (updated with the new ones).
+        client (NHLClient): Client used for the request (defaults to the shared client).
+
+    Returns:
+        tuple: (JSON data of the game, list of plays added since the cached
+        version). The list is empty if nothing changed.
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails.
+    """
+    cached = read_game(cache_file)
+    if is_final(cached):
+        return cached, []
+
+    client = client or get_client()
+    entry = manifest.entries.get(str(game_id)) if manifest is not None else None
+    response = client.get(client.play_by_play_url(game_id), headers=conditional_headers(cache_file, entry))
+    if response.status_code == 304:
+        print(f"Game ID {game_id} not modified.")
+        return cached, []
+    response.raise_for_status()
+
+    game, new_plays = merge_game(cached, decode_json(response.content))
+    raw = encode_game(game)
+    cache_file = write_game_raw(raw, cache_file)
+    print(f"Game ID {game_id} refreshed: {len(new_plays)} new plays.")
+    if manifest is not None:
+        manifest.record(game_id, cache_file, raw, etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"))
+    return game, new_plays
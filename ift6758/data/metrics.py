@@ -0,0 +1,221 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+# Timing spans of a game download: opening a new connection (DNS + TCP + TLS),
+# waiting for the response headers, reading the body and writing it to the cache
+SPANS = ("connect", "first_byte", "body", "write")
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(sorted_samples, quantile):
+    """
+    Nearest-rank percentile of already sorted samples.
+
+    Args:
+        sorted_samples (list): Samples in increasing order.
+        quantile (float): Quantile between 0 and 1 (e.g., 0.95).
+
+    Returns:
+        float: The percentile, or None if there are no samples.
+    """
+    if not sorted_samples:
+        return None
+    rank = max(0, min(len(sorted_samples) - 1, int(round(quantile * len(sorted_samples))) - 1))
+    return sorted_samples[rank]
+
+
+class TimedIterator:
+    """
+    Wrap an iterator of byte chunks and measure the time spent waiting for them.
+
+    Used around `response.iter_content` so that reading the body from the
+    network can be told apart from compressing and writing it to disk.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.seconds = 0.0
+        self.n_bytes = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            chunk = next(self._chunks)
+        finally:
+            self.seconds += time.perf_counter() - start
+        self.n_bytes += len(chunk)
+        return chunk
+
+
+class DownloadMetrics:
+    """
+    Latency samples, counters and rolling throughput of a bulk download.
+
+    Shared by every worker (thread-safe). `snapshot` returns the p50/p95/p99
+    of each span, the status code counts and the throughput, which can be
+    written as JSON or in the Prometheus text format with `save`.
+    """
+
+    def __init__(self, window=30.0):
+        """
+        Args:
+            window (float): Length in seconds of the window used for the rolling rates.
+        """
+        self.window = window
+        self.samples = defaultdict(list)
+        self.status_counts = Counter()
+        self.n_games = 0
+        self.n_bytes = 0
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def observe(self, span, seconds):
+        """Record the duration of a span (see `SPANS`)."""
+        with self._lock:
+            self.samples[span].append(seconds)
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """Context manager recording the time spent in its block as the span `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def count_status(self, status_code):
+        """Count a response by HTTP status code (or 'error' for a connection failure)."""
+        with self._lock:
+            self.status_counts[str(status_code)] += 1
+
+    def record_game(self, n_bytes):
+        """Count a downloaded game and its size (uncompressed body bytes)."""
+        now = time.perf_counter()
+        with self._lock:
+            self.n_games += 1
+            self.n_bytes += n_bytes
+            self._recent.append((now, n_bytes))
+
+    def rates(self):
+        """
+        Rolling throughput over the last `window` seconds.
+
+        Returns:
+            tuple: (games per second, megabytes per second).
+        """
+        now = time.perf_counter()
+        with self._lock:
+            while self._recent and now - self._recent[0][0] > self.window:
+                self._recent.popleft()
+            if not self._recent:
+                return 0.0, 0.0
+            elapsed = max(min(self.window, now - self._start), 1e-9)
+            n_bytes = sum(size for _, size in self._recent)
+            return len(self._recent) / elapsed, n_bytes / elapsed / 1e6
+
+    def snapshot(self):
+        """
+        Summary of the run so far.
+
+        Returns:
+            dict: Totals, average and rolling throughput, status counts, and the
+            count, mean and p50/p95/p99 in seconds of each span.
+        """
+        games_per_sec, mb_per_sec = self.rates()
+        with self._lock:
+            elapsed = time.perf_counter() - self._start
+            spans = {}
+            for name, samples in self.samples.items():
+                ordered = sorted(samples)
+                spans[name] = {
+                    "count": len(ordered),
+                    "mean": sum(ordered) / len(ordered) if ordered else None,
+                    **{f"p{int(q * 100)}": percentile(ordered, q) for q in QUANTILES},
+                }
+            return {
+                "started_at": self.started_at,
+                "elapsed_seconds": elapsed,
+                "games": self.n_games,
+                "bytes": self.n_bytes,
+                "games_per_second": self.n_games / elapsed if elapsed else 0.0,
+                "mb_per_second": self.n_bytes / elapsed / 1e6 if elapsed else 0.0,
+                "rolling_games_per_second": games_per_sec,
+                "rolling_mb_per_second": mb_per_sec,
+                "status_counts": dict(sorted(self.status_counts.items())),
+                "spans": spans,
+            }
+
+    def to_prometheus(self, prefix="nhl_download"):
+        """
+        Render a snapshot in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prefix of every metric name.
+
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f"# TYPE {prefix}_games_total counter",
+            f"{prefix}_games_total {snapshot['games']}",
+            f"# TYPE {prefix}_bytes_total counter",
+            f"{prefix}_bytes_total {snapshot['bytes']}",
+            f"# TYPE {prefix}_elapsed_seconds gauge",
+            f"{prefix}_elapsed_seconds {snapshot['elapsed_seconds']:.6f}",
+            f"# TYPE {prefix}_rolling_games_per_second gauge",
+            f"{prefix}_rolling_games_per_second {snapshot['rolling_games_per_second']:.6f}",
+            f"# TYPE {prefix}_rolling_mb_per_second gauge",
+            f"{prefix}_rolling_mb_per_second {snapshot['rolling_mb_per_second']:.6f}",
+            f"# TYPE {prefix}_responses_total counter",
+        ]
+        for code, count in snapshot["status_counts"].items():
+            lines.append(f'{prefix}_responses_total{{code="{code}"}} {count}')
+        lines.append(f"# TYPE {prefix}_span_seconds summary")
+        for name, stats in snapshot["spans"].items():
+            for q in QUANTILES:
+                value = stats[f"p{int(q * 100)}"]
+                if value is not None:
+                    lines.append(f'{prefix}_span_seconds{{span="{name}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{prefix}_span_seconds_count{{span="{name}"}} {stats["count"]}')
+            if stats["mean"] is not None:
+                lines.append(f'{prefix}_span_seconds_sum{{span="{name}"}} {stats["mean"] * stats["count"]:.6f}')
+        return "\n".join(lines) + "\n"
+
+    def save(self, path):
+        """
+        Write a snapshot atomically: Prometheus text format if `path` ends with
+        '.prom', JSON otherwise.
+
+        Args:
+            path (str): Destination file.
+        """
+        if path.endswith(".prom"):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.snapshot(), indent=2)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def summary(self):
+        """One-line human readable summary of the run."""
+        snapshot = self.snapshot()
+        parts = [f"{snapshot['games']} games, {snapshot['bytes'] / 1e6:.1f} MB in {snapshot['elapsed_seconds']:.1f} s "
+                 f"({snapshot['games_per_second']:.1f} games/s, {snapshot['mb_per_second']:.2f} MB/s)"]
+        for name in SPANS:
+            stats = snapshot["spans"].get(name)
+            if stats and stats["count"]:
+                parts.append(f"{name} p50={stats['p50'] * 1e3:.0f} ms p95={stats['p95'] * 1e3:.0f} ms "
+                             f"p99={stats['p99'] * 1e3:.0f} ms")
+        return "; ".join(parts)
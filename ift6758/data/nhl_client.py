@@ -0,0 +1,252 @@
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from ift6758.data.json_decoder import decode_json
+from ift6758.data.rate_limiter import parse_retry_after
+
+# Base URLs of the NHL web API used by every acquisition module and of the stats API
+# (schedule); both can be pointed at a local stand-in such as benchmarks/replay_server.py
+NHL_API_BASE_URL = os.getenv("NHL_API_BASE_URL", "https://api-web.nhle.com/v1")
+NHL_STATS_BASE_URL = os.getenv("NHL_STATS_BASE_URL", "https://api.nhle.com/stats/rest")
+
+# Status codes that are worth retrying (throttling and transient server errors)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+DEFAULT_POOL_SIZE = 16
+
+# Time spent opening connections by the current thread during its current request
+_connect_timing = threading.local()
+
+
+class _TimedConnectMixin:
+    """Record how long `connect` (DNS + TCP + TLS) takes, for the request metrics."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timing.seconds = getattr(_connect_timing, "seconds", 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """`HTTPAdapter` whose connections report their connect time (see `NHLClient.get`)."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class NHLClient:
+    """
+    HTTP client for the NHL web API backed by a pooled `requests.Session`.
+
+    The session keeps connections alive between games, so consecutive requests
+    reuse the same TCP/TLS connection instead of paying a new handshake each time.
+    Requests answered with 429/5xx or failing with a connection error are retried
+    with exponential backoff and full jitter, or after `Retry-After` when the
+    server sends one. An optional rate limiter shared by all workers paces requests,
+    and optional metrics record the connect and time-to-first-byte of every attempt.
+    """
+
+    def __init__(self, base_url=NHL_API_BASE_URL, pool_size=DEFAULT_POOL_SIZE, max_retries=4,
+                 backoff_factor=0.5, max_backoff=30.0, timeout=30.0, rate_limiter=None, metrics=None,
+                 stats_base_url=NHL_STATS_BASE_URL):
+        """
+        Args:
+            base_url (str): Root URL of the API (overridable to point at a local stand-in).
+            pool_size (int): Maximum number of kept-alive connections to the API host.
+            max_retries (int): Number of retries after the first attempt.
+            backoff_factor (float): Base delay in seconds, doubled on every retry.
+            max_backoff (float): Upper bound in seconds for a single backoff delay, including `Retry-After`.
+            timeout (float): Connect/read timeout in seconds for each request.
+            rate_limiter (AdaptiveRateLimiter): Optional limiter acquired around every request.
+            metrics (DownloadMetrics): Optional metrics receiving the timing spans and
+                status codes of every attempt.
+            stats_base_url (str): Root URL of the stats API used for the schedule.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.stats_base_url = stats_base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
+
+        self.session = requests.Session()
+        adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def play_by_play_url(self, game_id):
+        """
+        Build the play-by-play URL for a game.
+
+        Args:
+            game_id (str): Full 10-digit game ID (e.g., '2016020001').
+
+        Returns:
+            str: URL of the game's play-by-play document.
+        """
+        return f"{self.base_url}/gamecenter/{game_id}/play-by-play"
+
+    def schedule_url(self):
+        """Return the stats API URL listing every scheduled game."""
+        return f"{self.stats_base_url}/en/game"
+
+    def backoff_delay(self, attempt):
+        """
+        Compute the delay before the given retry attempt (full jitter).
+
+        Args:
+            attempt (int): Zero-based retry attempt.
+
+        Returns:
+            float: Number of seconds to sleep.
+        """
+        ceiling = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def get(self, url, **kwargs):
+        """
+        Send a GET request, retrying on 429/5xx responses and connection errors.
+
+        Args:
+            url (str): URL to request.
+            **kwargs: Extra keyword arguments passed to `requests.Session.get`.
+
+        Returns:
+            requests.Response: The last response received. Callers still call
+            `raise_for_status()` to handle 404s and exhausted retries.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            response = None
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            _connect_timing.seconds = 0.0
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, **kwargs)
+                if response.status_code in RETRY_STATUS_CODES:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if retry_after is not None:
+                        # A server cannot park a worker (or the whole limiter) longer than a backoff
+                        retry_after = min(retry_after, self.max_backoff)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if self.metrics is not None:
+                    self.metrics.count_status("error")
+                if attempt == self.max_retries:
+                    raise
+            finally:
+                # Every path gives the slot back, including errors that are not retried
+                # (invalid URL, too many redirects, ...), or the workers would deadlock in `acquire`
+                if self.rate_limiter is not None:
+                    self.rate_limiter.release(None if response is None else response.status_code, retry_after)
+            if response is not None:
+                if self.metrics is not None:
+                    # With stream=True the call returns once the headers are read
+                    connect = _connect_timing.seconds
+                    if connect:
+                        self.metrics.observe("connect", connect)
+                    self.metrics.observe("first_byte", time.perf_counter() - start - connect)
+                    self.metrics.count_status(response.status_code)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                    return response
+                response.close()
+            time.sleep(retry_after if retry_after is not None else self.backoff_delay(attempt))
+
+    def fetch_play_by_play(self, game_id):
+        """
+        Fetch the play-by-play data of a game.
+
+        Args:
+            game_id (str): Full 10-digit game ID (e.g., '2016020001').
+
+        Returns:
+            dict: JSON data of the play-by-play, or None if not found.
+        """
+        url = self.play_by_play_url(game_id)
+        try:
+            response = self.get(url)
+            response.raise_for_status()
+            return decode_json(response.content)
+        except requests.exceptions.HTTPError as err:
+            if err.response is not None and err.response.status_code == 404:
+                print(f"Game ID {game_id} not found (404). Skipping.")
+            else:
+                print(f"HTTP Error: {err}")
+        except requests.exceptions.RequestException as err:
+            print(f"Request Error: {err}")
+        except ValueError as err:
+            print(f"Invalid JSON for Game ID {game_id}: {err}")
+        return None
+
+    def close(self):
+        """Close every pooled connection."""
+        self.session.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Return the client shared by all acquisition modules, creating it on first use.
+
+    Returns:
+        NHLClient: The shared client.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = NHLClient()
+        return _default_client
+
+
+def configure_client(**kwargs):
+    """
+    Replace the shared client with a new one built from the given options.
+
+    Args:
+        **kwargs: Keyword arguments passed to `NHLClient`.
+
+    Returns:
+        NHLClient: The new shared client.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is not None:
+            _default_client.close()
+        _default_client = NHLClient(**kwargs)
+        return _default_client
@@ -0,0 +1,121 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# Status codes that mean "slow down" rather than "this request is broken"
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value):
+    """
+    Parse a `Retry-After` header value.
+
+    Args:
+        value (str): Header value, either a number of seconds or an HTTP date.
+
+    Returns:
+        float: Number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class AdaptiveRateLimiter:
+    """
+    Token-bucket rate limiter with AIMD concurrency, shared by all download workers.
+
+    Every request first takes a concurrency slot and a token. Throttled responses
+    (429/503) halve both the request rate and the concurrency limit and pause all
+    workers until `Retry-After` has elapsed. Successful responses increase them
+    additively again, so the limiter settles just below the server's limit.
+    """
+
+    def __init__(self, rate=10.0, min_rate=0.5, max_rate=100.0, rate_increase=1.0,
+                 concurrency=4, max_concurrency=32, decrease_factor=0.5, burst=1.0,
+                 decrease_cooldown=1.0):
+        """
+        Args:
+            rate (float): Initial number of requests per second.
+            min_rate (float): Lower bound for the request rate.
+            max_rate (float): Upper bound for the request rate.
+            rate_increase (float): Requests per second added for each second of unthrottled traffic.
+            concurrency (int): Initial number of requests allowed in flight.
+            max_concurrency (int): Upper bound for the number of requests in flight.
+            decrease_factor (float): Multiplier applied to rate and concurrency on a throttled response.
+            burst (float): Bucket capacity in tokens.
+            decrease_cooldown (float): Seconds during which further throttled responses do
+                not decrease again (they usually come from the same burst).
+        """
+        self.rate = float(rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate_increase = rate_increase
+        self.concurrency = float(concurrency)
+        self.max_concurrency = max_concurrency
+        self.decrease_factor = decrease_factor
+        self.burst = burst
+        self.decrease_cooldown = decrease_cooldown
+
+        self.tokens = burst
+        self.in_flight = 0
+        self.throttled_count = 0
+        self._last_refill = time.monotonic()
+        self._last_decrease = float("-inf")
+        self._blocked_until = 0.0
+        self._condition = threading.Condition()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self):
+        """Block until a concurrency slot and a token are both available."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    self._condition.wait(self._blocked_until - now)
+                elif self.in_flight >= int(self.concurrency):
+                    self._condition.wait()
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    return
+                else:
+                    self._condition.wait((1 - self.tokens) / self.rate)
+
+    def release(self, status_code=None, retry_after=None):
+        """
+        Release the slot taken by `acquire` and adapt to the response.
+
+        Args:
+            status_code (int): HTTP status of the response, or None if the request failed.
+            retry_after (float): Seconds requested by the server's `Retry-After` header.
+        """
+        with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if status_code in THROTTLE_STATUS_CODES:
+                self.throttled_count += 1
+                if now - self._last_decrease >= self.decrease_cooldown:
+                    self._last_decrease = now
+                    self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                    self.concurrency = max(1.0, self.concurrency * self.decrease_factor)
+                    self.tokens = min(self.tokens, 0.0)
+                if retry_after is not None:
+                    self._blocked_until = max(self._blocked_until, now + retry_after)
+            elif status_code is not None and status_code < 500:
+                # Additive increase: +rate_increase per second, +1 slot per window of successes
+                self.rate = min(self.max_rate, self.rate + self.rate_increase / self.rate)
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+            self._condition.notify_all()
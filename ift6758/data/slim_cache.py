@@ -0,0 +1,401 @@
+import hashlib
+import json
+import os
+import sqlite3
+from collections import defaultdict
+
+from ift6758.data.cache_codec import encode_game, get_codec, list_game_files, read_game
+from ift6758.data.game_archive import ARCHIVE_EXTENSION, GameArchive, is_archive, iter_games, list_archives
+from ift6758.data.game_ids import game_id_from_file_name
+from ift6758.data.json_decoder import decode_json
+
+# Sub-directory of the raw cache holding the slim tier
+SLIM_DIR_NAME = "slim"
+
+# Bump when the file format changes, so that older slim files are rebuilt
+SLIM_FORMAT_VERSION = 3
+
+# The loaders read through the slim tier unless NHL_SLIM_CACHE=0 (or `use_slim=False`); on a
+# read-only cache they fall back to the raw games (see `use_slim_tier`)
+USE_SLIM_CACHE = os.getenv("NHL_SLIM_CACHE", "1") == "1"
+
+# Fields kept in the slim tier: the ones the loaders read (`ift6758.features.game_columns`
+# and the visualizations). A dict keeps the listed keys (recursively), a list applies its
+# only element to every item, and True keeps the value as is.
+SLIM_PROJECTION = {
+    "id": True,
+    "plays": [{
+        "sortOrder": True,
+        "periodDescriptor": {"number": True},
+        "timeInPeriod": True,
+        "typeDescKey": True,
+        "details": {
+            "xCoord": True,
+            "yCoord": True,
+            "shotType": True,
+            "eventOwnerTeamId": True,
+            "shootingPlayerId": True,
+            "scoringPlayerId": True,
+            "goalieInNetId": True,
+            "emptyNet": True,
+        },
+    }],
+}
+
+
+def compile_projection(spec):
+    """
+    Turn a projection into a function applying it, so that the spec is walked once
+    and not for every play of every game.
+
+    Args:
+        spec: Projection: a dict of keys to sub-projections, a one-element list
+            whose element is applied to every item, or True to keep the value.
+
+    Returns:
+        callable: Function of a JSON value returning its projection, or None for a
+        projection that keeps the value as is.
+    """
+    if spec is True:
+        return None
+    if isinstance(spec, list):
+        item = compile_projection(spec[0])
+        if item is None:
+            return None
+        return lambda data: [item(value) for value in data] if isinstance(data, list) else data
+    fields = [(key, compile_projection(sub_spec)) for key, sub_spec in spec.items()]
+
+    def projector(data):
+        if not isinstance(data, dict):
+            return data
+        projected = {}
+        for key, sub in fields:
+            if key in data:
+                projected[key] = data[key] if sub is None else sub(data[key])
+        return projected
+
+    return projector
+
+
+def project(data, spec):
+    """
+    Keep only the fields of a JSON document listed in a projection.
+
+    Args:
+        data: JSON value (dict, list or scalar).
+        spec: Projection (see `compile_projection`).
+
+    Returns:
+        The projected value. Keys missing from `data` are left out.
+    """
+    projector = compile_projection(spec)
+    return data if projector is None else projector(data)
+
+
+def projection_key(spec):
+    """Short hash identifying a projection, stored in the slim files to detect a changed projection."""
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def raw_game_sources(directory):
+    """
+    Find the raw version of every game of a cache directory.
+
+    Season archives come first and loose game files are only used for games
+    that are not archived, like `ift6758.data.game_archive.iter_games`.
+
+    Args:
+        directory (str): Raw cache directory.
+
+    Returns:
+        dict: Game ID -> (path, size, modification time in ns) of the file holding the game.
+    """
+    sources = {}
+    for path in list_archives(directory):
+        stat = os.stat(path)
+        with GameArchive(path, readonly=True) as archive:
+            for game_id in archive.game_ids():
+                sources[game_id] = (path, stat.st_size, stat.st_mtime_ns)
+    for path in list_game_files(directory):
+        game_id = game_id_from_file_name(path)
+        if game_id is None:
+            # Not named after its game ID: the ID is read from the game itself
+            try:
+                game_id = str(read_game(path)["id"])
+            except (ValueError, KeyError, TypeError) as err:
+                print(f"Skipping {path}: not named after a game ID and no readable game ID ({err!r}).")
+                continue
+            print(f"Game file {path} is not named after its game ID, using the ID {game_id} of its content.")
+        if game_id not in sources:
+            stat = os.stat(path)
+            sources[game_id] = (path, stat.st_size, stat.st_mtime_ns)
+    return sources
+
+
+def read_source(game_id, path, archives):
+    """
+    Read a raw game from the file holding it (see `raw_game_sources`).
+
+    Args:
+        game_id (str): Full 10-digit game ID.
+        path (str): Season archive or game file holding the game.
+        archives (dict): Archives already open, by path (opened archives are added to it).
+
+    Returns:
+        dict: JSON data of the game, or None if the game file is not valid JSON (a message is printed).
+    """
+    if path.endswith(ARCHIVE_EXTENSION):
+        if path not in archives:
+            archives[path] = GameArchive(path, readonly=True)
+        return archives[path].get(game_id)
+    try:
+        return read_game(path)
+    except ValueError as err:
+        print(f"Error decoding JSON from {path}: {err}")
+        return None
+
+
+def iter_raw_games(sources):
+    """
+    Yield raw games in game ID order.
+
+    Args:
+        sources (dict): Game ID -> fingerprint of its raw file (see `raw_game_sources`).
+
+    Yields:
+        dict: JSON data of each game (game files that are not valid JSON are skipped).
+    """
+    archives = {}
+    try:
+        for game_id in sorted(sources):
+            data = read_source(game_id, sources[game_id][0], archives)
+            if data is not None:
+                yield data
+    finally:
+        for archive in archives.values():
+            archive.close()
+
+
+class SlimCache:
+    """
+    Derived cache tier holding only the fields the pipeline reads (`SLIM_PROJECTION`).
+
+    It lives in the `slim` sub-directory of the raw cache, as one SQLite file
+    per season holding every projected game as compressed JSON (the codec of
+    the raw cache). Only the fields of the plays the loaders read are kept, so
+    it is less than half the size of the compressed raw cache and about twice
+    as fast to scan (see `benchmarks/bench_slim_cache.py`). Nothing is unpickled, so the tier is as safe to read from a
+    shared folder as the raw cache. Games are keyed by game ID, so a range of
+    games can be read (e.g., by a worker process, see
+    `ift6758.features.game_columns`) without decoding the whole season.
+    Each game is stored with the size and modification time of the raw file
+    it was projected from, so `update` only re-projects the games that were
+    added or changed since the last scan; a changed projection or codec
+    rebuilds the tier. The raw cache stays the source of truth and the slim
+    tier can be deleted at any time.
+    """
+
+    def __init__(self, directory, spec=SLIM_PROJECTION, codec=None):
+        """
+        Args:
+            directory (str): Raw cache directory (per-game files and/or season archives).
+            spec (dict): Projection applied to every game.
+            codec (str): Codec compressing each game (defaults to `DEFAULT_CODEC`).
+        """
+        self.directory = directory
+        self.slim_dir = os.path.join(directory, SLIM_DIR_NAME)
+        self.spec = spec
+        self.key = projection_key(spec)
+        self._project = compile_projection(spec) or (lambda data: data)
+        self.codec = get_codec(codec)
+
+    def season_path(self, season):
+        """Path of the slim file of a season (e.g., `slim/season_2016.slim`)."""
+        return os.path.join(self.slim_dir, f"season_{season}.slim")
+
+    def encode(self, data):
+        """Project a raw game and serialize it (compressed JSON)."""
+        return self.codec.compress(encode_game(self._project(data)))
+
+    def decode(self, blob):
+        """Decode a game serialized by `encode`."""
+        return decode_json(self.codec.decompress(blob))
+
+    def _metadata(self):
+        return {"version": str(SLIM_FORMAT_VERSION), "projection": self.key, "codec": self.codec.name}
+
+    def _open_season(self, season):
+        """
+        Open the slim file of a season for update, emptying it if it was built with
+        another format, projection or codec, and replacing it if it is not a slim file.
+        """
+        os.makedirs(self.slim_dir, exist_ok=True)
+        path = self.season_path(season)
+        for attempt in range(2):
+            connection = sqlite3.connect(path)
+            try:
+                connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS games (game_id TEXT PRIMARY KEY, path TEXT NOT NULL, "
+                    "size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, data BLOB NOT NULL)"
+                )
+                break
+            except sqlite3.DatabaseError as err:
+                connection.close()
+                if attempt:
+                    raise
+                print(f"Rebuilding unreadable slim file {path}: {err}")
+                os.remove(path)
+        if dict(connection.execute("SELECT key, value FROM meta")) != self._metadata():
+            connection.execute("DELETE FROM games")
+            connection.execute("DELETE FROM meta")
+            connection.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", self._metadata().items())
+        return connection
+
+    def seasons(self):
+        """
+        Group the raw games of the cache by season.
+
+        Returns:
+            dict: Season -> {game ID: fingerprint of its raw file}, sorted by season.
+        """
+        by_season = defaultdict(dict)
+        for game_id, fingerprint in raw_game_sources(self.directory).items():
+            by_season[game_id[:4]][game_id] = fingerprint
+        return dict(sorted(by_season.items()))
+
+    def update_season(self, season, sources):
+        """
+        Bring the slim file of a season up to date with its raw games.
+
+        Only the games whose raw file is new or changed are read and projected,
+        and only their rows are written.
+
+        Args:
+            season (str): Starting year of the season.
+            sources (dict): Game ID -> fingerprint of its raw file (see `seasons`).
+
+        Returns:
+            list: Sorted IDs of the games of the season in the slim file.
+        """
+        connection = self._open_season(season)
+        archives = {}
+        try:
+            stored = {game_id: (path, size, mtime_ns) for game_id, path, size, mtime_ns
+                      in connection.execute("SELECT game_id, path, size, mtime_ns FROM games")}
+            connection.executemany("DELETE FROM games WHERE game_id = ?",
+                                   [(game_id,) for game_id in stored if game_id not in sources])
+            for game_id, fingerprint in sorted(sources.items()):
+                if stored.get(game_id) == tuple(fingerprint):
+                    continue
+                data = read_source(game_id, fingerprint[0], archives)
+                if data is None:
+                    continue
+                connection.execute("INSERT OR REPLACE INTO games (game_id, path, size, mtime_ns, data) "
+                                   "VALUES (?, ?, ?, ?, ?)", (game_id, *fingerprint, self.encode(data)))
+            connection.commit()
+            return [row[0] for row in connection.execute("SELECT game_id FROM games ORDER BY game_id")]
+        finally:
+            connection.close()
+            for archive in archives.values():
+                archive.close()
+
+    def iter_season(self, season, first=None, last=None):
+        """
+        Decode the games of an up-to-date slim file, in game ID order, without updating it.
+
+        Args:
+            season (str): Starting year of the season.
+            first (str): Smallest game ID to read (None for no lower bound).
+            last (str): Largest game ID to read (None for no upper bound).
+
+        Yields:
+            dict: Projected JSON data of each game.
+        """
+        connection = sqlite3.connect(f"file:{self.season_path(season)}?mode=ro", uri=True)
+        try:
+            cursor = connection.execute(
+                "SELECT data FROM games WHERE game_id >= ? AND game_id <= ? ORDER BY game_id",
+                (first if first is not None else "", last if last is not None else "\uffff"),
+            )
+            for (blob,) in cursor:
+                yield self.decode(blob)
+        finally:
+            connection.close()
+
+    def update(self):
+        """
+        Project the raw games that are new or changed since the last update.
+
+        Returns:
+            int: Number of games in the slim tier.
+        """
+        return sum(len(self.update_season(season, sources)) for season, sources in self.seasons().items())
+
+    def __iter__(self):
+        """Bring the tier up to date season by season and yield every projected game in game ID order."""
+        for season, sources in self.seasons().items():
+            self.update_season(season, sources)
+            yield from self.iter_season(season)
+
+
+def iter_slim_games(source):
+    """
+    Yield the slim version of every game in a cache, building or refreshing the slim tier as needed.
+
+    Args:
+        source (str): Raw cache directory (per-game files and/or season archives), or
+            a single season archive, which is read as is.
+
+    Yields:
+        dict: Projected JSON data of each game (see `SLIM_PROJECTION`).
+    """
+    if is_archive(source):
+        yield from iter_games(source)
+    else:
+        yield from SlimCache(source)
+
+
+def use_slim_tier(directory, use_slim=None):
+    """
+    Decide whether to read a cache directory through its slim tier.
+
+    Args:
+        directory (str): Raw cache directory.
+        use_slim (bool): Build and read the slim tier (defaults to `USE_SLIM_CACHE`, on
+            unless NHL_SLIM_CACHE=0).
+
+    Returns:
+        bool: True if the slim tier is used and can be written; on a read-only
+        cache a message is printed and the raw games are read instead.
+    """
+    if use_slim is None:
+        use_slim = USE_SLIM_CACHE
+    if not use_slim:
+        return False
+    slim_dir = os.path.join(directory, SLIM_DIR_NAME)
+    if not os.access(slim_dir if os.path.isdir(slim_dir) else directory, os.W_OK):
+        print(f"{directory} is not writable, reading the raw games instead of the slim tier.")
+        return False
+    return True
+
+
+def iter_cache_games(source, use_slim=None):
+    """
+    Yield every game of a cache in game ID order, through the slim tier if it is used.
+
+    Args:
+        source (str): Raw cache directory (per-game files and/or season archives), or
+            a single season archive, which is read as is.
+        use_slim (bool): Build and read the slim tier (see `use_slim_tier`); with
+            `use_slim=False`, nothing is written to the cache.
+
+    Yields:
+        dict: JSON data of each game (projected with `SLIM_PROJECTION` if read from the slim tier).
+    """
+    if is_archive(source):
+        yield from iter_games(source)
+    elif use_slim_tier(source, use_slim):
+        yield from SlimCache(source)
+    else:
+        yield from iter_raw_games(raw_game_sources(source))
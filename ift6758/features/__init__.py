@@ -0,0 +1,16 @@
+"""
+Feature engineering on NHL play-by-play data.
+
+Importing the package has no side effects; the notebook exports
+(`tidy_data.py`, ...) are scripts and are not imported here.
+"""
+from ift6758.features.column_builder import ColumnBuilder
+from ift6758.features.event_features import FeaturePipeline, register_feature, zone_feature
+from ift6758.features.game_columns import (
+    EVENT_COLUMNS,
+    SHOT_COLUMNS,
+    extract_all_events,
+    extract_columns,
+    extract_shots_and_goals,
+)
+from ift6758.features.rink_zones import DANGER_ZONES, SHOT_ZONES, add_danger_zone, classify_zones
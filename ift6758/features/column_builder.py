@@ -0,0 +1,162 @@
+"""
+Typed column buffers for building large event DataFrames.
+
+Appending one dict per event and calling `pd.DataFrame(list_of_dicts)` keeps
+every key string and every boxed value alive until the frame is built, so the
+peak memory is several times the size of the final frame. A `ColumnBuilder`
+appends each value straight into a per-column buffer instead: numbers and
+booleans into `array.array` buffers (8 or 1 bytes per event), and strings into
+a code table plus an array of integer codes, so a repeated label such as
+'shot-on-goal' is stored once. `to_frame` then wraps the numeric buffers
+without copying them (`np.frombuffer`).
+"""
+from array import array
+
+import numpy as np
+import pandas as pd
+
+NAN = float('nan')
+
+
+class NumberColumn:
+    """
+    Numbers stored as float64, with NaN for missing values.
+
+    An 'int' column without missing values is returned as int64, so the dtypes
+    are the ones pandas infers from the same values in a list.
+    """
+
+    def __init__(self, integer=True):
+        self.integer = integer
+        self.values = array('d')
+
+    def append(self, value):
+        self.values.append(NAN if value is None else value)
+
+    def extend(self, other):
+        self.values.extend(other.values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def to_array(self, categorical=False):
+        values = np.frombuffer(self.values, dtype=np.float64)
+        if self.integer and not np.isnan(values).any():
+            return values.astype(np.int64)
+        return values
+
+
+class BoolColumn:
+    """Booleans stored as one byte each (missing values are stored as False)."""
+
+    def __init__(self):
+        self.values = array('B')
+
+    def append(self, value):
+        self.values.append(1 if value else 0)
+
+    def extend(self, other):
+        self.values.extend(other.values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def to_array(self, categorical=False):
+        return np.frombuffer(self.values, dtype=np.bool_)
+
+
+class StringColumn:
+    """Strings stored as int32 codes into a table of the distinct values (-1 for None)."""
+
+    def __init__(self):
+        self.table = {}
+        self.codes = array('i')
+
+    def append(self, value):
+        # `setdefault` gives a new value the next code
+        self.codes.append(-1 if value is None else self.table.setdefault(value, len(self.table)))
+
+    def extend(self, other):
+        # Codes of the other table in this table, plus -1 -> -1 for None
+        mapping = np.array([self.table.setdefault(value, len(self.table)) for value in other.table] + [-1],
+                           dtype=np.intc)
+        self.codes.frombytes(mapping[np.frombuffer(other.codes, dtype=np.intc)].tobytes())
+
+    def __len__(self):
+        return len(self.codes)
+
+    def to_array(self, categorical=False):
+        codes = np.frombuffer(self.codes, dtype=np.intc)
+        values = list(self.table)
+        if not categorical:
+            # Index -1 (None) picks the trailing None
+            return np.array(values + [None], dtype=object)[codes]
+        # Sorted categories, so that sorting the column sorts the strings
+        order = np.argsort(np.array(values, dtype=object)).astype(np.intc)
+        rank = np.empty(len(values) + 1, dtype=np.intc)
+        rank[order] = np.arange(len(values), dtype=np.intc)
+        rank[-1] = -1
+        return pd.Categorical.from_codes(rank[codes], [values[i] for i in order])
+
+
+class ObjectColumn(list):
+    """Any other value, kept in a plain list."""
+
+    def to_array(self, categorical=False):
+        return self
+
+
+COLUMN_TYPES = {
+    'int': NumberColumn,
+    'float': lambda: NumberColumn(integer=False),
+    'bool': BoolColumn,
+    'str': StringColumn,
+    'object': ObjectColumn,
+}
+
+
+class ColumnBuilder:
+    """
+    Accumulates the rows of a DataFrame column by column, in typed buffers.
+
+    Extractors append to each column (`builder['period'].append(2)`), like to a
+    dict of lists. Builders filled in different processes can be merged with
+    `extend` (string codes are remapped to the merged table).
+    """
+
+    def __init__(self, schema):
+        """
+        Args:
+            schema (dict): Column name -> kind ('int', 'float', 'bool', 'str' or 'object'),
+                in DataFrame order. An 'int' column may hold None (it becomes float64 with NaN).
+        """
+        self.schema = dict(schema)
+        self.columns = {name: COLUMN_TYPES[kind]() for name, kind in self.schema.items()}
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()), ()))
+
+    def extend(self, other):
+        """Append the rows of another builder with the same schema."""
+        for name, column in self.columns.items():
+            column.extend(other.columns[name])
+
+    def to_frame(self, categorical=False):
+        """
+        Build the DataFrame.
+
+        The numeric columns share the memory of the buffers, so nothing should be
+        appended to the builder afterwards.
+
+        Args:
+            categorical (bool): Return the string columns as `pd.Categorical` (sharing
+                the code table, with sorted categories) instead of strings.
+
+        Returns:
+            pd.DataFrame: One column per schema entry, in schema order.
+        """
+        return pd.DataFrame({name: column.to_array(categorical) for name, column in self.columns.items()},
+                            columns=list(self.schema), copy=False)
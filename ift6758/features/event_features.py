@@ -0,0 +1,456 @@
+"""
+Vectorized event features of the tidy play-by-play tables.
+
+The features that look back at earlier events (rebounds, rushes, time
+between shots) are declarative calls to one window operator,
+`preceding_event`, which answers "is this event of type B preceded by an
+event of type A of the same (or the opposing) team within the last N
+seconds of the same game and period?" on NumPy arrays, instead of building
+two rows per event with `df.iloc`. The results are assigned to the sorted
+frame by position, so they stay aligned with its labels whatever the
+original index.
+
+The `mm:ss` clock is parsed once, when the events are loaded, into the int32
+'period_seconds' and 'game_seconds' columns (see `add_clock_columns`); the
+features sort and compare on those columns instead of the clock strings.
+
+Each feature is a registered function of an `EventArrays` (see `FEATURES`);
+`FeaturePipeline` sorts the events once and computes a set of features on
+shared arrays, and the `add_*` functions compute one feature each.
+"""
+import numpy as np
+import pandas as pd
+
+from ift6758.features.rink_zones import DANGER_ZONES, classify_zones
+
+# Sort keys of the events ('sort_order', the order of the plays in the game, only if present)
+SORT_COLUMNS = ['game_id', 'period', 'period_seconds', 'sort_order']
+
+# Length of a regulation period, used for the absolute game clock
+PERIOD_LENGTH_SECONDS = 20 * 60
+
+# Largest gap (in seconds) between a shot and the previous shot for a rebound
+REBOUND_SECONDS = 10
+
+# Largest gap (in seconds) between a takeaway and the shot for a rush
+RUSH_SECONDS = 10
+
+# Team of the preceding event relative to the current one (None: any team)
+TEAM_RELATIONS = (None, 'same', 'opposing')
+
+
+def clock_seconds(clock):
+    """
+    Convert `mm:ss` game clock strings to seconds.
+
+    A game only has a few hundred distinct clock values, so each distinct
+    string is parsed once and the seconds are gathered by code.
+
+    Args:
+        clock (pd.Series): Clock strings (e.g., '12:34').
+
+    Returns:
+        pd.Series: Seconds as int64, with the index of `clock`.
+
+    Raises:
+        ValueError: If a clock is missing or not in `mm:ss` format.
+    """
+    codes, uniques = pd.factorize(clock)
+    if (codes < 0).any():
+        raise ValueError("Missing game clock")
+    seconds = np.array([int(minutes) * 60 + int(secs) for minutes, secs in (value.split(':') for value in uniques)],
+                       dtype=np.int64)
+    return pd.Series(seconds[codes], index=clock.index)
+
+
+def add_clock_columns(df, period_seconds=None):
+    """
+    Add the game clock as integers, parsed once from 'time_in_period'.
+
+    Args:
+        df (pd.DataFrame): Events with 'period' and 'time_in_period' columns (modified in place).
+        period_seconds (array-like): Seconds elapsed in the period, if already parsed.
+
+    Returns:
+        pd.DataFrame: `df` with the int32 'period_seconds' (seconds elapsed in the
+        period) and 'game_seconds' (seconds since the start of the game, counting
+        20-minute periods) columns.
+    """
+    if period_seconds is None:
+        period_seconds = clock_seconds(df['time_in_period']).to_numpy()
+    period_seconds = np.asarray(period_seconds, dtype=np.int32)
+    df['period_seconds'] = period_seconds
+    df['game_seconds'] = ((df['period'].to_numpy() - 1) * PERIOD_LENGTH_SECONDS + period_seconds).astype(np.int32)
+    return df
+
+
+def sort_events(df):
+    """
+    Sort events by game, period, clock and, if available, play order.
+
+    Args:
+        df (pd.DataFrame): Events with 'game_id', 'period' and either the clock
+            columns (see `add_clock_columns`) or 'time_in_period', and optionally 'sort_order'.
+
+    Returns:
+        pd.DataFrame: Sorted copy of `df` (stable for events with the same keys),
+        with the clock columns added if they were missing.
+    """
+    has_clock = 'period_seconds' in df
+    seconds = df['period_seconds'].to_numpy() if has_clock else clock_seconds(df['time_in_period']).to_numpy()
+    keys = [df['game_id'].to_numpy(), df['period'].to_numpy(), seconds]
+    if 'sort_order' in df:
+        keys.append(df['sort_order'].to_numpy())
+    order = np.lexsort(keys[::-1])
+    df = df.take(order)
+    if not has_clock:
+        add_clock_columns(df, seconds[order])
+    return df
+
+
+def _opposing_team(game_id, team_id):
+    """Other team of each event's game (NaN if the event has no team or the game does not have two teams)."""
+    teams = pd.Series(team_id).groupby(game_id)
+    opposing = np.array(teams.transform('min') + teams.transform('max') - team_id, dtype=float)
+    opposing[(teams.transform('nunique') != 2).to_numpy()] = np.nan
+    return opposing
+
+
+def _in_window(gap, window):
+    """`window[0] < gap <= window[1]`, either bound being optional."""
+    ok = np.ones(len(gap), dtype=bool)
+    if window is not None:
+        if window[0] is not None:
+            ok &= gap > window[0]
+        if window[1] is not None:
+            ok &= gap <= window[1]
+    return ok
+
+
+class EventArrays:
+    """
+    Columns of a sorted event frame as NumPy arrays, shared by the features computed on it.
+
+    Every array (and every `preceding` gap) is built the first time a feature
+    asks for it, then reused: computing several features on the same
+    `EventArrays` reads each column and each event type mask only once.
+
+    Args:
+        df (pd.DataFrame): Events sorted by `sort_events`.
+        seconds (array-like): Clock of each event in seconds (defaults to the
+            'period_seconds' column, or to `clock_seconds(df['time_in_period'])`).
+    """
+
+    def __init__(self, df, seconds=None):
+        self.df = df
+        if seconds is None:
+            seconds = df['period_seconds'] if 'period_seconds' in df else clock_seconds(df['time_in_period'])
+        self.seconds = np.asarray(seconds, dtype=float)
+        self._arrays = {}
+        self._gaps = {}
+
+    def __len__(self):
+        return len(self.df)
+
+    def column(self, name, dtype=None):
+        """Column of the frame as a NumPy array (float arrays hold NaN for missing values)."""
+        key = (name, dtype)
+        if key not in self._arrays:
+            self._arrays[key] = self.df[name].to_numpy(dtype=dtype)
+        return self._arrays[key]
+
+    def is_type(self, event_types):
+        """Boolean mask of the events whose type is in `event_types` (None for every event)."""
+        if event_types is None:
+            return np.ones(len(self), dtype=bool)
+        if 'event_type' not in self._arrays:
+            self._arrays['event_type'] = pd.factorize(self.df['event_type'])
+        codes, uniques = self._arrays['event_type']
+        wanted = np.flatnonzero(np.isin(np.asarray(uniques, dtype=object), list(event_types)))
+        return np.isin(codes, wanted)
+
+    def preceding(self, event_types, preceding_types=None, team=None, window=None, lookback=1):
+        """Cached `preceding_event` on these arrays (same arguments, without `df` and `seconds`)."""
+        if team not in TEAM_RELATIONS:
+            raise ValueError(f"Unknown team relation: {team}")
+        if isinstance(event_types, str):
+            event_types = [event_types]
+        if isinstance(preceding_types, str):
+            preceding_types = [preceding_types]
+        key = (tuple(event_types), preceding_types and tuple(preceding_types), team,
+               window and tuple(window), lookback)
+        if key not in self._gaps:
+            self._gaps[key] = self._preceding_gap(event_types, preceding_types, team, window, lookback)
+        return self._gaps[key]
+
+    def _preceding_gap(self, event_types, preceding_types, team, window, lookback):
+        n, seconds = len(self), self.seconds
+        game_id, period = self.column('game_id'), self.column('period')
+        is_target, is_source = self.is_type(event_types), self.is_type(preceding_types)
+        # Team of each event, and team its preceding event must belong to (NaN never matches)
+        team_id = self.column('team_id', float) if team is not None else np.zeros(n)
+        if team == 'opposing':
+            if 'opposing_team' not in self._arrays:
+                self._arrays['opposing_team'] = _opposing_team(game_id, team_id)
+            wanted_team = self._arrays['opposing_team']
+        else:
+            wanted_team = team_id
+
+        gap = np.full(n, np.nan)
+        if lookback is not None:
+            for k in range(1, min(lookback, n - 1) + 1):
+                current, previous = slice(k, n), slice(0, n - k)
+                row_gap = seconds[current] - seconds[previous]
+                found = (is_target[current] & np.isnan(gap[current]) & is_source[previous]
+                         & (game_id[current] == game_id[previous]) & (period[current] == period[previous])
+                         & (wanted_team[current] == team_id[previous]) & _in_window(row_gap, window))
+                gap[current][found] = row_gap[found]
+            return gap
+
+        sources, targets = np.flatnonzero(is_source), np.flatnonzero(is_target)
+        if len(sources) == 0 or len(targets) == 0:
+            return gap
+        # Dense (game, period, team) group codes shared by the candidates and the events looking for them;
+        # events without a team get distinct negative codes, so that they never match
+        groups = pd.DataFrame({
+            'game_id': np.concatenate([game_id[sources], game_id[targets]]),
+            'period': np.concatenate([period[sources], period[targets]]),
+            'team_id': np.concatenate([team_id[sources], wanted_team[targets]]),
+        }).groupby(['game_id', 'period', 'team_id']).ngroup().to_numpy()
+        source_codes = np.nan_to_num(groups[:len(sources)], nan=-1)
+        target_codes = np.nan_to_num(groups[len(sources):], nan=-2)
+
+        # Sort the candidates by (group, clock) and find, for each event, the last candidate of a
+        # smaller key than (group, clock - minimum gap): the nearest old enough candidate if it is in the same group
+        minimum = window[0] if window is not None and window[0] is not None else 0
+        scale = seconds.max() + abs(minimum) + 1
+        source_keys = source_codes * scale + seconds[sources]
+        order = np.argsort(source_keys, kind='stable')
+        position = np.searchsorted(source_keys[order], target_codes * scale + seconds[targets] - minimum,
+                                   side='left') - 1
+        nearest = order[np.maximum(position, 0)]
+        target_gap = seconds[targets] - seconds[sources[nearest]]
+        found = (position >= 0) & (source_codes[nearest] == target_codes) & _in_window(target_gap, window)
+        gap[targets[found]] = target_gap[found]
+        return gap
+
+
+def preceding_event(df, event_types, preceding_types=None, team=None, window=None, lookback=1, seconds=None):
+    """
+    Time since the nearest qualifying preceding event, for every event of given types.
+
+    `df` must be sorted by game, period and clock (see `SORT_COLUMNS`). An
+    earlier event qualifies if it is in the same game and period, its type is
+    in `preceding_types`, its team relates to the current event's team as
+    `team` says, and the gap is in `window`.
+
+    With `lookback=k`, only the k previous rows are considered, nearest first
+    (`lookback=1` compares each event with the row just before it). With
+    `lookback=None`, every earlier event of the period is considered: the
+    candidates are sorted once by (game, period, team, clock) and each event
+    finds the nearest one older than the window minimum with `np.searchsorted`,
+    in O(n log n); the window minimum then defaults to 0 (strictly earlier clock).
+
+    Args:
+        df (pd.DataFrame): Events with 'game_id', 'period', 'event_type' and,
+            if `team` is set, 'team_id' columns.
+        event_types (str or list): Types of the events to compute the gap for.
+        preceding_types (str or list): Types of the preceding events (None for any type).
+        team (str): None (any team), 'same' or 'opposing'.
+        window (tuple): (exclusive minimum, inclusive maximum) gap in seconds,
+            either bound being optional, or None for any gap.
+        lookback (int): Number of previous rows to look at, or None for the whole period.
+        seconds (array-like): Clock of each event in seconds (defaults to the
+            'period_seconds' column, or to `clock_seconds(df['time_in_period'])`).
+
+    Returns:
+        np.ndarray: Gap in seconds (float) for each row, NaN if the row is not of
+        `event_types` or has no qualifying preceding event.
+    """
+    return EventArrays(df, seconds).preceding(event_types, preceding_types, team, window, lookback)
+
+
+def rebound(events):
+    """Shots on goal taken at most 10 seconds after a shot or goal of the same team."""
+    gap = events.preceding('shot-on-goal', ['shot-on-goal', 'goal'], team='same', window=(0, REBOUND_SECONDS))
+    return ~np.isnan(gap)
+
+
+def shot_off_rush(events):
+    """Shots on goal taken at most 10 seconds after a takeaway by the same team."""
+    gap = events.preceding('shot-on-goal', 'takeaway', team='same', window=(0, RUSH_SECONDS))
+    return ~np.isnan(gap)
+
+
+def danger_zone(events):
+    """'High' within 20x10 ft of the center, 'Medium' within 30x20 ft, 'Low' elsewhere (missing without coordinates)."""
+    return classify_zones(events.column('x_coord', float), events.column('y_coord', float), DANGER_ZONES)
+
+
+def zone_feature(zones, default='Low', missing=None, mirror_x=False):
+    """
+    Feature labelling each event with its zone of the rink (see `ift6758.features.rink_zones.classify_zones`).
+
+    Args:
+        zones (dict): Zone name -> rectangle or polygon, in priority order.
+        default (str): Label of the events outside every zone (same default as `classify_zones`).
+        missing (str): Label of the events without coordinates (None leaves them missing).
+        mirror_x (bool): Classify `|x|`, so that the zones cover both ends of the rink.
+
+    Returns:
+        callable: Function of an `EventArrays`, to pass to `register_feature`.
+    """
+    def feature(events):
+        return classify_zones(events.column('x_coord', float), events.column('y_coord', float),
+                              zones, default, missing, mirror_x)
+    return feature
+
+
+def shot_distance(events):
+    """Euclidean distance of the event from the center of the rink (NaN without coordinates)."""
+    return np.sqrt(events.column('x_coord', float) ** 2 + events.column('y_coord', float) ** 2)
+
+
+def time_between_shots(events):
+    """Seconds since the previous event of the period for the shots on goal, 0 for other events."""
+    return np.nan_to_num(events.preceding('shot-on-goal')).astype(int)
+
+
+def odd_man_rush(events):
+    """Shots on goal following a takeaway by the same team within 10 seconds (odd-man rush indicator)."""
+    gap = events.preceding('shot-on-goal', 'takeaway', team='same', window=(0, RUSH_SECONDS))
+    return ~np.isnan(gap)
+
+
+# Registered features: column name -> function of an `EventArrays`, returning the column values.
+# The order is the order of the columns added by the tidy data script.
+FEATURES = {
+    'rebound': rebound,
+    'shot_off_rush': shot_off_rush,
+    'danger_zone': danger_zone,
+    'shot_distance': shot_distance,
+    'time_between_shots': time_between_shots,
+    'odd_man_rush': odd_man_rush,
+}
+
+
+def register_feature(name, function):
+    """
+    Register a feature computed by `FeaturePipeline`.
+
+    Args:
+        name (str): Name of the column the feature is stored in.
+        function (callable): Function of an `EventArrays` (events sorted by
+            `sort_events`), returning one value per event.
+    """
+    FEATURES[name] = function
+
+
+class FeaturePipeline:
+    """
+    Compute several registered features with a single sort of the events.
+
+    The `add_*` functions each sort (and copy) the whole frame before adding
+    their column. The pipeline sorts once, by `SORT_COLUMNS`, and computes every
+    requested feature on the same `EventArrays`, so the columns, type masks and
+    window gaps the features have in common are built once, and the columns are
+    added to the sorted frame without copying it again.
+
+    Args:
+        features (list): Names of registered features (see `FEATURES`), in column order
+            (defaults to every registered feature).
+
+    Raises:
+        ValueError: If a feature is not registered.
+    """
+
+    def __init__(self, features=None):
+        self.features = list(FEATURES) if features is None else list(features)
+        unknown = [name for name in self.features if name not in FEATURES]
+        if unknown:
+            raise ValueError(f"Unknown features: {', '.join(unknown)}")
+
+    def transform(self, df):
+        """
+        Add the features to a copy of the events.
+
+        Args:
+            df (pd.DataFrame): Events with the columns the features need (e.g., from `load_all_games`).
+
+        Returns:
+            pd.DataFrame: Copy of `df` sorted by `sort_events`, with the clock
+            columns (if missing) and one column per feature added.
+        """
+        df = sort_events(df)
+        events = EventArrays(df)
+        for name in self.features:
+            df[name] = FEATURES[name](events)
+        return df
+
+
+def _add_feature(df, name):
+    """Sort a copy of the events and add one registered feature to it."""
+    return FeaturePipeline([name]).transform(df)
+
+
+def add_rebound_indicator(df):
+    """
+    Flag the shots on goal taken at most 10 seconds after a shot or goal of the same team.
+
+    Args:
+        df (pd.DataFrame): Events with 'game_id', 'period', 'time_in_period',
+            'team_id' and 'event_type' columns.
+
+    Returns:
+        pd.DataFrame: Copy of `df` sorted by game, period and clock, with the
+        boolean 'rebound' column (and the clock columns, if missing) added.
+    """
+    return _add_feature(df, 'rebound')
+
+
+def add_shot_off_rush_indicator(df):
+    """
+    Flag the shots on goal taken at most 10 seconds after a takeaway by the same team.
+
+    Args:
+        df (pd.DataFrame): Events with 'game_id', 'period', 'time_in_period',
+            'team_id' and 'event_type' columns.
+
+    Returns:
+        pd.DataFrame: Copy of `df` sorted by game, period and clock, with the
+        boolean 'shot_off_rush' column (and the clock columns, if missing) added.
+    """
+    return _add_feature(df, 'shot_off_rush')
+
+
+def add_time_between_shots(df):
+    """
+    Add the time elapsed since the previous event of the period, for every shot on goal.
+
+    Args:
+        df (pd.DataFrame): Events with 'game_id', 'period', 'time_in_period' and 'event_type' columns.
+
+    Returns:
+        pd.DataFrame: Copy of `df` sorted by game, period and clock, with the
+        'time_between_shots' column (seconds, 0 for other events) and the clock
+        columns, if missing, added.
+    """
+    return _add_feature(df, 'time_between_shots')
+
+
+def add_odd_man_rush_indicator(df):
+    """
+    Flag the shots on goal that are part of an odd-man rush.
+
+    A takeaway by the same team immediately followed, within 10 seconds, by
+    the shot is taken as an indicator of an odd-man rush.
+
+    Args:
+        df (pd.DataFrame): Events with 'game_id', 'period', 'time_in_period',
+            'team_id' and 'event_type' columns.
+
+    Returns:
+        pd.DataFrame: Copy of `df` sorted by game, period and clock, with the
+        boolean 'odd_man_rush' column (and the clock columns, if missing) added.
+    """
+    return _add_feature(df, 'odd_man_rush')
@@ -1,112 +1,8 @@
 
 
-import os
-import requests
-import json
-
-def fetch_nhl_play_by_play_data(season, game_type, game_number):
-    """
-    Fetch NHL play-by-play data for a given game in a season.
-
-    Args:
-        season (int): The starting year of the NHL season (e.g., 2016 for the 2016-17 season).
-        game_type (str): The type of game (e.g., "01" for preseason, "02" for regular, "03" for playoffs).
-        game_number (str): The specific game number, padded appropriately.
-
-    Returns:
-        dict: JSON data of the play-by-play for the specified game, or None if not found.
-    """
-    game_id = f"{season}{game_type}{game_number}"
-    url = f"https://api-web.nhle.com/v1/gamecenter/{game_id}/play-by-play"
-
-    try:
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an error for bad responses (e.g., 404)
-        data = response.json()
-        return data
-    except requests.exceptions.HTTPError as errh:
-        if response.status_code == 404:
-            print(f"Game ID {game_id} not found (404). Skipping.")
-        else:
-            print("HTTP Error:", errh)
-    except requests.exceptions.RequestException as err:
-        print("Request Error:", err)
-        return None
-
-
-def save_data_to_file(data, file_path):
-    """
-    Save fetched data to a JSON file.
-
-    Args:
-        data (dict): The JSON data to save.
-        file_path (str): The file path to save the data to.
-    """
-    if data:
-        with open(file_path, 'w') as file:
-            json.dump(data, file, indent=4)
-        print(f"Data saved to {file_path}")
-    else:
-        print("No data to save.")
-
-
-def download_and_cache_nhl_data(season_start_year, game_type, game_range):
-    """
-    Download and save NHL play-by-play data for a given season and game type.
-
-    Args:
-        season_start_year (int): The starting year of the season (e.g., 2016 for the 2016-17 season).
-        game_type (str): The type of game ("01" for preseason, "02" for regular, "03" for playoffs, "04" for all-star).
-        game_range (range): The range of games to download.
-    """
-    season = f"{season_start_year + 1}"  # Format the season part of the game ID
-    data_folder = os.getenv("NHL_DATA_FOLDER", "./nhl_data")  # Default to local folder if env variable not set
-    os.makedirs(data_folder, exist_ok=True)
-
-    for game_num in game_range:
-        if game_type == "03":  # Special formatting for playoff games
-            game_id_str = f"0{str(game_num).zfill(3)}"  # Pad with a leading zero, followed by 3 digits (e.g., "0001" -> "00001")
-        else:
-            game_id_str = str(game_num).zfill(4)  # Zero-pad game number to 4 digits
+from ift6758.data.cache_codec import is_game_file, list_game_files, read_game, read_game_bytes
 
-        file_path = os.path.join(data_folder, f"game_{season}_{game_type}_{game_id_str}.json")
-
-        # Check if data already exists locally
-        if os.path.exists(file_path):
-            print(f"Data already exists for game {season}-{game_type}-{game_id_str}. Skipping download.")
-            continue
-
-#use a loop to download from 2016 to 2024 other method without range
-
-if __name__ == "__main__":
-  # Iterate over each season from 2016 to 2024
-  for year in range(2016, 2016):
-      for game_type in ["02", "03"]:
-          if game_type == "02":
-              game_numbers = list(range(1, 1272))
-          else:
-              game_numbers = list(range(1, 132))
-
-          for game_num in game_numbers:
-              if game_type == "03":  # Special formatting for playoff games
-                  game_id_str = f"0{str(game_num).zfill(3)}"  # Pad with a leading zero, followed by 3 digits (e.g., "0001" -> "00001")
-              else:
-                  game_id_str = str(game_num).zfill(4)  # Zero-pad game number to 4 digits
-
-              data_folder = os.getenv("NHL_DATA_FOLDER", "./nhl_data")  # Default to local folder if env variable not set
-              os.makedirs(data_folder, exist_ok=True)
-
-              file_path = os.path.join(data_folder, f"game_{year + 1}_{game_type}_{game_id_str}.json")
-
-              # Check if data already exists locally
-              if os.path.exists(file_path):
-                  print(f"Data already exists for game {year + 1}-{game_type}-{game_id_str}. Skipping download.")
-                  continue
-
-              # Fetch and save data
-              data = fetch_nhl_play_by_play_data(year, game_type, game_id_str)
-              if data:
-                  save_data_to_file(data, file_path)
+# Games are downloaded with ift6758.data.acquisition (or the ift6758-fetch command)
 
 """#Interactive Debugging tool"""
 
@@ -131,15 +27,16 @@ def browse_files(folder_path):
       selected_file = change['new']
       file_path = os.path.join(folder_path, selected_file)
       try:
-        with open(file_path, 'r') as f:
-          try:
-            data = json.load(f)
-            print(f"Content of {selected_file}:")
-            print(json.dumps(data, indent=2))
-          except json.JSONDecodeError as e:
-            print(f"Error decoding JSON from {selected_file}: {e}")
-            print(f"Content of {selected_file}:")
-            print(f.read())
+        try:
+          data = read_game(file_path)
+          print(f"Content of {selected_file}:")
+          print(json.dumps(data, indent=2))
+        except json.JSONDecodeError as e:
+          print(f"Error decoding JSON from {selected_file}: {e}")
+          print(f"Content of {selected_file}:")
+          print(read_game_bytes(file_path).decode('utf-8', errors='replace'))
+        except ValueError as e:
+          print(f"Corrupt cache file {selected_file}: {e}")
 
       except FileNotFoundError:
         print(f"File not found: {file_path}")
@@ -173,15 +70,16 @@ def browse_files(folder_path):
       selected_file = change['new']
       file_path = os.path.join(folder_path, selected_file)
       try:
-        with open(file_path, 'r') as f:
-          try:
-            data = json.load(f)
-            print(f"[bold green]Content of {selected_file}:[/bold green]")
-            console.print_json(data=data)  # Use Rich to print the JSON with colors and formatting
-          except json.JSONDecodeError as e:
-            print(f"[bold red]Error decoding JSON from {selected_file}: {e}[/bold red]")
-            print(f"[bold yellow]Content of {selected_file}:[/bold yellow]")
-            print(f.read())
+        try:
+          data = read_game(file_path)
+          print(f"[bold green]Content of {selected_file}:[/bold green]")
+          console.print_json(data=data)  # Use Rich to print the JSON with colors and formatting
+        except json.JSONDecodeError as e:
+          print(f"[bold red]Error decoding JSON from {selected_file}: {e}[/bold red]")
+          print(f"[bold yellow]Content of {selected_file}:[/bold yellow]")
+          print(read_game_bytes(file_path).decode('utf-8', errors='replace'))
+        except ValueError as e:
+          print(f"Corrupt cache file {selected_file}: {e}")
 
       except FileNotFoundError:
         print(f"[bold red]File not found: {file_path}[/bold red]")
@@ -199,34 +97,33 @@ def extract_info_from_json(file_path):
     Extracts information from a JSON file and prints key details.
     """
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            # Print some information about the JSON structure (adapt to your specific needs)
-            print("Keys in the top-level JSON object:", list(data.keys()))
-            print("-" * 20)
-            if "gameData" in data:
-                game_data = data["gameData"]
-                print("Keys in 'gameData':", list(game_data.keys()))
-                if "teams" in game_data:
-                    teams_data = game_data["teams"]
-                    print("Home team:", teams_data["home"]["name"])
-                    print("Away team:", teams_data["away"]["name"])
-            if "liveData" in data:
-                live_data = data["liveData"]
-                print("Keys in 'liveData':", list(live_data.keys()))
-                if "plays" in live_data:
-                  plays_data = live_data["plays"]
-                  print("Keys in 'plays':", list(plays_data.keys()))
-                  if 'allPlays' in plays_data:
-                    all_plays_data = plays_data['allPlays']
-                    print(f"Number of plays: {len(all_plays_data)}")
-                    first_play = all_plays_data[0]
-                    print("First play:", first_play)
+        data = read_game(file_path)
+        # Print some information about the JSON structure (adapt to your specific needs)
+        print("Keys in the top-level JSON object:", list(data.keys()))
+        print("-" * 20)
+        if "gameData" in data:
+            game_data = data["gameData"]
+            print("Keys in 'gameData':", list(game_data.keys()))
+            if "teams" in game_data:
+                teams_data = game_data["teams"]
+                print("Home team:", teams_data["home"]["name"])
+                print("Away team:", teams_data["away"]["name"])
+        if "liveData" in data:
+            live_data = data["liveData"]
+            print("Keys in 'liveData':", list(live_data.keys()))
+            if "plays" in live_data:
+              plays_data = live_data["plays"]
+              print("Keys in 'plays':", list(plays_data.keys()))
+              if 'allPlays' in plays_data:
+                all_plays_data = plays_data['allPlays']
+                print(f"Number of plays: {len(all_plays_data)}")
+                first_play = all_plays_data[0]
+                print("First play:", first_play)
 
 
     except FileNotFoundError:
         print(f"File not found: {file_path}")
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"Error decoding JSON from {file_path}: {e}")
 
 
@@ -253,14 +150,13 @@ def extract_all_keys(data, parent_key='', sep='.'):
 def extract_keys_from_json_file(file_path):
     """Extracts all keys from a JSON file."""
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            all_keys = list(extract_all_keys(data))
-            return all_keys
+        data = read_game(file_path)
+        all_keys = list(extract_all_keys(data))
+        return all_keys
     except FileNotFoundError:
         print(f"File not found: {file_path}")
         return []
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"Error decoding JSON from {file_path}: {e}")
         return []
 
@@ -295,21 +191,20 @@ def on_key_selected(change):
     selected_key = change.new
     file_path = "/content/nhl_data/game_2017_02_0001.json"  # Replace with your file path
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            value = extract_value_by_key(data, selected_key)
-            with output:
-                clear_output()
-                if value is not None:
-                    print(f"Value for key '{selected_key}':")
-                    console.print_json(data=value)
-                else:
-                    print(f"Key '{selected_key}' not found in the JSON data.")
+        data = read_game(file_path)
+        value = extract_value_by_key(data, selected_key)
+        with output:
+            clear_output()
+            if value is not None:
+                print(f"Value for key '{selected_key}':")
+                console.print_json(data=value)
+            else:
+                print(f"Key '{selected_key}' not found in the JSON data.")
     except FileNotFoundError:
         with output:
             clear_output()
             print(f"File not found: {file_path}")
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         with output:
             clear_output()
             print(f"Error decoding JSON from {file_path}: {e}")
@@ -348,17 +243,18 @@ def browse_files(folder_path):
             selected_file = change['new']
             file_path = os.path.join(folder_path, selected_file)
             try:
-                with open(file_path, 'r') as f:
-                    try:
-                        global data  # Declare data as a global variable
-                        data = json.load(f)
-                        # Update the key dropdown with the keys from the selected file
-                        update_key_dropdown(data)
-
-                    except json.JSONDecodeError as e:
-                        print(f"Error decoding JSON from {selected_file}: {e}")
-                        print(f"Content of {selected_file}:")
-                        print(f.read())
+                try:
+                    global data  # Declare data as a global variable
+                    data = read_game(file_path)
+                    # Update the key dropdown with the keys from the selected file
+                    update_key_dropdown(data)
+
+                except json.JSONDecodeError as e:
+                    print(f"Error decoding JSON from {selected_file}: {e}")
+                    print(f"Content of {selected_file}:")
+                    print(read_game_bytes(file_path).decode('utf-8', errors='replace'))
+                except ValueError as e:
+                    print(f"Corrupt cache file {selected_file}: {e}")
 
             except FileNotFoundError:
                 print(f"File not found: {file_path}")
@@ -461,17 +357,18 @@ def browse_files_with_filters(folder_path):
             selected_file = change['new']
             file_path = os.path.join(folder_path, selected_file)
             try:
-                with open(file_path, 'r') as f:
-                    try:
-                        global data  # Declare data as a global variable
-                        data = json.load(f)
-                        # Update the key dropdown with the keys from the selected file
-                        update_key_dropdown(data)
-
-                    except json.JSONDecodeError as e:
-                        print(f"Error decoding JSON from {selected_file}: {e}")
-                        print(f"Content of {selected_file}:")
-                        print(f.read())
+                try:
+                    global data  # Declare data as a global variable
+                    data = read_game(file_path)
+                    # Update the key dropdown with the keys from the selected file
+                    update_key_dropdown(data)
+
+                except json.JSONDecodeError as e:
+                    print(f"Error decoding JSON from {selected_file}: {e}")
+                    print(f"Content of {selected_file}:")
+                    print(read_game_bytes(file_path).decode('utf-8', errors='replace'))
+                except ValueError as e:
+                    print(f"Corrupt cache file {selected_file}: {e}")
 
             except FileNotFoundError:
                 print(f"File not found: {file_path}")
@@ -520,17 +417,16 @@ def extract_keys_and_subkeys(data, parent_key=None):
 # Example usage:
 file_path = "/content/nhl_data/game_2017_02_0001.json"
 try:
-    with open(file_path, "r") as f:
-        data = json.load(f)
-        all_keys_and_subkeys = extract_keys_and_subkeys(data)
+    data = read_game(file_path)
+    all_keys_and_subkeys = extract_keys_and_subkeys(data)
 
-        print("Keys and Subkeys:")
-        for key, subkeys in all_keys_and_subkeys:
-            print(f"- {key}: {subkeys}")
+    print("Keys and Subkeys:")
+    for key, subkeys in all_keys_and_subkeys:
+        print(f"- {key}: {subkeys}")
 
 except FileNotFoundError:
     print(f"File not found: {file_path}")
-except json.JSONDecodeError as e:
+except ValueError as e:
     print(f"Error decoding JSON from {file_path}: {e}")
 
 import ipywidgets as widgets
@@ -556,13 +452,12 @@ def has_coordinates(data):
 def check_coordinates_in_file(file_path):
     """Checks if a given JSON file contains coordinates."""
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            return has_coordinates(data)
+        data = read_game(file_path)
+        return has_coordinates(data)
     except FileNotFoundError:
         print(f"File not found: {file_path}")
         return False
-    except json.JSONDecodeError:
+    except ValueError:
         print(f"Error decoding JSON from {file_path}")
         return False
 
@@ -578,7 +473,7 @@ def on_file_selected(change):
 
 
 # Create a dropdown widget for selecting a file
-file_list = [f for f in os.listdir('/content/nhl_data') if f.endswith('.json')]
+file_list = [f for f in os.listdir('/content/nhl_data') if is_game_file(f)]
 dropdown = widgets.Dropdown(options=file_list, description='Select File:')
 
 # Observe changes in the dropdown and call the callback function
@@ -605,44 +500,41 @@ def process_nhl_data(directory):
   """
 
   all_events = []
-  for filename in os.listdir(directory):
-    if filename.endswith(".json"):
-      file_path = os.path.join(directory, filename)
-      try:
-        with open(file_path, "r") as f:
-          data = json.load(f)
-          game_id = data.get("gamePk")
-          if "liveData" in data and "plays" in data["liveData"] and "allPlays" in data["liveData"]["plays"]:
-            plays = data["liveData"]["plays"]["allPlays"]
-            for play in plays:
-              if "result" in play and "event" in play["result"]:
-                event_type = play["result"]["event"]
-                if event_type in ["Shot on Goal", "Goal"]:
-                  event_data = {
-                      "game_id": game_id,
-                      "periodDescriptor.number": play.get("about", {}).get("period"),
-                      "timeInPeriod": play.get("about", {}).get("periodTime"),
-                      "details.eventOwnerTeamId": play.get("team", {}).get("id"),
-                      "typeDescKey": play["result"].get("eventTypeId"),
-                      "details.xCoord": play.get("coordinates", {}).get("x"),
-                      "details.yCoord": play.get("coordinates", {}).get("y"),
-                      "details.shotType": play.get("result", {}).get("secondaryType"),
-                  }
-                  if "players" in play:
-                    for player in play["players"]:
-                      if player["playerType"] == "Shooter":
-                        event_data["details.shootingPlayerId"] = player.get("player", {}).get("id")
-                      elif player["playerType"] == "Scorer":
-                         event_data["details.scoringPlayerId"] = player.get("player", {}).get("id")
-                      elif player["playerType"] == "Goalie":
-                        event_data["details.goalieInNetId"] = player.get("player", {}).get("id")
-
-                  all_events.append(event_data)
+  for file_path in list_game_files(directory):
+    try:
+      data = read_game(file_path)
+      game_id = data.get("gamePk")
+      if "liveData" in data and "plays" in data["liveData"] and "allPlays" in data["liveData"]["plays"]:
+        plays = data["liveData"]["plays"]["allPlays"]
+        for play in plays:
+          if "result" in play and "event" in play["result"]:
+            event_type = play["result"]["event"]
+            if event_type in ["Shot on Goal", "Goal"]:
+              event_data = {
+                  "game_id": game_id,
+                  "periodDescriptor.number": play.get("about", {}).get("period"),
+                  "timeInPeriod": play.get("about", {}).get("periodTime"),
+                  "details.eventOwnerTeamId": play.get("team", {}).get("id"),
+                  "typeDescKey": play["result"].get("eventTypeId"),
+                  "details.xCoord": play.get("coordinates", {}).get("x"),
+                  "details.yCoord": play.get("coordinates", {}).get("y"),
+                  "details.shotType": play.get("result", {}).get("secondaryType"),
+              }
+              if "players" in play:
+                for player in play["players"]:
+                  if player["playerType"] == "Shooter":
+                    event_data["details.shootingPlayerId"] = player.get("player", {}).get("id")
+                  elif player["playerType"] == "Scorer":
+                     event_data["details.scoringPlayerId"] = player.get("player", {}).get("id")
+                  elif player["playerType"] == "Goalie":
+                    event_data["details.goalieInNetId"] = player.get("player", {}).get("id")
+
+              all_events.append(event_data)
 
-      except FileNotFoundError:
-        print(f"File not found: {file_path}")
-      except json.JSONDecodeError:
-        print(f"Error decoding JSON from {file_path}")
+    except FileNotFoundError:
+      print(f"File not found: {file_path}")
+    except ValueError:
+      print(f"Error decoding JSON from {file_path}")
 
   df = pd.DataFrame(all_events)
   return df
@@ -673,16 +565,13 @@ def json_to_dataframe(folder_path):
     A Pandas DataFrame containing the data from all JSON files.
   """
   dataframes = []
-  for filename in os.listdir(folder_path):
-    if filename.endswith(".json"):
-      file_path = os.path.join(folder_path, filename)
-      with open(file_path, 'r') as f:
-        try:
-          data = json.load(f)
-          df = pd.json_normalize(data)  # Flatten the JSON data into a DataFrame
-          dataframes.append(df)
-        except json.JSONDecodeError as e:
-          print(f"Error decoding JSON from {filename}: {e}")
+  for file_path in list_game_files(folder_path):
+    try:
+      data = read_game(file_path)
+      df = pd.json_normalize(data)  # Flatten the JSON data into a DataFrame
+      dataframes.append(df)
+    except ValueError as e:
+      print(f"Error decoding JSON from {os.path.basename(file_path)}: {e}")
 
   if dataframes:
     return pd.concat(dataframes, ignore_index=True)
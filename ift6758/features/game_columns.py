@@ -0,0 +1,220 @@
+"""
+Columnar extraction of play-by-play events, in one process or with a process pool.
+
+The extractors append the fields of each event to typed column buffers (see
+`ift6758.features.column_builder`), so the rows of many games are built without
+one dict per event. `extract_columns`
+runs an extractor over every game of a cache and returns a DataFrame; with
+`max_workers > 1` the games are fanned out in chunks to a `ProcessPoolExecutor`,
+each worker returns its partial columns, and the chunks are concatenated in game
+ID order, so the result is the same DataFrame as the serial scan.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from ift6758.data.game_archive import is_archive
+from ift6758.data.slim_cache import SlimCache, iter_cache_games, iter_raw_games, raw_game_sources, use_slim_tier
+from ift6758.features.column_builder import ColumnBuilder
+from ift6758.features.event_features import add_clock_columns
+
+# Games per task sent to a worker process
+DEFAULT_CHUNK_SIZE = 64
+
+SHOT_EVENT_TYPES = ('shot-on-goal', 'goal')
+
+# Columns of `extract_shots_and_goals` and their kinds
+SHOT_COLUMNS = {
+    'game_id': 'int', 'period': 'int', 'time_in_period': 'str', 'event_type': 'str', 'team_id': 'int',
+    'x_coord': 'int', 'y_coord': 'int', 'shot_type': 'str', 'shooting_player_id': 'int',
+    'goalie_player_id': 'int', 'empty_net': 'bool', 'strength': 'str',
+}
+
+# Columns of `extract_all_events` and their kinds
+EVENT_COLUMNS = {
+    'game_id': 'int', 'period': 'int', 'time_in_period': 'str', 'event_type': 'str', 'team_id': 'int',
+    'x_coord': 'int', 'y_coord': 'int', 'sort_order': 'int',
+}
+
+
+def new_columns(schema):
+    """Return an empty `ColumnBuilder` for a column schema (e.g., `SHOT_COLUMNS`)."""
+    return ColumnBuilder(schema)
+
+
+def append_shot(game_id, event, columns):
+    """
+    Append one shot on goal or goal to `SHOT_COLUMNS`.
+
+    Args:
+        game_id (int): ID of the game of the event.
+        event (dict): Play of type 'shot-on-goal' or 'goal'.
+        columns (ColumnBuilder): Columns, as returned by `new_columns(SHOT_COLUMNS)`.
+    """
+    event_type = 'shot' if event['typeDescKey'] == 'shot-on-goal' else 'goal'
+    details = event.get('details', {})
+    columns['game_id'].append(game_id)
+    columns['period'].append(event['periodDescriptor']['number'])
+    columns['time_in_period'].append(event['timeInPeriod'])
+    columns['event_type'].append(event_type)
+    columns['team_id'].append(details.get('eventOwnerTeamId'))
+    columns['x_coord'].append(details.get('xCoord'))
+    columns['y_coord'].append(details.get('yCoord'))
+    columns['shot_type'].append(details.get('shotType'))
+    columns['shooting_player_id'].append(
+        details.get('shootingPlayerId') if 'shootingPlayerId' in details else details.get('scoringPlayerId'))
+    columns['goalie_player_id'].append(details.get('goalieInNetId'))
+    columns['empty_net'].append(details.get('emptyNet', False))
+    columns['strength'].append("even" if event_type == 'goal' else "N/A")
+
+
+def extract_shots_and_goals(game, columns):
+    """
+    Append the shots on goal and goals of a game to `SHOT_COLUMNS`.
+
+    Args:
+        game (dict): JSON data of the game (raw or slim).
+        columns (ColumnBuilder): Columns, as returned by `new_columns(SHOT_COLUMNS)`.
+    """
+    game_id = game['id']
+    for event in game['plays']:
+        if event['typeDescKey'] in SHOT_EVENT_TYPES:
+            append_shot(game_id, event, columns)
+
+
+def extract_shot_events(events, columns):
+    """
+    Append streamed shots on goal and goals to `SHOT_COLUMNS`.
+
+    Args:
+        events (iterable): (game ID, play) pairs, e.g. from `ift6758.data.event_stream.iter_events`.
+        columns (ColumnBuilder): Columns, as returned by `new_columns(SHOT_COLUMNS)`.
+    """
+    for game_id, event in events:
+        if event['typeDescKey'] in SHOT_EVENT_TYPES:
+            append_shot(game_id, event, columns)
+
+
+def extract_all_events(game, columns):
+    """
+    Append every event of a game to `EVENT_COLUMNS`.
+
+    Args:
+        game (dict): JSON data of the game (raw or slim).
+        columns (ColumnBuilder): Columns, as returned by `new_columns(EVENT_COLUMNS)`.
+    """
+    game_id = game['id']
+    for event in game.get('plays', []):
+        details = event.get('details', {})
+        columns['game_id'].append(game_id)
+        columns['period'].append(event['periodDescriptor']['number'])
+        columns['time_in_period'].append(event['timeInPeriod'])
+        columns['event_type'].append(event.get('typeDescKey'))
+        columns['team_id'].append(details.get('eventOwnerTeamId'))
+        columns['x_coord'].append(details.get('xCoord'))
+        columns['y_coord'].append(details.get('yCoord'))
+        columns['sort_order'].append(event.get('sortOrder'))
+
+
+def _update_season(directory, codec, season, sources):
+    """Worker task: bring the slim file of a season up to date and return its sorted game IDs."""
+    return SlimCache(directory, codec=codec).update_season(season, sources)
+
+
+def _extract_range(directory, codec, season, first, last, extractor, schema):
+    """Worker task: read a range of games from the slim file of a season and return their partial columns."""
+    columns = new_columns(schema)
+    for game in SlimCache(directory, codec=codec).iter_season(season, first, last):
+        extractor(game, columns)
+    return columns
+
+
+def _extract_sources(sources, extractor, schema):
+    """Worker task: read a chunk of raw games and return their partial columns."""
+    columns = new_columns(schema)
+    for game in iter_raw_games(sources):
+        extractor(game, columns)
+    return columns
+
+
+def _to_frame(columns, categorical):
+    """Build the DataFrame of the extracted columns, with the clock parsed once into integer columns."""
+    df = columns.to_frame(categorical)
+    if 'period' in columns.schema and 'time_in_period' in columns.schema:
+        add_clock_columns(df)
+    return df
+
+
+def extract_columns(source, extractor, schema, max_workers=1, chunk_size=DEFAULT_CHUNK_SIZE, categorical=False,
+                    use_slim=None):
+    """
+    Run a columnar extractor over every game of a cache and build a DataFrame.
+
+    Games are read through the slim tier of the cache (the default), or from
+    the raw cache when it is turned off or the cache is read-only (see
+    `ift6758.data.slim_cache.use_slim_tier`). With several workers, the
+    raw games are read by the workers in chunks of `chunk_size`; with the slim
+    tier, a worker brings the slim file of each season up to date (which builds
+    it on first use) and, as soon as a season is ready, its games are split
+    into ranges of `chunk_size` game IDs that the workers read from the slim
+    file themselves. The partial columns are concatenated in game ID order, so
+    the DataFrame is the same whatever the number of workers.
+
+    Args:
+        source (str): Raw cache directory, or a single season archive (always read serially).
+        extractor (callable): Function `(game, columns)` appending the rows of a game
+            (e.g., `extract_shots_and_goals`); it must be defined at module level so
+            that worker processes can import it.
+        schema (dict): Columns filled by the extractor and their kinds, in DataFrame
+            order (e.g., `SHOT_COLUMNS`).
+        max_workers (int): Number of worker processes (1 scans in this process,
+            None uses every core).
+        chunk_size (int): Number of games per worker task.
+        categorical (bool): Return the string columns as `pd.Categorical`.
+        use_slim (bool): Build and read the slim tier (defaults to `USE_SLIM_CACHE`,
+            on unless the NHL_SLIM_CACHE environment variable is 0); with
+            `use_slim=False`, nothing is written to the cache.
+
+    Returns:
+        pd.DataFrame: One row per extracted event, ordered by game ID then by play.
+        If the schema has 'period' and 'time_in_period', the clock is also parsed
+        into the int32 'period_seconds' and 'game_seconds' columns.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    columns = new_columns(schema)
+
+    if max_workers <= 1 or is_archive(source):
+        for game in iter_cache_games(source, use_slim):
+            extractor(game, columns)
+        return _to_frame(columns, categorical)
+
+    if not use_slim_tier(source, use_slim):
+        sources = raw_game_sources(source)
+        game_ids = sorted(sources)
+        chunks = [{game_id: sources[game_id] for game_id in game_ids[start:start + chunk_size]}
+                  for start in range(0, len(game_ids), chunk_size)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # `map` returns the results in submission order, i.e. in game ID order
+            for partial in executor.map(_extract_sources, chunks, repeat(extractor), repeat(schema)):
+                columns.extend(partial)
+        return _to_frame(columns, categorical)
+
+    slim = SlimCache(source)
+    seasons = slim.seasons()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        updates = [executor.submit(_update_season, source, slim.codec.name, season, sources)
+                   for season, sources in seasons.items()]
+        partials = []
+        for season, update in zip(seasons, updates):
+            # The ranges of a season are queued as soon as its slim file is up to date, while the
+            # other seasons are still updating; only game IDs and columns cross the process boundary
+            game_ids = update.result()
+            for start in range(0, len(game_ids), chunk_size):
+                chunk = game_ids[start:start + chunk_size]
+                partials.append(executor.submit(_extract_range, source, slim.codec.name, season, chunk[0], chunk[-1],
+                                                extractor, schema))
+        # Concatenated in submission order, i.e. in game ID order
+        for partial in partials:
+            columns.extend(partial.result())
+    return _to_frame(columns, categorical)
@@ -0,0 +1,130 @@
+"""
+Vectorized classification of events into zones of the rink.
+
+A zone is a rectangle `(x_min, x_max, y_min, y_max)` (bounds included) or a
+polygon given by its `(x, y)` vertices, in the rink coordinates of the
+play-by-play (feet, origin at center ice, goal lines at x = +/-89). Zones are
+tested in order and each event gets the first zone containing it, so smaller
+zones go before the larger ones they lie in. Each zone is one boolean mask
+over all events (polygons only test the events in their bounding box) that
+writes its code into an int16 array, and the labels are built from the codes
+as a `pd.Categorical`, without creating one string per event.
+"""
+import numpy as np
+import pandas as pd
+
+# Danger zones of the tidy data: boxes around center ice, events outside both are 'Low'
+DANGER_ZONES = {
+    'High': (-20, 20, -10, 10),
+    'Medium': (-30, 30, -20, 20),
+}
+
+# Shooting areas of the offensive zone at positive x (use `mirror_x=True` to classify both ends):
+# the "home plate" slot between the goal posts, the faceoff dots and the top of the circles, and
+# the points, along the blue line
+SHOT_ZONES = {
+    'slot': [(89, -4), (69, -22), (54, -22), (54, 22), (69, 22), (89, 4)],
+    'point': (25, 40, -42.5, 42.5),
+}
+
+
+def _is_rectangle(shape):
+    return len(shape) == 4 and all(np.isscalar(bound) for bound in shape)
+
+
+def _in_rectangle(x, y, shape):
+    x_min, x_max, y_min, y_max = shape
+    return (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+
+
+def _in_polygon(x, y, shape):
+    """Even-odd rule, one vectorized pass per edge over the points inside the bounding box."""
+    vertices = np.asarray(shape, dtype=float)
+    if vertices.ndim != 2 or vertices.shape[1] != 2 or len(vertices) < 3:
+        raise ValueError(f"Invalid zone: {shape}")
+    (x_min, y_min), (x_max, y_max) = vertices.min(axis=0), vertices.max(axis=0)
+    inside = _in_rectangle(x, y, (x_min, x_max, y_min, y_max))
+    candidates = np.flatnonzero(inside)
+    px, py = x[candidates], y[candidates]
+    crossings = np.zeros(len(candidates), dtype=bool)
+    for (x1, y1), (x2, y2) in zip(vertices, np.roll(vertices, -1, axis=0)):
+        if y1 == y2:
+            continue
+        straddles = (y1 > py) != (y2 > py)
+        crossings ^= straddles & (px < x1 + (py - y1) * (x2 - x1) / (y2 - y1))
+    inside[candidates] = crossings
+    return inside
+
+
+def zone_mask(x, y, shape):
+    """
+    Events inside one zone.
+
+    Args:
+        x (np.ndarray): X coordinates (float, NaN for missing coordinates).
+        y (np.ndarray): Y coordinates (float, NaN for missing coordinates).
+        shape (tuple or list): Rectangle `(x_min, x_max, y_min, y_max)` or polygon vertices `[(x, y), ...]`.
+
+    Returns:
+        np.ndarray: Boolean mask (False for missing coordinates).
+
+    Raises:
+        ValueError: If the shape is neither a rectangle nor a polygon.
+    """
+    if _is_rectangle(shape):
+        return _in_rectangle(x, y, shape)
+    return _in_polygon(x, y, shape)
+
+
+def classify_zones(x, y, zones=DANGER_ZONES, default='Low', missing=None, mirror_x=False):
+    """
+    Label each event with the first zone containing it.
+
+    Args:
+        x (array-like): X coordinates of the events.
+        y (array-like): Y coordinates of the events.
+        zones (dict): Zone name -> rectangle `(x_min, x_max, y_min, y_max)` or
+            polygon `[(x, y), ...]`, in priority order (see `DANGER_ZONES`, `SHOT_ZONES`).
+        default (str): Label of the events outside every zone.
+        missing (str): Label of the events without coordinates (None leaves them missing).
+        mirror_x (bool): Classify `|x|`, so that zones defined for the end at
+            positive x also cover the same area of the other end.
+
+    Returns:
+        pd.Categorical: Zone of each event, with the zone names then `default`
+        (and `missing`, if new) as categories.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    if mirror_x:
+        x = np.abs(x)
+    categories = list(zones)
+    for label in (default, missing):
+        if label is not None and label not in categories:
+            categories.append(label)
+
+    # Zones are painted from the last to the first, so that the first zone containing an event wins
+    codes = np.full(len(x), categories.index(default), dtype=np.int16)
+    for code, shape in reversed(list(enumerate(zones.values()))):
+        np.putmask(codes, zone_mask(x, y, shape), code)
+    np.putmask(codes, np.isnan(x) | np.isnan(y), -1 if missing is None else categories.index(missing))
+    return pd.Categorical.from_codes(codes, categories)
+
+
+def add_danger_zone(df, zones=DANGER_ZONES, column='danger_zone', default='Low', missing=None, mirror_x=False):
+    """
+    Add the zone of each event.
+
+    Args:
+        df (pd.DataFrame): Events with 'x_coord' and 'y_coord' columns (modified in place).
+        zones (dict): Zones, in priority order (see `classify_zones`).
+        column (str): Name of the added column.
+        default (str): Label of the events outside every zone.
+        missing (str): Label of the events without coordinates (None leaves them missing).
+        mirror_x (bool): Classify `|x|` (see `classify_zones`).
+
+    Returns:
+        pd.DataFrame: `df` with the categorical zone column added.
+    """
+    df[column] = classify_zones(df['x_coord'].to_numpy(dtype=float), df['y_coord'].to_numpy(dtype=float),
+                                zones, default, missing, mirror_x)
+    return df
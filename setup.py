@@ -48,6 +48,7 @@ setup(
     entry_points={
         "console_scripts": [
             "nhl-data-tool=ift6758.main:main_function",
+            "ift6758-fetch=ift6758.data.cli:main",
         ],
     },
 )